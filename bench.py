@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# bench.py — Benchmark offline (tanpa testnet)
+#
+# Menjalankan dua server lokal:
+# - mock JSON-RPC node   (eth_*: saldo, nonce, balanceOf, sendRawTransaction,
+#                          receipt per block, batch array, ...)
+# - mock api.pharosnetwork.xyz (/user/login, /sign/in, /sign/status, /faucet/daily)
+# keduanya dengan latency & error injection yang bisa diatur, lalu menjalankan
+# mintnft.main, faucet.run_once dan fan-out send.py terhadap N wallet sintetis.
+#
+# Contoh:
+#   python bench.py --wallets 50 --latency-ms 40 --error-rate 0.02 --concurrency 8
+#   python bench.py --stages faucet --wallets 200 --json bench_output.json
+#   python bench.py --stages send,send_batch --wallets 200
+#   python bench.py --stages rebalance --wallets 500 --rebalance-target 0.1
+
+import argparse
+import base64
+import builtins
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+
+# ──( Fault injection )───────────────────────────────────────────────────────────
+class Faults:
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 1):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):
+        if self.latency_ms > 0:
+            with self._lock:
+                j = self._rng.uniform(0.5, 1.5)
+            time.sleep(self.latency_ms / 1000.0 * j)
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+
+def _hex(n: int) -> str:
+    return hex(n)
+
+
+# ──( Mock chain )────────────────────────────────────────────────────────────────
+class MockChain:
+    def __init__(self, chain_id: int = 688688, block_time: float = 0.5, gas_used: int = 180000,
+                 gas_price_wei: int = 10 ** 9, start_balance_wei: int = 1000 * 10 ** 18):
+        from eth_account import Account
+        from eth_utils import keccak
+        import rlp
+        self._Account, self._keccak, self._rlp = Account, keccak, rlp
+        self.chain_id = chain_id
+        self.block_time = block_time
+        self.gas_used = gas_used
+        self.gas_price = gas_price_wei
+        self.start = time.time()
+        self.lock = threading.Lock()
+        self.nonces: Dict[str, int] = defaultdict(int)
+        self.balances: Dict[str, int] = defaultdict(lambda: start_balance_wei)
+        self.owned: Dict[tuple, int] = defaultdict(int)
+        self.txs: Dict[str, dict] = {}
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def block(self) -> int:
+        return int((time.time() - self.start) / self.block_time) + 1
+
+    def _decode(self, raw: bytes) -> dict:
+        if raw[0] < 0x7f:  # typed tx (EIP-2718)
+            f = self._rlp.decode(raw[1:])
+            nonce, gas, to, value, data = f[1], f[4], f[5], f[6], f[7]
+            price = int.from_bytes(f[3], "big")  # maxFeePerGas
+        else:
+            f = self._rlp.decode(raw)
+            nonce, gas, to, value, data = f[0], f[2], f[3], f[4], f[5]
+            price = int.from_bytes(f[1], "big")
+        sender = self._Account.recover_transaction(raw).lower()
+        return {
+            "from": sender,
+            "nonce": int.from_bytes(nonce, "big"),
+            "to": "0x" + to.hex(),
+            "value": int.from_bytes(value, "big"),
+            "data": data,
+            "price": price,
+            "gas": int.from_bytes(gas, "big"),
+        }
+
+    def _send_raw(self, raw_hex: str):
+        raw = bytes.fromhex(raw_hex[2:] if raw_hex.startswith("0x") else raw_hex)
+        tx = self._decode(raw)
+        h = "0x" + self._keccak(raw).hex()
+        with self.lock:
+            if h in self.txs:
+                return {"error": {"code": -32000, "message": "already known"}}
+            expected = self.nonces[tx["from"]]
+            if tx["nonce"] < expected:
+                return {"error": {"code": -32000, "message": "nonce too low"}}
+            self.nonces[tx["from"]] = tx["nonce"] + 1
+            used = min(self.gas_used, tx["gas"])  # transfer biasa cuma 21000
+            self.balances[tx["from"]] -= tx["value"] + used * tx["price"]
+            if tx["data"]:
+                self.owned[(tx["from"], tx["to"])] += 1
+            else:
+                self.balances[tx["to"]] += tx["value"]
+            self.txs[h] = {"block": self.block() + 1, "from": tx["from"], "to": tx["to"], "nonce": tx["nonce"],
+                           "price": tx["price"], "gas_used": used}
+        return {"result": h}
+
+    def _receipt(self, h: str):
+        with self.lock:
+            tx = self.txs.get(h.lower())
+        if not tx or self.block() < tx["block"]:
+            return None
+        return {
+            "transactionHash": h, "status": "0x1", "gasUsed": _hex(tx["gas_used"]),
+            "blockNumber": _hex(tx["block"]), "effectiveGasPrice": _hex(tx["price"]),
+            "from": tx["from"], "to": tx["to"], "cumulativeGasUsed": _hex(tx["gas_used"]), "logs": [],
+        }
+
+    def handle(self, req: dict) -> dict:
+        m, p = req.get("method"), req.get("params") or []
+        self.counts[m] += 1
+        out = {"jsonrpc": "2.0", "id": req.get("id")}
+        try:
+            if m == "eth_chainId":
+                res = _hex(self.chain_id)
+            elif m == "net_version":
+                res = str(self.chain_id)
+            elif m == "web3_clientVersion":
+                res = "mock/bench"
+            elif m == "eth_blockNumber":
+                res = _hex(self.block())
+            elif m == "eth_gasPrice":
+                res = _hex(self.gas_price)
+            elif m == "eth_maxPriorityFeePerGas":
+                res = _hex(self.gas_price // 10)
+            elif m == "eth_feeHistory":
+                n = int(p[0], 16) if isinstance(p[0], str) else int(p[0])
+                pct = p[2] if len(p) > 2 else []
+                res = {"oldestBlock": _hex(max(1, self.block() - n)),
+                       "baseFeePerGas": [_hex(self.gas_price)] * (n + 1),
+                       "gasUsedRatio": [0.5] * n,
+                       "reward": [[_hex(self.gas_price // 10)] * len(pct)] * n}
+            elif m == "eth_getBlockByNumber":
+                res = {"number": _hex(self.block()), "baseFeePerGas": _hex(self.gas_price), "transactions": []}
+            elif m == "eth_getBalance":
+                with self.lock:
+                    res = _hex(self.balances[p[0].lower()])
+            elif m == "eth_getTransactionCount":
+                with self.lock:
+                    res = _hex(self.nonces[p[0].lower()])
+            elif m == "eth_estimateGas":
+                res = _hex(self.gas_used)
+            elif m == "eth_call":
+                call = p[0]
+                data = call.get("data") or call.get("input") or "0x"
+                if data.startswith("0x70a08231"):
+                    owner = "0x" + data[-40:]
+                    with self.lock:
+                        res = "0x" + format(self.owned[(owner.lower(), call["to"].lower())], "064x")
+                else:
+                    res = "0x"
+            elif m == "eth_sendRawTransaction":
+                r = self._send_raw(p[0])
+                out.update(r)
+                return out
+            elif m == "eth_getTransactionReceipt":
+                res = self._receipt(p[0])
+            elif m == "eth_getTransactionByHash":
+                with self.lock:
+                    tx = self.txs.get(p[0].lower())
+                res = None if not tx else {"hash": p[0], "nonce": _hex(tx["nonce"]), "from": tx["from"],
+                                           "to": tx["to"], "blockNumber": None}
+            else:
+                out["error"] = {"code": -32601, "message": f"method {m} not supported by mock"}
+                return out
+            out["result"] = res
+        except Exception as e:
+            out["error"] = {"code": -32000, "message": str(e)}
+        return out
+
+
+def _make_rpc_handler(chain: MockChain, faults: Faults):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *a):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("content-length") or 0))
+            faults.delay()
+            if faults.should_fail():
+                return self._send(503, b'{"error":"injected"}')
+            req = json.loads(body or b"{}")
+            res = [chain.handle(r) for r in req] if isinstance(req, list) else chain.handle(req)
+            self._send(200, json.dumps(res).encode())
+
+        def _send(self, code: int, payload: bytes):
+            self.send_response(code)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+# ──( Mock Pharos API )───────────────────────────────────────────────────────────
+def _fake_jwt(address: str, ttl: int = 3600) -> str:
+    def b64(d: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(d).encode()).decode().rstrip("=")
+    return f"{b64({'alg': 'HS256'})}.{b64({'sub': address, 'exp': int(time.time()) + ttl})}.sig"
+
+
+def _make_api_handler(faults: Faults, counts: Dict[str, int]):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *a):
+            pass
+
+        def _route(self):
+            u = urlparse(self.path)
+            q = parse_qs(u.query)
+            counts[u.path] += 1
+            self.rfile.read(int(self.headers.get("content-length") or 0))
+            faults.delay()
+            if faults.should_fail():
+                return self._send(500, {"code": 1, "msg": "injected"})
+            addr = (q.get("address") or ["0x"])[0]
+            if u.path == "/user/login":
+                return self._send(200, {"code": 0, "data": {"jwt": _fake_jwt(addr)}})
+            if not (self.headers.get("authorization") or "").startswith("Bearer ey"):
+                return self._send(401, {"code": 401, "msg": "unauthorized"})
+            if u.path == "/sign/in":
+                return self._send(200, {"code": 0, "msg": "ok"})
+            if u.path == "/sign/status":
+                return self._send(200, {"code": 0, "data": {"consecutiveDays": 3}})
+            if u.path == "/faucet/daily":
+                return self._send(200, {"code": 0, "msg": "ok"})
+            return self._send(404, {"code": 404, "msg": "not found"})
+
+        do_GET = do_POST = _route
+
+        def _send(self, code: int, obj: dict):
+            payload = json.dumps(obj).encode()
+            self.send_response(code)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def _serve(handler) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+# ──( Pengukuran )────────────────────────────────────────────────────────────────
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, stage: str, sec: float):
+        with self._lock:
+            self.samples[stage].append(sec)
+
+    def timed(self, stage: str, fn):
+        def wrapper(*a, **kw):
+            t0 = time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                self.add(stage, time.perf_counter() - t0)
+        return wrapper
+
+
+def pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q / 100.0 * (len(s) - 1))))]
+
+
+def summarize(rec: Recorder) -> Dict[str, dict]:
+    out = {}
+    for stage, vals in sorted(rec.samples.items()):
+        out[stage] = {"count": len(vals), "p50_ms": round(pct(vals, 50) * 1000, 2),
+                      "p99_ms": round(pct(vals, 99) * 1000, 2)}
+    return out
+
+
+# ──( Skenario )──────────────────────────────────────────────────────────────────
+def write_keys(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    keys = ["0x%064x" % (rng.getrandbits(255) | 1) for _ in range(n)]
+    with open("privatekey.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(keys) + "\n")
+    return keys
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def bench_mint(args, chain: MockChain, rec: Recorder) -> dict:
+    import mintnft
+    mintnft.process_wallet = rec.timed("mint.wallet", mintnft.process_wallet)
+    before = chain.counts["eth_sendRawTransaction"]
+    t0 = time.perf_counter()
+    with quiet(not args.verbose):
+        mintnft.main(delay_between_wallets_sec=0, concurrency=args.concurrency)
+    dt = time.perf_counter() - t0
+    txs = chain.counts["eth_sendRawTransaction"] - before
+    return {"seconds": round(dt, 3), "wallets_per_sec": round(args.wallets / dt, 2), "tx_per_sec": round(txs / dt, 2),
+            "tx": txs}
+
+
+def bench_faucet(args, api_url: str, rec: Recorder) -> dict:
+    import faucet
+    faucet.BASE_URL = api_url
+    faucet.set_rate_limit(args.api_rate)
+    faucet.process_account = rec.timed("faucet.account", faucet.process_account)
+    t0 = time.perf_counter()
+    with quiet(not args.verbose):
+        faucet.run_once(concurrency=args.concurrency)
+    dt = time.perf_counter() - t0
+    return {"seconds": round(dt, 3), "wallets_per_sec": round(args.wallets / dt, 2)}
+
+
+def bench_send(args, chain: MockChain, rec: Recorder) -> dict:
+    import send
+    answers = iter(["1", str(args.send_amount), "y"])
+    orig_input = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    before = chain.counts["eth_sendRawTransaction"]
+    t0 = time.perf_counter()
+    try:
+        with quiet(not args.verbose):
+            send.main()
+    except SystemExit:
+        pass
+    finally:
+        builtins.input = orig_input
+    dt = time.perf_counter() - t0
+    rec.add("send.fanout", dt)
+    txs = chain.counts["eth_sendRawTransaction"] - before
+    return {"seconds": round(dt, 3), "tx_per_sec": round(txs / dt, 2), "tx": txs}
+
+
+def bench_send_batch(args, chain: MockChain, rec: Recorder) -> dict:
+    # fan-out yang sama dengan bench_send, tapi pre-sign + broadcast per JSON-RPC batch
+    import send
+    before = chain.counts["eth_sendRawTransaction"]
+    t0 = time.perf_counter()
+    try:
+        with quiet(not args.verbose):
+            send.main(sender=1, amount=args.send_amount, assume_yes=True, batch=True, batch_chunk=args.batch_chunk)
+    except SystemExit:
+        pass
+    dt = time.perf_counter() - t0
+    rec.add("send_batch.fanout", dt)
+    txs = chain.counts["eth_sendRawTransaction"] - before
+    return {"seconds": round(dt, 3), "tx_per_sec": round(txs / dt, 2), "tx": txs}
+
+
+def bench_rebalance(args, chain: MockChain, rec: Recorder) -> dict:
+    # hanya wallet pertama yang punya saldo; sisanya 0 → pohon fan-out ~log2(N) round
+    import send
+    from eth_account import Account
+    target = int(float(args.rebalance_target) * 10 ** 18)
+    with open("privatekey.txt", encoding="utf-8") as f:
+        addrs = [Account.from_key(k.strip()).address.lower() for k in f if k.strip()]
+    with chain.lock:
+        for a in addrs[1:]:
+            chain.balances[a] = 0
+    before = chain.counts["eth_sendRawTransaction"]
+    t0 = time.perf_counter()
+    try:
+        with quiet(not args.verbose):
+            send.rebalance_main(target=args.rebalance_target, assume_yes=True)
+    except SystemExit:
+        pass
+    dt = time.perf_counter() - t0
+    rec.add("rebalance.total", dt)
+    txs = chain.counts["eth_sendRawTransaction"] - before
+    with chain.lock:
+        funded = sum(1 for a in addrs if chain.balances[a] >= target)
+    return {"seconds": round(dt, 3), "tx": txs, "funded": f"{funded}/{len(addrs)}",
+            "blocks": round(dt / args.block_time, 1)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark offline mintnft / faucet / send")
+    ap.add_argument("--wallets", type=int, default=20)
+    ap.add_argument("--stages", default="mint,faucet,send", help="subset dari: mint,faucet,send,send_batch,rebalance")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="latency rata-rata tiap request mock")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="probabilitas 5xx per request (0-1)")
+    ap.add_argument("--block-time", type=float, default=0.5)
+    ap.add_argument("--api-rate", type=float, default=200.0, help="rate limit faucet (req/detik)")
+    ap.add_argument("--send-amount", default="0.001")
+    ap.add_argument("--batch-chunk", type=int, default=50, help="tx per JSON-RPC batch (stage send_batch)")
+    ap.add_argument("--rebalance-target", default="0.1", help="saldo target per wallet (stage rebalance)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", dest="json_out", help="simpan hasil ke file JSON")
+    ap.add_argument("--verbose", action="store_true", help="tampilkan output asli modul")
+    args = ap.parse_args(argv)
+
+    faults = Faults(args.latency_ms, args.error_rate, args.seed)
+    chain = MockChain(block_time=args.block_time)
+    api_counts: Dict[str, int] = defaultdict(int)
+    rpc_srv = _serve(_make_rpc_handler(chain, faults))
+    api_srv = _serve(_make_api_handler(faults, api_counts))
+    rpc_url = f"http://127.0.0.1:{rpc_srv.server_address[1]}"
+    api_url = f"http://127.0.0.1:{api_srv.server_address[1]}"
+
+    json_out = os.path.abspath(args.json_out) if args.json_out else None
+    workdir = tempfile.mkdtemp(prefix="pharos-bench-")
+    os.chdir(workdir)
+    os.environ["PHAROS_RPC_URLS"] = rpc_url
+    write_keys(args.wallets, args.seed)
+
+    import rpc
+    rec = Recorder()
+    orig_request = rpc.RPCClient.request
+
+    def timed_request(self, payload):
+        # latency per method JSON-RPC dari sisi client (termasuk failover)
+        stage = "rpc." + (payload.get("method") if isinstance(payload, dict) else "batch")
+        t0 = time.perf_counter()
+        try:
+            return orig_request(self, payload)
+        finally:
+            rec.add(stage, time.perf_counter() - t0)
+
+    rpc.RPCClient.request = timed_request
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    results = {"config": {k: v for k, v in vars(args).items() if k != "json_out"}, "stages": {}}
+    for stage in stages:
+        if stage == "mint":
+            results["stages"]["mint"] = bench_mint(args, chain, rec)
+        elif stage == "faucet":
+            results["stages"]["faucet"] = bench_faucet(args, api_url, rec)
+        elif stage == "send":
+            results["stages"]["send"] = bench_send(args, chain, rec)
+        elif stage == "send_batch":
+            results["stages"]["send_batch"] = bench_send_batch(args, chain, rec)
+        elif stage == "rebalance":
+            results["stages"]["rebalance"] = bench_rebalance(args, chain, rec)
+    results["latency"] = summarize(rec)
+    import metrics
+    results["metrics"] = metrics.REGISTRY.snapshot()
+    results["rpc_calls"] = dict(chain.counts)
+    results["api_calls"] = dict(api_counts)
+
+    print(f"\n📊 BENCH — {args.wallets} wallet, latency {args.latency_ms}ms, error {args.error_rate:.0%}")
+    print("-" * 70)
+    for name, r in results["stages"].items():
+        print(f"  {name:<8} " + "  ".join(f"{k}={v}" for k, v in r.items()))
+    print("\n  Stage                          count     p50 ms     p99 ms")
+    for stage, r in results["latency"].items():
+        print(f"  {stage:<30} {r['count']:>5} {r['p50_ms']:>10} {r['p99_ms']:>10}")
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Hasil disimpan ke {json_out}")
+
+    rpc_srv.shutdown()
+    api_srv.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    main()
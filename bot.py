@@ -1,102 +1,268 @@
-# bot.py
-import os
-import time
-
-# Modul lokal (pastikan file ini ada di folder yang sama)
-import mintnft
-import faucet
-
-try:
-    from colorama import init, Fore, Style
-    init(autoreset=True)
-except Exception:
-    class _Dummy:
-        def __getattr__(self, k): return ""
-    Fore = Style = _Dummy()
-
-BOX_WIDTH = 90  # lebar kotak menu
-
-def hr(char="─", width=BOX_WIDTH):
-    return char * width
-
-def draw_header():
-    # Header ASCII + byline
-    ascii_text = f"""{Fore.CYAN}
-   ___  __ _____   ___  ____  ____  
-  / _ \/ // / _ | / _ \/ __ \/ __/  
- / ___/ _  / __ |/ , _/ /_/ /\ \    
-/_/  /_//_/_/ |_/_/|_|\____/___/    {Style.RESET_ALL}{Fore.YELLOW}BY GIEMDFK{Style.RESET_ALL}
-"""
-    print(ascii_text)
-
-    # Kotak judul & garis atas
-    print(f"{Fore.GREEN}┌{hr('─') }┐{Style.RESET_ALL}")
-    title = " ✨  AVAILABLE PROJECTS  ✨ "
-    pad_left = (BOX_WIDTH - len(title)) // 2
-    pad_right = BOX_WIDTH - len(title) - pad_left
-    print(f"{Fore.GREEN}│{Style.RESET_ALL}{' ' * pad_left}{Fore.WHITE}{title}{Style.RESET_ALL}{' ' * pad_right}{Fore.GREEN}│{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}├{hr('─') }┤{Style.RESET_ALL}")
-
-def draw_menu():
-    # Baris menu (teks & jarak diset agar sejajar)
-    line1 = f"{Fore.GREEN}│{Style.RESET_ALL}  📦  1.  {Fore.WHITE}Mint NFTs (claim all missing){Style.RESET_ALL}{' ' * 25}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
-    line2 = f"{Fore.GREEN}│{Style.RESET_ALL}  💧  2.  {Fore.WHITE}Faucet — run once (all wallets){Style.RESET_ALL}{' ' * 20}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
-    line3 = f"{Fore.GREEN}│{Style.RESET_ALL}  💧  3.  {Fore.WHITE}Run All Menu{Style.RESET_ALL}{' ' * 46}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
-    line4 = f"{Fore.GREEN}│{Style.RESET_ALL}  ✖  0.  {Fore.WHITE}Exit Program{Style.RESET_ALL}{' ' * 57}{Fore.GREEN}│{Style.RESET_ALL}"
-
-    print(line1)
-    print(line2)
-    print(line3)
-    print(line4)
-
-    # Garis bawah kotak
-    print(f"{Fore.GREEN}└{hr('─') }┘{Style.RESET_ALL}\n")
-
-def ask_int(prompt: str, default=None) -> int:
-    while True:
-        s = input(prompt).strip()
-        if s == "" and default is not None:
-            return default
-        if s.lstrip("-").isdigit():
-            return int(s)
-        print(f"{Fore.YELLOW}Masukan angka yang valid.{Style.RESET_ALL}")
-
-def main():
-    while True:
-        os.system('cls' if os.name == 'nt' else 'clear')
-        draw_header()
-        draw_menu()
-
-        choice = ask_int(f"{Fore.LIGHTRED_EX}🎯 Select project: {Style.RESET_ALL}")
-
-        if choice == 1:
-            # Mint NFTs (claim all missing)
-            try:
-                delay = ask_int("Delay antar-wallet (detik, default 5): ", default=5)
-                mintnft.main(delay_between_wallets_sec=delay)
-            except KeyboardInterrupt:
-                print("\n⚠️ Dihentikan oleh user.")
-        elif choice == 2:
-            # Faucet run once (all wallets)
-            try:
-                faucet.main(loop=False)
-            except KeyboardInterrupt:
-                print("\n⚠️ Dihentikan oleh user.")
-        elif choice == 3:
-            # Run All Menu: mint → faucet
-            try:
-                delay = ask_int("Delay antar-wallet (detik, default 5): ", default=5)
-                mintnft.main(delay_between_wallets_sec=delay)
-                faucet.main(loop=False)
-            except KeyboardInterrupt:
-                print("\n⚠️ Dihentikan oleh user.")
-        elif choice == 0:
-            print(f"{Fore.CYAN}Sampai jumpa!{Style.RESET_ALL}")
-            break
-        else:
-            print(f"{Fore.YELLOW}Pilihan tidak tersedia.{Style.RESET_ALL}")
-
-        input(f"\n{Fore.BLUE}Tekan Enter untuk kembali ke menu…{Style.RESET_ALL}")
-
-if __name__ == "__main__":
-    main()
+# bot.py
+#
+# Tanpa argumen → menu interaktif. Dengan argumen → CLI headless (untuk container / cron):
+#   python bot.py mint --concurrency 4 --incremental
+#   python bot.py faucet --rate 3
+#   python bot.py send --from 1 --amount 0.001 --yes
+#   python bot.py rebalance --target 0.1 --yes
+#   python bot.py daemon --faucet-every 3600 --mint-every 21600 --metrics-port 9100
+import argparse
+import os
+import signal
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+# Modul lokal (pastikan file ini ada di folder yang sama)
+# mintnft (web3 + RPC) di-import saat menu mint dipilih → run faucet tidak bayar setup RPC
+import faucet
+
+try:
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+except Exception:
+    class _Dummy:
+        def __getattr__(self, k): return ""
+    Fore = Style = _Dummy()
+
+BOX_WIDTH = 90  # lebar kotak menu
+STARTUP_SEC = time.perf_counter() - _T0
+
+def load_mintnft():
+    import mintnft
+    return mintnft
+
+def startup_line() -> str:
+    rpc = sys.modules.get("rpc")  # belum ter-import = belum ada setup RPC sama sekali
+    report = rpc.startup_report() if rpc else "RPC belum di-load"
+    return f"⏱️  Startup {STARTUP_SEC * 1000:.0f}ms | {report}"
+
+def hr(char="─", width=BOX_WIDTH):
+    return char * width
+
+def draw_header():
+    # Header ASCII + byline
+    ascii_text = f"""{Fore.CYAN}
+   ___  __ _____   ___  ____  ____  
+  / _ \/ // / _ | / _ \/ __ \/ __/  
+ / ___/ _  / __ |/ , _/ /_/ /\ \    
+/_/  /_//_/_/ |_/_/|_|\____/___/    {Style.RESET_ALL}{Fore.YELLOW}BY GIEMDFK{Style.RESET_ALL}
+"""
+    print(ascii_text)
+
+    # Kotak judul & garis atas
+    print(f"{Fore.GREEN}┌{hr('─') }┐{Style.RESET_ALL}")
+    title = " ✨  AVAILABLE PROJECTS  ✨ "
+    pad_left = (BOX_WIDTH - len(title)) // 2
+    pad_right = BOX_WIDTH - len(title) - pad_left
+    print(f"{Fore.GREEN}│{Style.RESET_ALL}{' ' * pad_left}{Fore.WHITE}{title}{Style.RESET_ALL}{' ' * pad_right}{Fore.GREEN}│{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}├{hr('─') }┤{Style.RESET_ALL}")
+
+def draw_menu():
+    # Baris menu (teks & jarak diset agar sejajar)
+    line1 = f"{Fore.GREEN}│{Style.RESET_ALL}  📦  1.  {Fore.WHITE}Mint NFTs (claim all missing){Style.RESET_ALL}{' ' * 25}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
+    line2 = f"{Fore.GREEN}│{Style.RESET_ALL}  💧  2.  {Fore.WHITE}Faucet — run once (all wallets){Style.RESET_ALL}{' ' * 20}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
+    line3 = f"{Fore.GREEN}│{Style.RESET_ALL}  💧  3.  {Fore.WHITE}Run All Menu{Style.RESET_ALL}{' ' * 46}{Fore.CYAN}[READY]{Style.RESET_ALL}  {Fore.GREEN}│{Style.RESET_ALL}"
+    line4 = f"{Fore.GREEN}│{Style.RESET_ALL}  ✖  0.  {Fore.WHITE}Exit Program{Style.RESET_ALL}{' ' * 57}{Fore.GREEN}│{Style.RESET_ALL}"
+
+    print(line1)
+    print(line2)
+    print(line3)
+    print(line4)
+
+    # Garis bawah kotak
+    print(f"{Fore.GREEN}└{hr('─') }┘{Style.RESET_ALL}\n")
+
+def ask_int(prompt: str, default=None) -> int:
+    while True:
+        s = input(prompt).strip()
+        if s == "" and default is not None:
+            return default
+        if s.lstrip("-").isdigit():
+            return int(s)
+        print(f"{Fore.YELLOW}Masukan angka yang valid.{Style.RESET_ALL}")
+
+def interactive():
+    while True:
+        os.system('cls' if os.name == 'nt' else 'clear')
+        draw_header()
+        draw_menu()
+        print(f"{Fore.BLUE}{startup_line()}{Style.RESET_ALL}\n")
+
+        choice = ask_int(f"{Fore.LIGHTRED_EX}🎯 Select project: {Style.RESET_ALL}")
+
+        if choice == 1:
+            # Mint NFTs (claim all missing)
+            try:
+                delay = ask_int("Delay antar-wallet (detik, default 5): ", default=5)
+                workers = ask_int("Jumlah wallet paralel (default 1 = berurutan): ", default=1)
+                load_mintnft().main(delay_between_wallets_sec=delay, concurrency=workers)
+            except KeyboardInterrupt:
+                print("\n⚠️ Dihentikan oleh user.")
+        elif choice == 2:
+            # Faucet run once (all wallets)
+            try:
+                faucet.main(loop=False)
+            except KeyboardInterrupt:
+                print("\n⚠️ Dihentikan oleh user.")
+        elif choice == 3:
+            # Run All Menu: mint → faucet
+            try:
+                delay = ask_int("Delay antar-wallet (detik, default 5): ", default=5)
+                workers = ask_int("Jumlah wallet paralel (default 1 = berurutan): ", default=1)
+                load_mintnft().main(delay_between_wallets_sec=delay, concurrency=workers)
+                faucet.main(loop=False)
+            except KeyboardInterrupt:
+                print("\n⚠️ Dihentikan oleh user.")
+        elif choice == 0:
+            print(f"{Fore.CYAN}Sampai jumpa!{Style.RESET_ALL}")
+            break
+        else:
+            print(f"{Fore.YELLOW}Pilihan tidak tersedia.{Style.RESET_ALL}")
+
+        input(f"\n{Fore.BLUE}Tekan Enter untuk kembali ke menu…{Style.RESET_ALL}")
+
+# ──( CLI headless )──────────────────────────────────────────────────────────────
+def cmd_mint(args):
+    load_mintnft().main(delay_between_wallets_sec=args.delay, concurrency=args.concurrency,
+                        incremental=args.incremental, force_full=args.force_full,
+                        metrics_out=args.metrics_out, results_out=args.results_out,
+                        fee_mode=args.fee_mode, speed=args.speed)
+
+def cmd_faucet(args):
+    faucet.main(loop=args.loop, interval_sec=args.interval, concurrency=args.concurrency,
+                rate_per_sec=args.rate, incremental=args.incremental, force_full=args.force_full,
+                metrics_out=args.metrics_out, results_out=args.results_out)
+
+def cmd_send(args):
+    import send
+    send.main(results_out=args.results_out, sender=args.sender, amount=args.amount, assume_yes=args.yes,
+              fee_mode=args.fee_mode, speed=args.speed, batch=args.batch, batch_chunk=args.batch_chunk)
+
+def cmd_rebalance(args):
+    import send
+    send.rebalance_main(target=args.target, min_transfer=args.min_transfer, assume_yes=args.yes,
+                        dry_run=args.dry_run, results_out=args.results_out, fee_mode=args.fee_mode,
+                        speed=args.speed)
+
+def cmd_daemon(args):
+    import metrics
+    import scheduler
+
+    sched = scheduler.Scheduler(workers=args.workers)
+    if args.faucet_every > 0:
+        sched.add(faucet.faucet_job(args.faucet_every, concurrency=args.faucet_concurrency,
+                                    rate_per_sec=args.rate, incremental=args.incremental,
+                                    metrics_out=args.metrics_out))
+    if args.mint_every > 0:
+        sched.add(scheduler.Job("mint", load_mintnft().main, interval_sec=args.mint_every,
+                                delay_between_wallets_sec=args.mint_delay, concurrency=args.mint_concurrency,
+                                incremental=args.incremental, metrics_out=args.metrics_out,
+                                fee_mode=args.fee_mode, speed=args.speed))
+    if not sched.pending():
+        print("❌ Tidak ada job (pakai --faucet-every dan/atau --mint-every > 0).")
+        sys.exit(1)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        print(f"📈 Metrics live di http://127.0.0.1:{args.metrics_port}/metrics")
+
+    def on_signal(signum, _frame):
+        print(f"\n⏹  Sinyal {signum} diterima, menunggu job yang berjalan selesai…")
+        sched.stop()
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    print(f"🗓️  Daemon jalan: {sched.pending()} job, {args.workers} worker")
+    sched.run_forever()
+    print("👋 Daemon berhenti.")
+
+def positive_float(s: str) -> float:
+    # rate <= 0 membuat token bucket menunggu selamanya
+    try:
+        v = float(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bukan angka: {s}")
+    if v <= 0:
+        raise argparse.ArgumentTypeError(f"harus > 0: {s}")
+    return v
+
+def positive_int(s: str) -> int:
+    # chunk 0 → range() step 0 (ValueError), negatif → tidak ada tx yang terkirim
+    try:
+        v = int(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bukan bilangan bulat: {s}")
+    if v < 1:
+        raise argparse.ArgumentTypeError(f"harus >= 1: {s}")
+    return v
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="bot.py", description="Pharos bot (tanpa argumen = menu interaktif)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    m = sub.add_parser("mint", help="Mint semua NFT yang belum dimiliki")
+    m.add_argument("--delay", type=int, default=5, help="delay awal antar-wallet (detik, mode berurutan)")
+    m.add_argument("--concurrency", type=int, default=1, help="jumlah wallet paralel")
+    m.set_defaults(func=cmd_mint)
+
+    f = sub.add_parser("faucet", help="Klaim faucet + daily sign-in semua wallet")
+    f.add_argument("--concurrency", type=int, default=faucet.DEFAULT_CONCURRENCY)
+    f.add_argument("--rate", type=positive_float, default=None, help="batas request/detik ke API")
+    f.add_argument("--loop", action="store_true", help="ulang terus tiap --interval detik")
+    f.add_argument("--interval", type=int, default=3600)
+    f.set_defaults(func=cmd_faucet)
+
+    for sp in (m, f):
+        sp.add_argument("--incremental", action="store_true", help="lewati wallet yang sudah beres (state.db)")
+        sp.add_argument("--force-full", action="store_true", help="abaikan state.db")
+        sp.add_argument("--metrics-out", default=None, help="export metrik (.json / .prom)")
+        sp.add_argument("--results-out", default=None, help="hasil streaming JSONL")
+
+    s = sub.add_parser("send", help="Kirim PHRS dari satu wallet ke semua wallet lain")
+    s.add_argument("--from", dest="sender", type=int, default=None, help="nomor wallet pengirim (1-based)")
+    s.add_argument("--amount", default=None, help="amount per penerima, mis. 0.001")
+    s.add_argument("--yes", action="store_true", help="tanpa konfirmasi")
+    s.add_argument("--results-out", default=None)
+    s.add_argument("--batch", action="store_true", help="pre-sign semua tx lalu broadcast via JSON-RPC batch")
+    s.add_argument("--batch-chunk", type=positive_int, default=50, help="jumlah tx per request batch")
+    s.set_defaults(func=cmd_send)
+
+    r = sub.add_parser("rebalance", help="Top-up semua wallet sampai saldo target (banyak donor, paralel)")
+    r.add_argument("--target", default="0.1", help="saldo minimal per wallet (PHRS)")
+    r.add_argument("--min-transfer", default="0", help="kekurangan di bawah ini dilewati (PHRS)")
+    r.add_argument("--yes", action="store_true", help="tanpa konfirmasi")
+    r.add_argument("--dry-run", action="store_true", help="tampilkan rencana transfer saja")
+    r.add_argument("--results-out", default=None)
+    r.set_defaults(func=cmd_rebalance)
+
+    d = sub.add_parser("daemon", help="Jalankan job terjadwal terus-menerus")
+    d.add_argument("--faucet-every", type=int, default=3600, help="interval faucet (detik, 0 = off)")
+    d.add_argument("--mint-every", type=int, default=0, help="interval mint (detik, 0 = off)")
+    d.add_argument("--faucet-concurrency", type=int, default=faucet.DEFAULT_CONCURRENCY)
+    d.add_argument("--mint-concurrency", type=int, default=1)
+    d.add_argument("--mint-delay", type=int, default=5)
+    d.add_argument("--rate", type=positive_float, default=None)
+    d.add_argument("--incremental", action="store_true")
+    d.add_argument("--workers", type=int, default=2, help="job yang boleh jalan bersamaan")
+    d.add_argument("--metrics-port", type=int, default=None)
+    d.add_argument("--metrics-out", default=None)
+    d.set_defaults(func=cmd_daemon)
+
+    # mode fee tx (type-2 EIP-1559 + target kecepatan inklusi) per job
+    for sp in (m, s, r, d):
+        sp.add_argument("--fee-mode", choices=("legacy", "eip1559", "auto"), default="legacy")
+        sp.add_argument("--speed", choices=("slow", "normal", "fast"), default="normal",
+                        help="target inklusi (persentil tip eth_feeHistory)")
+    return p
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        interactive()
+        return
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,251 +1,444 @@
-# faucet.py — Pharos Testnet Faucet (tampilan sederhana & rapi)
-
-import requests
-import json
-import time
-from typing import List, Dict, Optional, Tuple
-from eth_account import Account
-from eth_account.messages import encode_defunct
-
-# ──( Konfigurasi API )───────────────────────────────────────────────────────────
-BASE_URL = "https://api.pharosnetwork.xyz"
-HEADERS_BASE = {
-    "accept": "application/json, text/plain, */*",
-    "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
-    "authorization": "Bearer null",
-    "content-length": "0",
-    "origin": "https://testnet.pharosnetwork.xyz",
-    "priority": "u=1, i",
-    "referer": "https://testnet.pharosnetwork.xyz/",
-    "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-    "sec-ch-ua-mobile": "?0",
-    "sec-ch-ua-platform": '"Windows"',
-    "sec-fetch-dest": "empty",
-    "sec-fetch-mode": "cors",
-    "sec-fetch-site": "same-site",
-    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-}
-
-# ──( Util tampilan )─────────────────────────────────────────────────────────────
-def fmt_addr(addr: str) -> str:
-    return addr if len(addr) <= 14 else f"{addr[:8]}…{addr[-4:]}"
-
-def ok_json(data: dict) -> bool:
-    # Umumnya API sukses: {"code":0, "data": {...}}
-    return isinstance(data, dict) and data.get("code") == 0
-
-def get_streak_from_status(data: dict) -> Optional[int]:
-    """
-    Coba ambil informasi 'streak' / hari berturut-turut dari response /sign/status
-    Struktur pasti API bisa berubah; aman-kan akses.
-    """
-    try:
-        d = data.get("data") or {}
-        # Beberapa API pakai 'consecutiveDays' atau 'streak'
-        for k in ("consecutiveDays", "streak", "continueDays", "days"):
-            if k in d and isinstance(d[k], int):
-                return d[k]
-    except Exception:
-        pass
-    return None
-
-def safe_get_msg(data: dict) -> str:
-    # Ambil pesan yang human-friendly kalau ada
-    if not isinstance(data, dict):
-        return "-"
-    if "msg" in data and isinstance(data["msg"], str):
-        return data["msg"]
-    if "message" in data and isinstance(data["message"], str):
-        return data["message"]
-    return "-"
-
-# ──( HTTP helper )───────────────────────────────────────────────────────────────
-def make_request(method: str, url: str, params=None, headers=None, retries=3, backoff=1.5):
-    for attempt in range(retries):
-        try:
-            r = requests.request(method, url, params=params, headers=headers, timeout=15)
-            if r.status_code in (200, 201):
-                return r
-        except Exception:
-            pass
-        if attempt < retries - 1:
-            time.sleep(backoff ** attempt)
-    return None
-
-# ──( File utils )────────────────────────────────────────────────────────────────
-def read_private_keys(filename: str = "privatekey.txt") -> List[str]:
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            return [ln.strip() for ln in f if ln.strip()]
-    except FileNotFoundError:
-        print("❌ File privatekey.txt tidak ditemukan")
-        return []
-
-def read_invite_code(filename: str = "reff.txt") -> Optional[str]:
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            code = f.read().strip()
-            return code or None
-    except FileNotFoundError:
-        return None
-
-# ──( Auth )──────────────────────────────────────────────────────────────────────
-def generate_signature(private_key: str, message: str = "pharos") -> Tuple[Optional[str], Optional[str]]:
-    try:
-        acct = Account.from_key(private_key)
-        msg = encode_defunct(text=message)
-        sig = acct.sign_message(msg).signature.hex()
-        if not sig.startswith("0x"):
-            sig = "0x" + sig
-        return acct.address, sig
-    except Exception:
-        return None, None
-
-def login(address: str, signature: str) -> Optional[str]:
-    url = f"{BASE_URL}/user/login"
-    resp = make_request("POST", url, params={"address": address, "signature": signature}, headers=HEADERS_BASE)
-    if not resp:
-        return None
-    try:
-        data = resp.json()
-        if ok_json(data):
-            return (data.get("data") or {}).get("jwt")
-    except Exception:
-        pass
-    return None
-
-def api_with_jwt(path: str, method: str, jwt: str, address: str):
-    url = f"{BASE_URL}{path}"
-    headers = {**HEADERS_BASE, "authorization": f"Bearer {jwt}"}
-    resp = make_request(method, url, params={"address": address}, headers=headers)
-    try:
-        return resp.json() if resp else None
-    except Exception:
-        return None
-
-# ──( Pipeline per akun )─────────────────────────────────────────────────────────
-def process_account(pk: str, idx: int, total: int) -> Dict[str, Optional[str]]:
-    """
-    Kembalikan ringkasan: {
-      'addr': '0x..',
-      'login': '✓/✗',
-      'signin': '✓/✗',
-      'streak': 'n / -',
-      'faucet': '✓/✗',
-      'note': 'pesan singkat'
-    }
-    """
-    summary = {"addr": "-", "login": "✗", "signin": "✗", "streak": "-", "faucet": "✗", "note": "-"}
-    try:
-        acct = Account.from_key(pk)
-        addr = acct.address
-        summary["addr"] = fmt_addr(addr)
-    except Exception:
-        summary["note"] = "PK invalid"
-        return summary
-
-    # Login
-    address, sig = generate_signature(pk)
-    if not (address and sig):
-        summary["note"] = "Sign message gagal"
-        return summary
-    jwt = login(address, sig)
-    if not jwt:
-        summary["note"] = "Login gagal"
-        return summary
-    summary["login"] = "✓"
-
-    # Sign-in harian
-    res_signin = api_with_jwt("/sign/in", "POST", jwt, address)
-    if ok_json(res_signin):
-        summary["signin"] = "✓"
-    else:
-        summary["signin"] = "✗"
-
-    # Status (ambil streak jika ada)
-    res_status = api_with_jwt("/sign/status", "GET", jwt, address)
-    st = get_streak_from_status(res_status or {})
-    if st is not None:
-        summary["streak"] = str(st)
-
-    # Faucet daily
-    res_faucet = api_with_jwt("/faucet/daily", "POST", jwt, address)
-    if ok_json(res_faucet):
-        summary["faucet"] = "✓"
-        summary["note"] = "OK"
-    else:
-        # tampilkan pesan singkat biar tahu kenapa gagal (mis. cooldown)
-        summary["note"] = safe_get_msg(res_faucet or {})
-    return summary
-
-# ──( Runner )────────────────────────────────────────────────────────────────────
-def print_header():
-    title = "PHAROS FAUCET — SIMPLE RUN"
-    print("\n" + title)
-    print("-" * len(title))
-
-def print_table(rows: List[Dict[str, str]]):
-    # Kolom: # | Address | Login | Sign-in | Streak | Faucet | Note
-    headers = ["#", "Address", "Login", "Sign-in", "Streak", "Faucet", "Note"]
-    widths = [4, 16, 7, 9, 8, 8, 30]
-
-    def fmt_row(cols, widths):
-        return " ".join(str(c).ljust(w) for c, w in zip(cols, widths))
-
-    print(fmt_row(headers, widths))
-    print(fmt_row(["─"*w for w in widths], widths))
-
-    for i, r in enumerate(rows, 1):
-        print(fmt_row([
-            i,
-            r.get("addr", "-"),
-            r.get("login", "-"),
-            r.get("signin", "-"),
-            r.get("streak", "-"),
-            r.get("faucet", "-"),
-            (r.get("note", "-") or "-")[:widths[-1]],
-        ], widths))
-
-def print_summary(rows: List[Dict[str, str]]):
-    total = len(rows)
-    log_ok = sum(1 for r in rows if r.get("login") == "✓")
-    si_ok = sum(1 for r in rows if r.get("signin") == "✓")
-    fc_ok = sum(1 for r in rows if r.get("faucet") == "✓")
-    print("\nSummary:")
-    print(f"  Accounts   : {total}")
-    print(f"  Login OK   : {log_ok}")
-    print(f"  Sign-in OK : {si_ok}")
-    print(f"  Faucet OK  : {fc_ok}\n")
-
-def run_once():
-    private_keys = read_private_keys()
-    if not private_keys:
-        return
-
-    print_header()
-    rows = []
-    for idx, pk in enumerate(private_keys, 1):
-        row = process_account(pk, idx, len(private_keys))
-        rows.append(row)
-        # jeda pendek untuk jaga-jaga rate limit
-        time.sleep(0.3)
-
-    print_table(rows)
-    print_summary(rows)
-
-def run_loop(interval_sec: int = 3600):
-    while True:
-        run_once()
-        hrs = max(1, interval_sec // 3600)
-        print(f"Menunggu {hrs} jam untuk siklus berikutnya…\n")
-        time.sleep(interval_sec)
-
-def main(loop: bool = False, interval_sec: int = 3600):
-    if loop:
-        run_loop(interval_sec)
-    else:
-        run_once()
-
-if __name__ == "__main__":
-    # Default: sekali jalan agar output ringkas
-    main(loop=False, interval_sec=3600)
+# faucet.py — Pharos Testnet Faucet (tampilan sederhana & rapi)
+
+import requests
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Tuple
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from requests.adapters import HTTPAdapter
+
+import pacing
+import scheduler
+from tokencache import TokenCache
+import keystore
+import state
+import metrics
+import results
+import retry
+from urllib.parse import urlparse
+
+# ──( Konfigurasi API )───────────────────────────────────────────────────────────
+BASE_URL = "https://api.pharosnetwork.xyz"
+HEADERS_BASE = {
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
+    "authorization": "Bearer null",
+    "content-length": "0",
+    "origin": "https://testnet.pharosnetwork.xyz",
+    "priority": "u=1, i",
+    "referer": "https://testnet.pharosnetwork.xyz/",
+    "sec-ch-ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-site",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+}
+
+# ──( Util tampilan )─────────────────────────────────────────────────────────────
+def fmt_addr(addr: str) -> str:
+    return addr if len(addr) <= 14 else f"{addr[:8]}…{addr[-4:]}"
+
+def ok_json(data: dict) -> bool:
+    # Umumnya API sukses: {"code":0, "data": {...}}
+    return isinstance(data, dict) and data.get("code") == 0
+
+def get_streak_from_status(data: dict) -> Optional[int]:
+    """
+    Coba ambil informasi 'streak' / hari berturut-turut dari response /sign/status
+    Struktur pasti API bisa berubah; aman-kan akses.
+    """
+    try:
+        d = data.get("data") or {}
+        # Beberapa API pakai 'consecutiveDays' atau 'streak'
+        for k in ("consecutiveDays", "streak", "continueDays", "days"):
+            if k in d and isinstance(d[k], int):
+                return d[k]
+    except Exception:
+        pass
+    return None
+
+def safe_get_msg(data: dict) -> str:
+    # Ambil pesan yang human-friendly kalau ada
+    if not isinstance(data, dict):
+        return "-"
+    if "msg" in data and isinstance(data["msg"], str):
+        return data["msg"]
+    if "message" in data and isinstance(data["message"], str):
+        return data["message"]
+    return "-"
+
+# ──( HTTP engine )───────────────────────────────────────────────────────────────
+# Batas atas request/detik ke API (semua thread berbagi satu pacer).
+# Pacer AIMD: turun saat 429 / timeout / 5xx, naik lagi pelan-pelan sampai batas ini.
+DEFAULT_RATE_PER_SEC = 5.0
+DEFAULT_CONCURRENCY = 4
+MIN_RATE_PER_SEC = 0.5
+
+_pacer = pacing.Pacer("faucet_api", rate=DEFAULT_RATE_PER_SEC, min_rate=MIN_RATE_PER_SEC,
+                      max_rate=DEFAULT_RATE_PER_SEC)
+_budget = retry.RetryBudget()  # diganti baru di tiap run_once
+_local = threading.local()
+
+def set_rate_limit(rate_per_sec: float):
+    if rate_per_sec <= 0:
+        raise ValueError(f"rate harus > 0 (dapat {rate_per_sec})")
+    _pacer.set_limits(min_rate=min(MIN_RATE_PER_SEC, rate_per_sec), max_rate=rate_per_sec)
+    _pacer.reset(rate_per_sec)
+
+def get_session() -> requests.Session:
+    # Session keep-alive per thread → koneksi TLS dipakai ulang antar request
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        _local.session = s
+    return s
+
+# ──( HTTP helper )───────────────────────────────────────────────────────────────
+def make_request(method: str, url: str, params=None, headers=None, retries=3):
+    """
+    Request dengan retry berbasis kelas error: hanya 429 / 5xx / error jaringan
+    yang diulang (backoff eksponensial + jitter, memakai retry budget run ini).
+    4xx lain tidak akan sembuh dengan retry. Breaker per host mencegah API
+    yang sedang down dibanjiri request.
+    """
+    policy = retry.RetryPolicy(max_attempts=retries, base=0.5, cap=10.0, budget=_budget)
+    host = urlparse(url).netloc
+    path = urlparse(url).path
+    attempt = 0
+    while True:
+        if not retry.BREAKER.wait(host, max_wait=retry.BREAKER.cooldown * 2):
+            metrics.inc("http_calls_total", path=path, status="circuit_open")
+            return None
+        try:
+            _pacer.wait()
+            t0 = time.perf_counter()
+            r = get_session().request(method, url, params=params, headers=headers, timeout=15)
+            metrics.inc("http_calls_total", path=path, status=r.status_code)
+            if r.status_code in (200, 201, 401):
+                # 401 tidak akan sembuh dengan retry → kembalikan supaya JWT di-refresh
+                retry.BREAKER.record_success(host)
+                _pacer.success(time.perf_counter() - t0)
+                return r
+            kind = retry.classify(status=r.status_code)
+        except Exception as e:
+            metrics.inc("http_calls_total", path=path, status=type(e).__name__)
+            kind = retry.classify(e)
+        _pacer.failure(kind)
+        if kind in (retry.TRANSIENT, retry.RATE_LIMIT):
+            retry.BREAKER.record_failure(host)
+        else:
+            retry.BREAKER.record_success(host)  # host hidup, request-nya yang salah
+        metrics.error("api_call", kind)
+        attempt += 1
+        if not policy.should_retry(kind, attempt):
+            return None
+        policy.sleep(attempt)
+
+# ──( File utils )────────────────────────────────────────────────────────────────
+def read_wallets(filename: str = "privatekey.txt") -> List[keystore.Wallet]:
+    # keystore: validasi + derivasi address sekali (di-index di disk)
+    try:
+        ks = keystore.get_keystore(filename)
+    except FileNotFoundError:
+        print("❌ File privatekey.txt tidak ditemukan")
+        return []
+    if ks.invalid:
+        print(f"⚠️  {len(ks.invalid)} baris privatekey.txt invalid dilewati")
+    return ks.wallets
+
+def read_invite_code(filename: str = "reff.txt") -> Optional[str]:
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            code = f.read().strip()
+            return code or None
+    except FileNotFoundError:
+        return None
+
+# ──( Auth )──────────────────────────────────────────────────────────────────────
+def generate_signature(private_key, message: str = "pharos") -> Tuple[Optional[str], Optional[str]]:
+    # private_key boleh string key atau LocalAccount yang sudah diderivasi
+    try:
+        acct = private_key if hasattr(private_key, "sign_message") else Account.from_key(private_key)
+        msg = encode_defunct(text=message)
+        sig = acct.sign_message(msg).signature.hex()
+        if not sig.startswith("0x"):
+            sig = "0x" + sig
+        return acct.address, sig
+    except Exception:
+        return None, None
+
+class AuthExpired(Exception):
+    pass
+
+_token_cache: Optional[TokenCache] = None
+_token_cache_lock = threading.Lock()
+
+def get_token_cache() -> TokenCache:
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = TokenCache()
+    return _token_cache
+
+def login(address: str, signature: str) -> Optional[str]:
+    url = f"{BASE_URL}/user/login"
+    with metrics.timer("login"):
+        resp = make_request("POST", url, params={"address": address, "signature": signature}, headers=HEADERS_BASE)
+    if not resp or resp.status_code == 401:
+        return None
+    try:
+        data = resp.json()
+        if ok_json(data):
+            return (data.get("data") or {}).get("jwt")
+    except Exception:
+        pass
+    return None
+
+def api_with_jwt(path: str, method: str, jwt: str, address: str):
+    url = f"{BASE_URL}{path}"
+    headers = {**HEADERS_BASE, "authorization": f"Bearer {jwt}"}
+    with metrics.timer("api_call"):
+        resp = make_request(method, url, params={"address": address}, headers=headers)
+    if resp is not None and resp.status_code == 401:
+        raise AuthExpired(path)
+    try:
+        return resp.json() if resp else None
+    except Exception:
+        return None
+
+def fresh_login(wallet: keystore.Wallet, summary: dict) -> Optional[str]:
+    """Sign pesan + /user/login, simpan JWT ke cache. Isi summary['note'] kalau gagal."""
+    try:
+        account = wallet.account
+    except Exception:
+        summary["note"] = "PK invalid"
+        return None
+    with metrics.timer("sign_message"):
+        address, sig = generate_signature(account)
+    if not (address and sig):
+        summary["note"] = "Sign message gagal"
+        return None
+    jwt = login(address, sig)
+    if not jwt:
+        summary["note"] = "Login gagal"
+        summary["login"] = "✗"
+        return None
+    get_token_cache().put(wallet.address, jwt)
+    return jwt
+
+# ──( Pipeline per akun )─────────────────────────────────────────────────────────
+def process_account(wallet: keystore.Wallet, idx: int, total: int) -> Dict[str, Optional[str]]:
+    """
+    Kembalikan ringkasan: {
+      'addr': '0x..',
+      'login': '✓/✗',
+      'signin': '✓/✗',
+      'streak': 'n / -',
+      'faucet': '✓/✗',
+      'note': 'pesan singkat'
+    }
+    """
+    summary = {"addr": "-", "login": "✗", "signin": "✗", "streak": "-", "faucet": "✗", "note": "-"}
+    addr = wallet.address
+    summary["addr"] = fmt_addr(addr)
+
+    # Login (pakai JWT cache kalau masih valid)
+    cache = get_token_cache()
+    jwt = cache.get(addr)
+    if not jwt:
+        jwt = fresh_login(wallet, summary)
+        if not jwt:
+            return summary
+    summary["login"] = "✓"
+
+    def call(path: str, method: str):
+        # token cache bisa saja sudah dicabut server → re-login sekali saat 401
+        nonlocal jwt
+        try:
+            return api_with_jwt(path, method, jwt, addr)
+        except AuthExpired:
+            cache.drop(addr)
+            jwt = fresh_login(wallet, summary)
+            if not jwt:
+                return None
+            try:
+                return api_with_jwt(path, method, jwt, addr)
+            except AuthExpired:
+                return None
+
+    # Sign-in harian
+    res_signin = call("/sign/in", "POST")
+    if ok_json(res_signin):
+        summary["signin"] = "✓"
+    else:
+        summary["signin"] = "✗"
+
+    # Status (ambil streak jika ada)
+    res_status = call("/sign/status", "GET")
+    st = get_streak_from_status(res_status or {})
+    if st is not None:
+        summary["streak"] = str(st)
+
+    # Faucet daily
+    res_faucet = call("/faucet/daily", "POST")
+    if ok_json(res_faucet):
+        summary["faucet"] = "✓"
+        summary["note"] = "OK"
+    else:
+        # tampilkan pesan singkat biar tahu kenapa gagal (mis. cooldown)
+        summary["note"] = safe_get_msg(res_faucet or {})
+    return summary
+
+# ──( Runner )────────────────────────────────────────────────────────────────────
+def print_header():
+    title = "PHAROS FAUCET — SIMPLE RUN"
+    print("\n" + title)
+    print("-" * len(title))
+
+# Kolom: # | Address | Login | Sign-in | Streak | Faucet | Note
+TABLE_HEADERS = ["#", "Address", "Login", "Sign-in", "Streak", "Faucet", "Note"]
+TABLE_WIDTHS = [4, 16, 7, 9, 8, 8, 30]
+
+def _fmt_row(cols) -> str:
+    return " ".join(str(c).ljust(w) for c, w in zip(cols, TABLE_WIDTHS))
+
+def print_table_header():
+    print(_fmt_row(TABLE_HEADERS))
+    print(_fmt_row(["─"*w for w in TABLE_WIDTHS]))
+
+def print_table_row(r: Dict[str, str], i: int = 0):
+    print(_fmt_row([
+        r.get("idx", i),
+        r.get("addr", "-"),
+        r.get("login", "-"),
+        r.get("signin", "-"),
+        r.get("streak", "-"),
+        r.get("faucet", "-"),
+        (r.get("note", "-") or "-")[:TABLE_WIDTHS[-1]],
+    ]))
+
+def print_table(rows: Iterable[Dict[str, str]]):
+    print_table_header()
+    for i, r in enumerate(rows, 1):
+        print_table_row(r, i)
+
+def tally(totals: Dict[str, int], row: Dict[str, str]) -> Dict[str, int]:
+    # total berjalan per akun → ringkasan tanpa menyimpan / membaca ulang semua baris
+    totals["total"] = totals.get("total", 0) + 1
+    for col in ("login", "signin", "faucet"):
+        totals[col] = totals.get(col, 0) + (row.get(col) == "✓")
+    return totals
+
+def print_summary(totals: Dict[str, int]):
+    print("\nSummary:")
+    print(f"  Accounts   : {totals.get('total', 0)}")
+    print(f"  Login OK   : {totals.get('login', 0)}")
+    print(f"  Sign-in OK : {totals.get('signin', 0)}")
+    print(f"  Faucet OK  : {totals.get('faucet', 0)}\n")
+
+FAUCET_COOLDOWN_SEC = 24 * 3600
+
+def already_done_today(address: str) -> bool:
+    """Faucet sudah diklaim < 24 jam lalu DAN sudah sign-in hari ini (UTC)."""
+    claim_at, signin_at = state.get_store().last_faucet(address)
+    if claim_at is None or signin_at is None:
+        return False
+    now = time.time()
+    same_day = time.gmtime(signin_at)[:3] == time.gmtime(now)[:3]
+    return now - claim_at < FAUCET_COOLDOWN_SEC and same_day
+
+def _process_and_record(wallet: keystore.Wallet, total: int, incremental: bool) -> Dict[str, Optional[str]]:
+    if incremental and already_done_today(wallet.address):
+        return {"idx": wallet.index, "addr": fmt_addr(wallet.address), "login": "-", "signin": "-", "streak": "-",
+                "faucet": "-", "note": "skip (sudah klaim)"}
+    row = process_account(wallet, wallet.index, total)
+    row["idx"] = wallet.index
+    state.get_store().record_faucet(wallet.address, claimed=row.get("faucet") == "✓",
+                                    signed_in=row.get("signin") == "✓")
+    return row
+
+def run_once(concurrency: int = DEFAULT_CONCURRENCY, rate_per_sec: Optional[float] = None,
+             incremental: bool = False, force_full: bool = False, metrics_out: Optional[str] = None,
+             results_out: Optional[str] = None):
+    """
+    Proses semua akun. `concurrency` akun jalan bersamaan; total request ke API
+    dibatasi token bucket (`rate_per_sec`, default DEFAULT_RATE_PER_SEC).
+    incremental=True → lewati akun yang menurut state.db sudah klaim & sign-in hari ini
+    (force_full=True mengabaikannya). metrics_out → export metrik (.json / .prom) di akhir run.
+    results_out → tiap akun langsung ditulis sebagai satu baris JSONL begitu selesai;
+    baris tabel dicetak saat itu juga (urutan selesai, kolom # = urutan akun) dan
+    ringkasan dari total berjalan → tidak ada list semua baris di memori.
+    """
+    wallets = read_wallets()
+    if not wallets:
+        return
+
+    if rate_per_sec is not None:
+        set_rate_limit(rate_per_sec)
+    global _budget
+    _budget = retry.RetryBudget()  # budget retry milik run ini saja
+
+    print_header()
+    total = len(wallets)
+    skip = incremental and not force_full
+    if results_out:
+        # file di-append antar siklus run_loop → tiap record diberi id run
+        run_id = f"{time.time():.0f}"
+        totals = {}
+        print_table_header()
+        with results.ResultWriter(results_out) as out:
+            for row in results.stream_map(lambda w: _process_and_record(w, total, skip), wallets, concurrency):
+                out.write("faucet", run=run_id, **row)
+                print_table_row(row)
+                tally(totals, row)
+        print_summary(totals)
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            # map menjaga urutan hasil sesuai urutan privatekey.txt
+            rows = list(pool.map(lambda w: _process_and_record(w, total, skip), wallets))
+        print_table(rows)
+        totals = {}
+        for row in rows:
+            tally(totals, row)
+        print_summary(totals)
+    get_token_cache().flush()  # JWT baru dari run ini ke disk (tulis di-debounce selama run)
+    if metrics_out:
+        metrics.export(metrics_out)
+
+def run_loop(interval_sec: int = 3600, concurrency: int = DEFAULT_CONCURRENCY, rate_per_sec: Optional[float] = None,
+             incremental: bool = False, metrics_out: Optional[str] = None, metrics_port: Optional[int] = None,
+             results_out: Optional[str] = None):
+    # metrics_port → metrik live di http://127.0.0.1:<port>/metrics selama loop berjalan
+    if metrics_port:
+        metrics.serve(metrics_port)
+        print(f"📈 Metrics live di http://127.0.0.1:{metrics_port}/metrics")
+    # interval dihitung dari awal siklus (bukan sleep buta setelah selesai); stop() lewat scheduler
+    sched = scheduler.Scheduler(workers=1)
+    sched.add(faucet_job(interval_sec, concurrency=concurrency, rate_per_sec=rate_per_sec,
+                         incremental=incremental, metrics_out=metrics_out, results_out=results_out))
+    sched.run_forever()
+
+def faucet_job(interval_sec: Optional[int] = None, **kwargs) -> "scheduler.Job":
+    """Job scheduler untuk run_once (dipakai run_loop & daemon bot.py)."""
+    return scheduler.Job("faucet", run_once, interval_sec=interval_sec, **kwargs)
+
+def main(loop: bool = False, interval_sec: int = 3600, concurrency: int = DEFAULT_CONCURRENCY,
+         rate_per_sec: Optional[float] = None, incremental: bool = False, force_full: bool = False,
+         metrics_out: Optional[str] = None, metrics_port: Optional[int] = None, results_out: Optional[str] = None):
+    if loop:
+        run_loop(interval_sec, concurrency, rate_per_sec, incremental, metrics_out, metrics_port, results_out)
+    else:
+        run_once(concurrency, rate_per_sec, incremental, force_full, metrics_out, results_out)
+
+if __name__ == "__main__":
+    # Default: sekali jalan agar output ringkas
+    main(loop=False, interval_sec=3600)
@@ -0,0 +1,145 @@
+# gas.py — Gas oracle bersama (cache gas price + gas limit hasil belajar)
+#
+# - gas_price(): eth_gasPrice di-cache selama `ttl` detik (+ buffer 10%)
+# - gas_limit(key, estimate_fn): pakai gasUsed yang pernah teramati untuk
+#   kontrak yang sama; eth_estimateGas hanya saat belum ada data (cold)
+# - observe(key, gas_used): dipanggil dari receipt sukses
+# - fees(mode, speed): field fee untuk tx — legacy (gasPrice) atau EIP-1559
+#   (maxFeePerGas / maxPriorityFeePerGas dari persentil eth_feeHistory)
+
+import threading
+import time
+from statistics import median
+from typing import Callable, Dict, Optional
+
+LEGACY = "legacy"
+EIP1559 = "eip1559"
+AUTO = "auto"  # EIP-1559 kalau chain punya baseFee, selain itu legacy
+FEE_MODES = (LEGACY, EIP1559, AUTO)
+
+# target kecepatan inklusi → (persentil tip di eth_feeHistory, headroom base fee).
+# headroom 1.25 ≈ tahan ~2 blok base fee naik penuh (+12.5%/blok), 2.0 ≈ ~6 blok.
+SPEEDS = {
+    "slow": (10, 1.25),
+    "normal": (50, 1.5),
+    "fast": (90, 2.0),
+}
+HISTORY_BLOCKS = 10
+
+
+def fee_cap(fees: dict) -> int:
+    """Harga per gas maksimum yang mungkin dibayar (untuk cek / reservasi saldo)."""
+    return fees.get("maxFeePerGas") or fees["gasPrice"]
+
+
+class GasOracle:
+    def __init__(self, w3, ttl: float = 5.0, price_buffer: float = 1.1,
+                 limit_buffer: float = 1.2, fallback_gwei: int = 1):
+        self.w3 = w3
+        self.ttl = ttl
+        self.price_buffer = price_buffer
+        self.limit_buffer = limit_buffer
+        self.fallback_gwei = fallback_gwei
+        self._lock = threading.Lock()
+        self._price: Optional[int] = None
+        self._price_at = 0.0
+        self._learned: Dict[str, int] = {}
+        self._history: Optional[dict] = None
+        self._history_at = 0.0
+
+    # ──( Gas price )───────────────────────────────────────────────────────────
+    def gas_price(self) -> int:
+        with self._lock:
+            if self._price is not None and time.time() - self._price_at < self.ttl:
+                return self._price
+        try:
+            price = int(self.w3.eth.gas_price * self.price_buffer)
+        except Exception:
+            with self._lock:
+                if self._price is not None:
+                    return self._price  # pakai nilai lama daripada fallback
+            return self.w3.to_wei(self.fallback_gwei, "gwei")
+        with self._lock:
+            self._price, self._price_at = price, time.time()
+        return price
+
+    def invalidate(self):
+        with self._lock:
+            self._price = None
+            self._history = None
+
+    # ──( EIP-1559 )────────────────────────────────────────────────────────────
+    def _fee_history(self) -> Optional[dict]:
+        """eth_feeHistory (semua persentil SPEEDS sekaligus), di-cache `ttl` detik."""
+        with self._lock:
+            if self._history is not None and time.time() - self._history_at < self.ttl:
+                return self._history
+        pcts = sorted(p for p, _ in SPEEDS.values())
+        try:
+            h = self.w3.eth.fee_history(HISTORY_BLOCKS, "latest", pcts)
+        except Exception:
+            with self._lock:
+                return self._history  # nilai lama (bisa None)
+        base = list(h.get("baseFeePerGas") or [])
+        if not base or not base[-1]:
+            history = {"base": None}  # chain tanpa EIP-1559
+        else:
+            rewards = [list(r) for r in (h.get("reward") or [])]
+            history = {
+                "base": int(base[-1]),  # elemen terakhir = base fee blok berikutnya
+                "tips": {p: [r[i] for r in rewards if len(r) > i and r[i]] for i, p in enumerate(pcts)},
+            }
+        with self._lock:
+            self._history, self._history_at = history, time.time()
+        return history
+
+    def fees(self, mode: str = LEGACY, speed: str = "normal") -> dict:
+        """
+        Field fee untuk tx. LEGACY → {"gasPrice"}; EIP1559/AUTO → {"maxFeePerGas",
+        "maxPriorityFeePerGas"}, jatuh ke legacy kalau chain / RPC tidak mendukung.
+        """
+        if mode == LEGACY:
+            return {"gasPrice": self.gas_price()}
+        pct, headroom = SPEEDS.get(speed, SPEEDS["normal"])
+        history = self._fee_history()
+        if not history or history["base"] is None:
+            return {"gasPrice": self.gas_price()}
+        tips = history["tips"].get(pct) or []
+        if tips:
+            tip = int(median(tips))
+        else:
+            # blok-blok terakhir kosong → tanya node (0 kalau tidak didukung)
+            try:
+                tip = int(self.w3.eth.max_priority_fee)
+            except Exception:
+                tip = 0
+        return {"maxFeePerGas": int(history["base"] * headroom) + tip, "maxPriorityFeePerGas": tip}
+
+    # ──( Gas limit )───────────────────────────────────────────────────────────
+    def gas_limit(self, key: str, estimate_fn: Callable[[], int]) -> int:
+        """Gas limit untuk `key` (mis. alamat kontrak); estimate_fn dipakai saat cold."""
+        key = key.lower()
+        with self._lock:
+            used = self._learned.get(key)
+        if used is not None:
+            return int(used * self.limit_buffer)
+        return estimate_fn()
+
+    def observe(self, key: str, gas_used: int):
+        key = key.lower()
+        with self._lock:
+            self._learned[key] = max(gas_used, self._learned.get(key, 0))
+
+
+_oracle: Optional[GasOracle] = None
+_oracle_lock = threading.Lock()
+
+
+def get_oracle(w3) -> GasOracle:
+    """Satu oracle per proses (dipakai bersama mintnft & send)."""
+    global _oracle
+    if _oracle is None:
+        with _oracle_lock:
+            if _oracle is None:
+                _oracle = GasOracle(w3)
+    return _oracle
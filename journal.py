@@ -0,0 +1,276 @@
+# journal.py — Write-ahead journal untuk setiap tx yang di-sign
+#
+# Tiap tx dicatat (append-only JSONL + fsync) SEBELUM di-broadcast:
+#   signed    → wallet, nonce, hash, purpose, raw tx
+#   replaced  → versi baru (fee bump) untuk nonce yang sama
+#   confirmed / reverted / failed / dropped → status akhir
+#   job_done  → satu job (mis. satu run send) selesai semua
+# Saat start, reconcile() mencocokkan entry yang masih pending dengan chain:
+# sudah ada receipt → selesai; nonce sudah dipakai tx lain → dropped; belum ada
+# sama sekali → raw tx di-broadcast ulang lalu ditunggu. Jadi run berikutnya
+# lanjut persis dari titik berhenti tanpa kirim dobel.
+# Saat load journal dipadatkan: file ditulis ulang hanya berisi entry pending,
+# entry final milik job yang belum selesai (dipakai purposes() untuk resume)
+# dan penanda job_done. Raw tx dibuang begitu entry final, jadi file tidak
+# tumbuh terus antar run.
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import retry
+from receipts import to_hex
+from rpc import as_client
+
+DEFAULT_PATH = "tx_journal.jsonl"
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+REVERTED = "reverted"
+FAILED = "failed"    # ditolak node saat broadcast, nonce dikembalikan
+DROPPED = "dropped"  # nonce sudah terpakai tx lain, tidak ada versi kita yang masuk block
+FINAL = {CONFIRMED, REVERTED, FAILED, DROPPED}
+
+Key = Tuple[str, int]  # (wallet lower, nonce)
+
+# Error broadcast yang belum tentu penolakan: timeout / 5xx / 429 / respons hilang.
+# Node bisa saja sudah memegang tx-nya → entry tetap pending, nonce tidak dipakai ulang.
+AMBIGUOUS = {retry.TRANSIENT, retry.RATE_LIMIT, retry.UNKNOWN}
+
+
+def rejected(error) -> bool:
+    """True kalau node pasti menolak tx (aman dicatat FAILED & nonce-nya dipakai tx lain)."""
+    return retry.classify(error) not in AMBIGUOUS
+
+
+class TxJournal:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, dict] = {}
+        self._jobs_done: Set[str] = set()
+        read = self._replay()
+        snap = self._snapshot()
+        if read > len(snap):
+            self._compact(snap)
+        self._f = open(path, "a", encoding="utf-8")
+
+    # ──( Tulis )───────────────────────────────────────────────────────────────
+    def _append(self, event: str, **fields):
+        rec = {"ts": round(time.time(), 3), "event": event, **fields}
+        line = json.dumps(rec, default=str)
+        with self._lock:
+            self._f.write(line + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())  # write-ahead: harus di disk sebelum broadcast
+            self._apply(rec)
+
+    def signed(self, wallet: str, nonce: int, tx_hash, raw: bytes, purpose: str, job: Optional[str] = None):
+        self._append("signed", wallet=wallet.lower(), nonce=nonce, hash=to_hex(tx_hash), raw=to_hex(raw),
+                     purpose=purpose, job=job)
+
+    def signed_many(self, rows: Iterable[tuple], job: Optional[str] = None):
+        """rows: [(wallet, nonce, hash, raw, purpose)] — satu fsync untuk semua (pre-sign batch)."""
+        recs = [{"ts": round(time.time(), 3), "event": "signed", "wallet": w.lower(), "nonce": n, "hash": to_hex(h),
+                 "raw": to_hex(raw), "purpose": purpose, "job": job} for w, n, h, raw, purpose in rows]
+        if not recs:
+            return
+        with self._lock:
+            self._f.write("".join(json.dumps(r) + "\n" for r in recs))
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            for r in recs:
+                self._apply(r)
+
+    def replaced(self, wallet: str, nonce: int, tx_hash, raw: bytes):
+        self._append("replaced", wallet=wallet.lower(), nonce=nonce, hash=to_hex(tx_hash), raw=to_hex(raw))
+
+    def finish(self, wallet: str, nonce: int, status: str, tx_hash=None):
+        self._append(status, wallet=wallet.lower(), nonce=nonce, hash=to_hex(tx_hash) if tx_hash else None)
+
+    def job_done(self, job: str):
+        self._append("job_done", job=job)
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._f.close()
+
+    # ──( Baca / fold )─────────────────────────────────────────────────────────
+    def _replay(self) -> int:
+        """Fold seluruh file ke memori. Return jumlah baris yang dibaca."""
+        if not os.path.exists(self.path):
+            return 0
+        n = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                n += 1
+                try:
+                    self._apply(json.loads(line))
+                except ValueError:
+                    continue  # baris terakhir terpotong saat crash
+        return n
+
+    def _snapshot(self) -> List[dict]:
+        """Event minimal yang, di-replay ulang, menghasilkan state yang masih dipakai."""
+        recs = []
+        for e in self._entries.values():
+            if e["status"] != PENDING and (e["job"] is None or e["job"] in self._jobs_done):
+                continue  # final & job-nya sudah selesai: tidak dibaca lagi
+            base = {"wallet": e["wallet"], "nonce": e["nonce"]}
+            last = len(e["hashes"]) - 1
+            recs.append({"event": "signed", **base, "hash": e["hashes"][0], "raw": e["raw"] if last == 0 else None,
+                         "purpose": e["purpose"], "job": e["job"]})
+            recs += [{"event": "replaced", **base, "hash": h, "raw": e["raw"] if i == last else None}
+                     for i, h in enumerate(e["hashes"][1:], 1)]
+            if e["status"] != PENDING:
+                recs.append({"event": e["status"], **base, "hash": e["hash"]})
+        recs += [{"event": "job_done", "job": j} for j in sorted(self._jobs_done)]
+        return recs
+
+    def _compact(self, recs: List[dict]):
+        # tmp + fsync + rename: crash di tengah tidak merusak journal lama
+        tmp = self.path + ".tmp"
+        ts = round(time.time(), 3)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps({"ts": ts, **r}) + "\n" for r in recs))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _apply(self, rec: dict):
+        ev = rec.get("event")
+        if ev == "job_done":
+            self._jobs_done.add(rec.get("job"))
+            return
+        key = (rec.get("wallet"), rec.get("nonce"))
+        if ev == "signed":
+            # nonce yang sama bisa dipakai ulang setelah FAILED → entry baru
+            self._entries[key] = {"wallet": key[0], "nonce": key[1], "purpose": rec.get("purpose"),
+                                  "job": rec.get("job"), "hashes": [rec["hash"]], "raw": rec.get("raw"),
+                                  "status": PENDING, "hash": None}
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        if ev == "replaced":
+            entry["hashes"].append(rec["hash"])
+            entry["raw"] = rec.get("raw")
+        elif ev in FINAL:
+            entry["status"] = ev
+            entry["hash"] = rec.get("hash")
+            entry["raw"] = None  # tidak akan di-broadcast ulang lagi
+
+    def pending(self) -> List[dict]:
+        with self._lock:
+            return [dict(e) for e in self._entries.values() if e["status"] == PENDING]
+
+    def next_nonce(self, wallet: str) -> Optional[int]:
+        """Nonce sesudah tx pending tertinggi milik `wallet` di journal (None = tidak ada)."""
+        w = wallet.lower()
+        with self._lock:
+            nonces = [e["nonce"] for e in self._entries.values() if e["wallet"] == w and e["status"] == PENDING]
+        return max(nonces) + 1 if nonces else None
+
+    def open_job(self, base: str) -> str:
+        """
+        Id job aktif untuk `base`: base:0, base:1, ... (naik tiap job_done). Run ulang
+        yang sengaja setelah job selesai dapat id baru; run yang terhenti tetap di id lama.
+        """
+        with self._lock:
+            n = 0
+            while f"{base}:{n}" in self._jobs_done:
+                n += 1
+            return f"{base}:{n}"
+
+    def purposes(self, job: Optional[str] = None, statuses: Iterable[str] = (PENDING, CONFIRMED)) -> Set[str]:
+        """Purpose yang sudah (atau sedang) dikerjakan, opsional difilter per job."""
+        statuses = set(statuses)
+        with self._lock:
+            return {e["purpose"] for e in self._entries.values()
+                    if e["status"] in statuses and (job is None or e["job"] == job)}
+
+    # ──( Rekonsiliasi saat start )─────────────────────────────────────────────
+    def reconcile(self, rpc=None, tracker=None, wait_timeout: float = 180,
+                  on_final: Callable[[dict, str], None] = None) -> Dict[str, int]:
+        """
+        Cocokkan entry pending dengan chain. `tracker` (ReceiptTracker) opsional:
+        kalau diisi, tx yang di-broadcast ulang ditunggu sampai ada receipt.
+        on_final(entry, status) dipanggil untuk tiap entry yang statusnya jadi final.
+        Return hitungan per status hasil rekonsiliasi.
+        """
+        todo = self.pending()
+
+        def settle(e: dict, status: str, h=None):
+            self.finish(e["wallet"], e["nonce"], status, h)
+            counts[status] += 1
+            if on_final:
+                on_final(e, status)
+
+        counts = {CONFIRMED: 0, REVERTED: 0, DROPPED: 0, "resent": 0, PENDING: 0}
+        if not todo:
+            return counts
+        client = as_client(rpc)
+
+        # 1) receipt untuk semua versi tx (batch)
+        hashes = [h for e in todo for h in e["hashes"]]
+        res = client.batch([("eth_getTransactionReceipt", [h]) for h in hashes])
+        mined = {h: r for h, r in zip(hashes, res) if isinstance(r, dict)}
+        rest = []
+        for e in todo:
+            h = next((h for h in e["hashes"] if h in mined), None)
+            if h is None:
+                rest.append(e)
+                continue
+            settle(e, CONFIRMED if int(mined[h].get("status", "0x1"), 16) == 1 else REVERTED, h)
+
+        # 2) belum ada receipt: nonce sudah terpakai tx lain → dropped, selain itu kirim ulang
+        rest.sort(key=lambda e: (e["wallet"], e["nonce"]))  # kirim ulang berurutan nonce
+        wallets = sorted({e["wallet"] for e in rest})
+        res = client.batch([("eth_getTransactionCount", [w, "latest"]) for w in wallets])
+        latest = {w: int(r, 16) for w, r in zip(wallets, res) if isinstance(r, str)}
+        waiting = []
+        for e in rest:
+            n = latest.get(e["wallet"])
+            if n is not None and e["nonce"] < n:
+                settle(e, DROPPED)
+                continue
+            try:
+                client.call("eth_sendRawTransaction", [e["raw"]])
+                counts["resent"] += 1
+            except Exception:
+                pass  # "already known" = masih di mempool; error lain → tetap ditunggu / dicek run berikutnya
+            waiting.append(e)
+
+        # 3) tunggu yang masih di mempool
+        if tracker is None:
+            counts[PENDING] = len(waiting)
+            return counts
+        futs = [(e, {tracker.watch(h, timeout=wait_timeout): h for h in e["hashes"]}) for e in waiting]
+        for e, fs in futs:
+            receipt, h = None, None
+            for f in as_completed(fs):  # versi mana pun yang masuk block duluan
+                if f.exception() is None:
+                    receipt, h = f.result(), fs[f]
+                    break
+            if receipt is None:
+                counts[PENDING] += 1
+                continue
+            settle(e, CONFIRMED if receipt.status == 1 else REVERTED, h)
+        return counts
+
+
+_journal: Optional[TxJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_journal(path: str = DEFAULT_PATH) -> TxJournal:
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = TxJournal(path)
+    return _journal
@@ -0,0 +1,155 @@
+# keystore.py — Loader privatekey.txt bersama (mintnft, faucet, send)
+#
+# - File dibaca baris per baris (streaming), tiap key divalidasi sekali.
+# - Derivasi secp256k1 (key → address) hanya dilakukan sekali per key:
+#   address disimpan di index on-disk (sha256(key) → address), jadi key yang
+#   tidak berubah tidak perlu diderivasi ulang saat start berikutnya.
+# - Objek LocalAccount (untuk signing) baru dibuat saat benar-benar dipakai
+#   dan di-cache di Wallet.
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from eth_account import Account
+
+DEFAULT_PATH = "privatekey.txt"
+DEFAULT_INDEX_PATH = ".keystore_index.json"
+
+_HEX_RE = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+def validate_private_key(key: str) -> Optional[str]:
+    """Normalisasi ke '0x' + 64 hex (lowercase), atau None kalau format salah."""
+    key = key.strip()
+    if key.startswith("0x") or key.startswith("0X"):
+        key = key[2:]
+    key = "".join(key.split())
+    if not _HEX_RE.match(key):
+        return None
+    return "0x" + key.lower()
+
+
+def _fingerprint(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class Wallet:
+    __slots__ = ("index", "key", "address", "_account", "_lock")
+
+    def __init__(self, index: int, key: str, address: str, account=None):
+        self.index = index
+        self.key = key
+        self.address = address
+        self._account = account
+        self._lock = threading.Lock()
+
+    @property
+    def account(self):
+        """LocalAccount untuk signing (derivasi sekali, lalu di-cache)."""
+        if self._account is None:
+            with self._lock:
+                if self._account is None:
+                    self._account = Account.from_key(self.key)
+        return self._account
+
+    def __repr__(self):
+        return f"Wallet({self.index}, {self.address})"
+
+
+class Keystore:
+    def __init__(self, path: str = DEFAULT_PATH, index_path: Optional[str] = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.index_path = index_path
+        self.wallets: List[Wallet] = []
+        self.invalid: List[Tuple[int, str]] = []  # (nomor baris, alasan)
+        self.derived = 0  # berapa key yang benar-benar diderivasi saat load
+
+    # ──( Index on-disk )───────────────────────────────────────────────────────
+    def _load_index(self) -> Dict[str, str]:
+        if not self.index_path:
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self, index: Dict[str, str]):
+        if not self.index_path:
+            return
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+    # ──( Load )────────────────────────────────────────────────────────────────
+    def _iter_lines(self) -> Iterator[Tuple[int, str]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line
+
+    def load(self) -> "Keystore":
+        """Baca & validasi semua key. FileNotFoundError diteruskan ke pemanggil."""
+        old_index = self._load_index()
+        new_index: Dict[str, str] = {}
+        seen = set()
+        wallets, invalid = [], []
+        for line_no, line in self._iter_lines():
+            key = validate_private_key(line)
+            if key is None:
+                invalid.append((line_no, "format"))
+                continue
+            fp = _fingerprint(key)
+            address = old_index.get(fp)
+            account = None
+            if address is None:
+                try:
+                    account = Account.from_key(key)
+                except Exception:
+                    invalid.append((line_no, "key"))
+                    continue
+                address = account.address
+                self.derived += 1
+            new_index[fp] = address
+            if fp in seen:
+                continue  # key duplikat → cukup sekali
+            seen.add(fp)
+            wallets.append(Wallet(len(wallets) + 1, key, address, account))
+        self.wallets, self.invalid = wallets, invalid
+        if new_index != old_index:
+            self._save_index(new_index)
+        return self
+
+    def __len__(self):
+        return len(self.wallets)
+
+    def __iter__(self):
+        return iter(self.wallets)
+
+
+_cache: Dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def get_keystore(path: str = DEFAULT_PATH) -> Keystore:
+    """
+    Keystore ter-cache per proses (di-load ulang kalau file berubah).
+    Jadi bot.py yang menjalankan mint lalu faucet cukup load sekali.
+    """
+    mtime = os.path.getmtime(path)  # FileNotFoundError → pemanggil
+    with _cache_lock:
+        hit = _cache.get(path)
+        if hit and hit[0] == mtime:
+            return hit[1]
+        ks = Keystore(path).load()
+        _cache[path] = (mtime, ks)
+        return ks
@@ -0,0 +1,77 @@
+# ledger.py — Ledger nonce & saldo lokal per wallet
+#
+# Nonce dan saldo dibaca SEKALI dari chain, lalu dialokasikan secara lokal:
+# - reserve(cost)  → ambil nonce berikutnya + kurangi saldo perkiraan
+# - release(...)   → tx batal dikirim, kembalikan saldo (nonce di-rollback / tandai gap)
+# - settle(...)    → tx sudah ada receipt, koreksi saldo dengan biaya aktual
+# - resync()       → baca ulang dari chain (setelah "nonce too low" / gap)
+
+import threading
+from typing import Optional
+
+
+class AccountLedger:
+    def __init__(self, w3, address: str, nonce: Optional[int] = None, balance: Optional[int] = None):
+        self.w3 = w3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next_nonce = nonce
+        self._balance = balance
+        self._gap = False
+        # hanya baca dari chain yang belum diketahui pemanggil
+        if self._next_nonce is None:
+            self._next_nonce = w3.eth.get_transaction_count(address, "pending")
+        if self._balance is None:
+            self._balance = w3.eth.get_balance(address)
+
+    # ──( Baca dari chain )─────────────────────────────────────────────────────
+    def resync(self):
+        """Baca ulang nonce (pending) & saldo dari chain."""
+        nonce = self.w3.eth.get_transaction_count(self.address, "pending")
+        balance = self.w3.eth.get_balance(self.address)
+        with self._lock:
+            self._next_nonce = nonce
+            self._balance = balance
+            self._gap = False
+
+    # ──( Alokasi lokal )───────────────────────────────────────────────────────
+    @property
+    def balance(self) -> int:
+        with self._lock:
+            return self._balance
+
+    @property
+    def next_nonce(self) -> int:
+        with self._lock:
+            return self._next_nonce
+
+    def reserve(self, cost: int) -> Optional[int]:
+        """
+        Alokasikan nonce untuk tx dengan perkiraan biaya `cost` (wei).
+        Return None kalau saldo lokal tidak cukup.
+        """
+        if self._gap:
+            self.resync()
+        with self._lock:
+            if self._balance < cost:
+                return None
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            self._balance -= cost
+            return nonce
+
+    def release(self, nonce: int, cost: int):
+        """Tx dengan `nonce` tidak jadi terkirim → kembalikan saldo & nonce."""
+        with self._lock:
+            self._balance += cost
+            if nonce == self._next_nonce - 1:
+                self._next_nonce = nonce
+            else:
+                # ada tx lain setelahnya → nonce bolong, sync ulang sebelum alokasi berikutnya
+                self._gap = True
+
+    def settle(self, reserved_cost: int, actual_cost: int):
+        """Koreksi saldo setelah receipt (gas terpakai biasanya < gas limit)."""
+        with self._lock:
+            self._balance += reserved_cost - actual_cost
+
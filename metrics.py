@@ -0,0 +1,197 @@
+# metrics.py — Registry metrik per stage (thread-safe)
+#
+# - Histogram latency per stage (sign, estimate, send, receipt_wait, login, api_call, ...)
+# - Counter error per stage & kelas error
+# - Counter call RPC (per method) dan HTTP (per path & status)
+# Export ke JSON atau Prometheus text, di akhir run (export(path)) atau live
+# lewat HTTP (serve(port) → /metrics dan /metrics.json).
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+PREFIX = "pharos"
+# batas bucket histogram (detik)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 180)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float):
+        self.sum += v
+        self.count += 1
+        for i, b in enumerate(self.buckets):
+            if v <= b:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Perkiraan kuantil dari bucket (batas atas bucket)."""
+        if not self.count:
+            return None
+        target, acc = q * self.count, 0
+        for b, c in zip(self.buckets, self.counts):
+            acc += c
+            if acc >= target:
+                return b
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._hists: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.started_at = time.time()
+
+    # ──( Tulis )───────────────────────────────────────────────────────────────
+    def inc(self, name: str, n: float = 1, **labels):
+        k = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[k] = series.get(k, 0) + n
+
+    def observe(self, name: str, seconds: float, **labels):
+        k = _key(labels)
+        with self._lock:
+            series = self._hists.setdefault(name, {})
+            h = series.get(k)
+            if h is None:
+                h = series[k] = Histogram()
+            h.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Ukur durasi blok; error di dalam blok dicatat sebagai stage error."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.inc("errors_total", stage=stage, error=type(e).__name__)
+            raise
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - t0, stage=stage)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._hists.clear()
+            self.started_at = time.time()
+
+    # ──( Export )──────────────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                for name, series in self._counters.items()
+            }
+            hists = {
+                name: [
+                    {"labels": dict(k), "count": h.count, "sum": round(h.sum, 6),
+                     "p50": h.quantile(0.5), "p99": h.quantile(0.99)}
+                    for k, h in series.items()
+                ]
+                for name, series in self._hists.items()
+            }
+        return {"uptime_sec": round(time.time() - self.started_at, 3), "counters": counters, "histograms": hists}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        def fmt_labels(k: LabelKey, extra: dict = None) -> str:
+            items = list(k) + list((extra or {}).items())
+            if not items:
+                return ""
+            return "{" + ",".join(f'{a}="{b}"' for a, b in items) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{PREFIX}_{name}"
+                lines.append(f"# TYPE {full} counter")
+                for k, v in series.items():
+                    lines.append(f"{full}{fmt_labels(k)} {v}")
+            for name, series in sorted(self._hists.items()):
+                full = f"{PREFIX}_{name}"
+                lines.append(f"# TYPE {full} histogram")
+                for k, h in series.items():
+                    acc = 0
+                    for b, c in zip(h.buckets, h.counts):
+                        acc += c
+                        lines.append(f"{full}_bucket{fmt_labels(k, {'le': str(b)})} {acc}")
+                    lines.append(f"{full}_bucket{fmt_labels(k, {'le': '+Inf'})} {h.count}")
+                    lines.append(f"{full}_sum{fmt_labels(k)} {h.sum}")
+                    lines.append(f"{full}_count{fmt_labels(k)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Tulis ke file: .prom / .txt → Prometheus text, selain itu JSON."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+REGISTRY = Registry()
+
+# shortcut level modul
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+export = REGISTRY.export
+
+
+def error(stage: str, kind: str):
+    REGISTRY.inc("errors_total", stage=stage, error=kind)
+
+
+# ──( Endpoint HTTP live )───────────────────────────────────────────────────────
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Expose /metrics (Prometheus) & /metrics.json di thread background."""
+    global _server
+    if _server is not None:
+        return _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *a):
+            pass
+
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, ctype = REGISTRY.to_json(), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, ctype = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("content-type", ctype)
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    _server = ThreadingHTTPServer((host, port), Handler)
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
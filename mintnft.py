@@ -1,310 +1,804 @@
-from web3 import Web3
-from eth_account import Account
-import time
-import json
-import re
-from datetime import datetime
-
-# ====== Konfigurasi ======
-RPC_URL = "https://testnet.dplabs-internal.com"
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
-chain_id = w3.eth.chain_id
-
-# ====== Util ======
-def validate_private_key(key: str):
-    key = key.strip()
-    if key.startswith('0x'):
-        key = key[2:]
-    key = ''.join(key.split())
-    if len(key) != 64 or not re.match(r'^[0-9a-fA-F]+$', key):
-        return None
-    return key
-
-def load_private_keys(path: str = "privatekey.txt"):
-    valid_keys = []
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.read().split('\n') if line.strip()]
-
-        for i, line in enumerate(lines, 1):
-            cleaned_key = validate_private_key(line)
-            if cleaned_key:
-                try:
-                    test_account = Account.from_key(cleaned_key)
-                    valid_keys.append(cleaned_key)
-                    print(f"✅ Wallet {i}: {test_account.address[:8]}...")
-                except Exception:
-                    print(f"❌ Wallet {i}: Invalid")
-            else:
-                print(f"❌ Wallet {i}: Invalid format")
-    except FileNotFoundError:
-        print("❌ File privatekey.txt tidak ditemukan!")
-        return []
-    return valid_keys
-
-# ====== Kontrak NFT ======
-nft_contracts = [
-    {"name": "NFT 1", "address": "0x1da9f40036bee3fda37ddd9bff624e1125d8991d"},
-    {"name": "NFT 2", "address": "0x2a469a4073480596b9deb19f52aa89891ccff5ce"},
-    {"name": "NFT 3", "address": "0xe71188df7be6321ffd5aaa6e52e6c96375e62793"},
-    {"name": "NFT 4", "address": "0xb2ac4f09735007562c513ebbe152a8d7fa682bef"},
-    {"name": "NFT 5", "address": "0x96381ed3fcfb385cbacfe6908159f0905b19767a"},
-    {"name": "NFT 6", "address": "0x0d00314d006e70ca08ac37c3469b4bf958a7580b"},
-    {"name": "NFT 7", "address": "0x4af366c7269dc9a0335bd055af979729c20e0f5f"},
-    {"name": "NFT 8", "address": "0x9979b7fedf761c2989642f63ba6ed580dbdfc46f"},
-    {"name": "NFT 9", "address": "0x822483f6cf39b7dad66fec5f4feecbfd72172626"},  # NFT baru
-]
-
-contract_abi = [
-    {
-        "inputs": [
-            {"internalType": "address", "name": "_receiver", "type": "address"},
-            {"internalType": "uint256", "name": "_quantity", "type": "uint256"},
-            {"internalType": "address", "name": "_currency", "type": "address"},
-            {"internalType": "uint256", "name": "_pricePerToken", "type": "uint256"},
-            {
-                "components": [
-                    {"internalType": "bytes32[]", "name": "proof", "type": "bytes32[]"},
-                    {"internalType": "uint256", "name": "quantityLimitPerWallet", "type": "uint256"},
-                    {"internalType": "uint256", "name": "pricePerToken", "type": "uint256"},
-                    {"internalType": "address", "name": "currency", "type": "address"}
-                ],
-                "internalType": "struct IDrop.AllowlistProof",
-                "name": "_allowlistProof",
-                "type": "tuple"
-            },
-            {"internalType": "bytes", "name": "_data", "type": "bytes"}
-        ],
-        "name": "claim",
-        "outputs": [],
-        "stateMutability": "payable",
-        "type": "function"
-    },
-    {
-        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
-
-# ====== Statistik ======
-stats = {
-    "total_minted": 0,
-    "total_failed": 0,
-    "total_gas_used": 0,
-    "errors": {}
-}
-
-# ====== Fungsi Minting ======
-def check_nft_balance(contract, address):
-    try:
-        return contract.functions.balanceOf(address).call()
-    except Exception as e:
-        print(f"   ⚠️  Error checking balance: {str(e)[:50]}...")
-        return 0
-
-def get_gas_price():
-    try:
-        gas_price = w3.eth.gas_price
-        return int(gas_price * 1.1)  # buffer 10%
-    except Exception:
-        return w3.to_wei(1, 'gwei')
-
-def estimate_gas(contract, wallet_address, receiver, quantity, currency, price_per_token, allowlist_proof, data, value):
-    try:
-        estimated = contract.functions.claim(
-            receiver, quantity, currency, price_per_token, allowlist_proof, data
-        ).estimate_gas({'from': wallet_address, 'value': value})
-        return int(estimated * 1.2)  # buffer 20%
-    except Exception:
-        return 250000
-
-def mint_nft(contract_address, wallet_address, private_key, nft_name, retry_count=0):
-    max_retries = 2
-    try:
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(contract_address),
-            abi=contract_abi
-        )
-        receiver = Web3.to_checksum_address(wallet_address)
-        quantity = 1
-        currency = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
-        price_per_token = w3.to_wei(1, 'ether')  # ganti sesuai kebutuhanmu
-
-        allowlist_proof = ([], 2**256 - 1, 0, "0x0000000000000000000000000000000000000000")
-        data = "0x"
-
-        nonce = w3.eth.get_transaction_count(wallet_address)
-        total_value = price_per_token * quantity
-
-        gas_price = get_gas_price()
-        gas_limit = estimate_gas(
-            contract, wallet_address, receiver, quantity,
-            currency, price_per_token, allowlist_proof, data, total_value
-        )
-
-        tx = contract.functions.claim(
-            receiver, quantity, currency, price_per_token, allowlist_proof, data
-        ).build_transaction({
-            'from': wallet_address,
-            'value': total_value,
-            'nonce': nonce,
-            'gasPrice': gas_price,
-            'chainId': chain_id,
-            'gas': gas_limit
-        })
-
-        total_cost = total_value + (gas_limit * gas_price)
-        eth_cost = w3.from_wei(total_cost, 'ether')
-        print(f"   💸 Estimated cost: {eth_cost:.4f} ETH (Gas: {gas_limit})")
-
-        balance = w3.eth.get_balance(wallet_address)
-        if balance < total_cost:
-            print(f"   ❌ Insufficient balance untuk {nft_name}")
-            stats["total_failed"] += 1
-            return False
-
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-        raw_tx = getattr(signed_tx, "rawTransaction", None) or getattr(signed_tx, "raw_transaction", None)
-
-        print(f"   📤 Sending TX untuk {nft_name}...")
-        tx_hash = w3.eth.send_raw_transaction(raw_tx)
-        print(f"   🔍 TX Hash: {tx_hash.hex()}")
-        print(f"   ⏳ Menunggu konfirmasi...")
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
-
-        if receipt.status == 1:
-            gas_used = receipt.gasUsed
-            gas_cost = w3.from_wei(gas_used * gas_price, 'ether')
-            print(f"   ✅ {nft_name} minted!")
-            print(f"   ⛽ Gas used: {gas_used} ({gas_cost:.4f} ETH)")
-            stats["total_minted"] += 1
-            stats["total_gas_used"] += gas_used
-            return True
-        else:
-            print(f"   ❌ {nft_name} tx failed!")
-            stats["total_failed"] += 1
-            key = f"{nft_name}_failed"
-            stats["errors"][key] = stats["errors"].get(key, 0) + 1
-            if retry_count < max_retries:
-                print(f"   🔄 Retry {nft_name} ({retry_count + 2}/{max_retries + 1})...")
-                time.sleep(3)
-                return mint_nft(contract_address, wallet_address, private_key, nft_name, retry_count + 1)
-            return False
-
-    except Exception as e:
-        msg = str(e)
-        print(f"   ❌ {nft_name} error: {msg[:100]}...")
-        if "insufficient funds" in msg.lower():
-            stats["errors"]["insufficient_funds"] = stats["errors"].get("insufficient_funds", 0) + 1
-        elif "nonce too low" in msg.lower():
-            stats["errors"]["nonce_error"] = stats["errors"].get("nonce_error", 0) + 1
-        else:
-            stats["errors"]["other"] = stats["errors"].get("other", 0) + 1
-        stats["total_failed"] += 1
-        if retry_count < max_retries and "nonce" not in msg.lower():
-            print(f"   🔄 Retry {nft_name} ({retry_count + 2}/{max_retries + 1})...")
-            time.sleep(5)
-            return mint_nft(contract_address, wallet_address, private_key, nft_name, retry_count + 1)
-        return False
-
-def process_wallet(wallet_index: int, private_key: str):
-    try:
-        account = Account.from_key(private_key)
-        wallet_address = account.address
-    except Exception:
-        print(f"❌ Wallet {wallet_index}: Private key invalid")
-        return
-
-    print(f"🎯 Wallet {wallet_index}: {wallet_address}")
-    eth_balance = w3.eth.get_balance(wallet_address)
-    eth_amount = w3.from_wei(eth_balance, 'ether')
-    print(f"   💰 Balance: {eth_amount:.4f} ETH")
-
-    if eth_balance < w3.to_wei(0.1, 'ether'):
-        print(f"   ❌ Balance kurang (min 0.1 ETH)")
-        return
-
-    owned_nfts, missing_nfts = [], []
-    print(f"   🔍 Cek NFT yang sudah dimiliki...")
-    for nft_info in nft_contracts:
-        try:
-            contract = w3.eth.contract(
-                address=Web3.to_checksum_address(nft_info["address"]),
-                abi=contract_abi
-            )
-            owned_bal = check_nft_balance(contract, wallet_address)
-            if owned_bal > 0:
-                owned_nfts.append(nft_info["name"])
-            else:
-                missing_nfts.append(nft_info)
-        except Exception as e:
-            print(f"   ⚠️  Error cek {nft_info['name']}: {str(e)[:50]}...")
-            missing_nfts.append(nft_info)
-
-    if owned_nfts:
-        print(f"   ✅ Sudah punya: {', '.join(owned_nfts)}")
-
-    if not missing_nfts:
-        print(f"   🎉 Semua NFT sudah dimiliki!")
-        return
-
-    print(f"   🔄 Perlu mint: {len(missing_nfts)} NFT")
-    minted, failed = 0, 0
-    for i, nft_info in enumerate(missing_nfts, 1):
-        print(f"\n   📍 Minting {nft_info['name']} ({i}/{len(missing_nfts)})")
-        ok = mint_nft(nft_info["address"], wallet_address, private_key, nft_info["name"])
-        if ok:
-            minted += 1
-            time.sleep(3)
-        else:
-            failed += 1
-            time.sleep(2)
-    print(f"\n   📊 Ringkasan wallet: {minted} minted, {failed} gagal")
-
-def print_final_stats():
-    print("\n" + "="*50)
-    print("📊 FINAL STATISTICS")
-    print("="*50)
-    print(f"✅ Total NFTs minted: {stats['total_minted']}")
-    print(f"❌ Total failed: {stats['total_failed']}")
-    if stats['total_gas_used'] > 0 and stats['total_minted'] > 0:
-        avg_gas = stats['total_gas_used'] / stats['total_minted']
-        print(f"⛽ Average gas per mint: {avg_gas:,.0f}")
-    if stats['errors']:
-        print("\n🚨 Error Summary:")
-        for k, v in stats['errors'].items():
-            print(f"   - {k}: {v}")
-    print(f"\n⏱️  Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*50)
-
-def main(delay_between_wallets_sec: int = 5):
-    print(f"🔗 Chain ID: {chain_id}")
-    print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    print("🚀 Starting NFT minting process...\n")
-
-    private_keys = load_private_keys()
-    if not private_keys:
-        return
-
-    try:
-        for i, pk in enumerate(private_keys, 1):
-            process_wallet(i, pk)
-            if i < len(private_keys):
-                print(f"\n⏳ Next wallet in {delay_between_wallets_sec} seconds...")
-                print("-"*50 + "\n")
-                time.sleep(delay_between_wallets_sec)
-            else:
-                print("")
-        print("🎉 All wallets processed!")
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Dihentikan oleh user!")
-    except Exception as e:
-        print(f"\n\n❌ Unexpected error: {str(e)}")
-    finally:
-        print_final_stats()
-
-if __name__ == "__main__":
-    main()
+from web3 import Web3
+import time
+import json
+import threading
+from datetime import datetime
+
+from ledger import AccountLedger
+import retry
+import keystore
+import state
+import rpc
+from txbuilder import ClaimBuilder
+from receipts import ReceiptTimeout, ReceiptTracker, to_hex
+from replacer import Replacer
+import journal
+import gas
+import scan
+import metrics
+import results
+import pacing
+import preflight
+import signer
+
+# ====== Konfigurasi ======
+# Endpoint RPC diatur di rpc.py (rpc.txt / env PHAROS_RPC_URLS, failover otomatis)
+# w3 tanpa I/O saat import; chain id diambil lazy lewat rpc.get_chain_id()
+w3 = rpc.get_w3()
+
+# ====== Util ======
+_print_lock = threading.Lock()
+_ctx = threading.local()
+
+def log(msg: str = ""):
+    # Prefix per-wallet saat mode paralel supaya output tidak campur aduk
+    prefix = getattr(_ctx, "prefix", "")
+    with _print_lock:
+        if prefix:
+            print("\n".join(f"{prefix}{ln}" if ln else ln for ln in msg.split("\n")))
+        else:
+            print(msg)
+
+def load_wallets(path: str = "privatekey.txt"):
+    """Load wallet lewat keystore (validasi + derivasi address sekali saja)."""
+    try:
+        ks = keystore.get_keystore(path)
+    except FileNotFoundError:
+        print("❌ File privatekey.txt tidak ditemukan!")
+        return []
+    for line_no, reason in ks.invalid:
+        print(f"❌ Wallet {line_no}: {'Invalid format' if reason == 'format' else 'Invalid'}")
+    for w in ks.wallets:
+        print(f"✅ Wallet {w.index}: {w.address[:8]}...")
+    return ks.wallets
+
+# ====== Kontrak NFT ======
+nft_contracts = [
+    {"name": "NFT 1", "address": "0x1da9f40036bee3fda37ddd9bff624e1125d8991d"},
+    {"name": "NFT 2", "address": "0x2a469a4073480596b9deb19f52aa89891ccff5ce"},
+    {"name": "NFT 3", "address": "0xe71188df7be6321ffd5aaa6e52e6c96375e62793"},
+    {"name": "NFT 4", "address": "0xb2ac4f09735007562c513ebbe152a8d7fa682bef"},
+    {"name": "NFT 5", "address": "0x96381ed3fcfb385cbacfe6908159f0905b19767a"},
+    {"name": "NFT 6", "address": "0x0d00314d006e70ca08ac37c3469b4bf958a7580b"},
+    {"name": "NFT 7", "address": "0x4af366c7269dc9a0335bd055af979729c20e0f5f"},
+    {"name": "NFT 8", "address": "0x9979b7fedf761c2989642f63ba6ed580dbdfc46f"},
+    {"name": "NFT 9", "address": "0x822483f6cf39b7dad66fec5f4feecbfd72172626"},  # NFT baru
+]
+
+contract_abi = [
+    {
+        "inputs": [
+            {"internalType": "address", "name": "_receiver", "type": "address"},
+            {"internalType": "uint256", "name": "_quantity", "type": "uint256"},
+            {"internalType": "address", "name": "_currency", "type": "address"},
+            {"internalType": "uint256", "name": "_pricePerToken", "type": "uint256"},
+            {
+                "components": [
+                    {"internalType": "bytes32[]", "name": "proof", "type": "bytes32[]"},
+                    {"internalType": "uint256", "name": "quantityLimitPerWallet", "type": "uint256"},
+                    {"internalType": "uint256", "name": "pricePerToken", "type": "uint256"},
+                    {"internalType": "address", "name": "currency", "type": "address"}
+                ],
+                "internalType": "struct IDrop.AllowlistProof",
+                "name": "_allowlistProof",
+                "type": "tuple"
+            },
+            {"internalType": "bytes", "name": "_data", "type": "bytes"}
+        ],
+        "name": "claim",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Argumen claim (sama untuk semua wallet, kecuali _receiver)
+CLAIM_QUANTITY = 1
+CLAIM_CURRENCY = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+CLAIM_PRICE_PER_TOKEN = Web3.to_wei(1, 'ether')  # ganti sesuai kebutuhanmu
+CLAIM_ALLOWLIST_PROOF = ([], 2**256 - 1, 0, "0x0000000000000000000000000000000000000000")
+CLAIM_DATA = "0x"
+
+_builder = None
+_builder_lock = threading.Lock()
+
+def get_builder() -> ClaimBuilder:
+    """Contract handle + template calldata semua NFT, dibuat sekali."""
+    global _builder
+    if _builder is None:
+        with _builder_lock:
+            if _builder is None:
+                _builder = ClaimBuilder(
+                    w3, [c["address"] for c in nft_contracts], contract_abi,
+                    (CLAIM_QUANTITY, CLAIM_CURRENCY, CLAIM_PRICE_PER_TOKEN, CLAIM_ALLOWLIST_PROOF, CLAIM_DATA),
+                    value=CLAIM_PRICE_PER_TOKEN * CLAIM_QUANTITY,
+                    chain_id=rpc.get_chain_id(),
+                )
+    return _builder
+
+_tracker = ReceiptTracker(poll_interval=1.0, timeout=180)
+
+def get_tracker() -> ReceiptTracker:
+    return _tracker
+
+# tx yang belum masuk block 30 detik → kirim ulang nonce sama dengan fee +12.5% (maks 4×)
+def _journal_replacement(chain, tx_hash, raw):
+    journal.get_journal().replaced(chain.meta["wallet"], chain.nonce, tx_hash, raw)
+
+_replacer = Replacer(_tracker, fee_fn=lambda: get_fees(), stuck_after=30.0, max_bumps=4,
+                     on_replace=_journal_replacement)
+
+def get_replacer() -> Replacer:
+    return _replacer
+
+# Output JSONL streaming (diisi main(results_out=...)), None = nonaktif
+_results = None
+
+# (wallet lower, contract lower) yang claim-nya masih pending di journal setelah
+# rekonsiliasi → tidak boleh di-claim lagi di run ini (bisa bayar dobel)
+_in_flight = set()
+
+def emit(kind: str, **record):
+    if _results is not None:
+        _results.write(kind, **record)
+
+# ====== Statistik ======
+stats = {
+    "total_minted": 0,
+    "total_failed": 0,
+    "total_gas_used": 0,
+    "errors": {}
+}
+_stats_lock = threading.Lock()
+
+def stat_inc(key: str, n: int = 1):
+    with _stats_lock:
+        stats[key] += n
+
+def reset_stats():
+    with _stats_lock:
+        stats.update(total_minted=0, total_failed=0, total_gas_used=0, errors={})
+
+def stat_error(key: str):
+    with _stats_lock:
+        stats["errors"][key] = stats["errors"].get(key, 0) + 1
+
+# ====== Fungsi Minting ======
+def check_nft_balance(contract, address):
+    try:
+        return contract.functions.balanceOf(address).call()
+    except Exception as e:
+        log(f"   ⚠️  Error checking balance: {str(e)[:50]}...")
+        return 0
+
+# Mode fee per run (diisi main): legacy gasPrice atau EIP-1559 dengan target kecepatan
+fee_config = {"mode": gas.LEGACY, "speed": "normal"}
+
+def get_fees() -> dict:
+    # di-cache oleh gas oracle (TTL pendek); legacy sudah termasuk buffer 10%
+    return gas.get_oracle(w3).fees(fee_config["mode"], fee_config["speed"])
+
+def get_gas_price():
+    return gas.fee_cap(get_fees())
+
+def _estimate_claim_gas(contract_address, wallet_address):
+    try:
+        estimated = w3.eth.estimate_gas(get_builder().call_params(contract_address, wallet_address))
+        return int(estimated * 1.2)  # buffer 20%
+    except Exception as e:
+        if retry.classify(e) == retry.REVERT:
+            raise  # claim pasti revert → jangan sign & bayar gas
+        return 250000
+
+def estimate_gas(contract_address, wallet_address):
+    # gas claim sama untuk semua wallet → pakai gasUsed yang sudah teramati, estimate hanya saat cold
+    return gas.get_oracle(w3).gas_limit(
+        contract_address, lambda: _estimate_claim_gas(contract_address, wallet_address)
+    )
+
+def prepare_claim(contract_address, wallet_address, nft_name, ledger: AccountLedger):
+    """
+    Estimate + alokasikan nonce + build tx claim (belum di-sign).
+    Return dict info tx (key "tx" = tx dict), atau None kalau saldo lokal tidak cukup.
+    """
+    builder = get_builder()
+    total_value = builder.value
+
+    fees = get_fees()
+    gas_price = gas.fee_cap(fees)
+    with metrics.timer("estimate"):
+        gas_limit = estimate_gas(contract_address, wallet_address)
+
+    total_cost = total_value + (gas_limit * gas_price)
+    eth_cost = w3.from_wei(total_cost, 'ether')
+    log(f"   💸 Estimated cost: {eth_cost:.4f} ETH (Gas: {gas_limit})")
+
+    nonce = ledger.reserve(total_cost)
+    if nonce is None:
+        log(f"   ❌ Insufficient balance untuk {nft_name}")
+        return None
+
+    return {
+        "name": nft_name,
+        "address": wallet_address,
+        "contract": contract_address,
+        "tx": builder.build_tx(contract_address, wallet_address, nonce, gas_limit, fees),
+        "hash": None,
+        "nonce": nonce,
+        "gas_price": gas_price,
+        "value": total_value,
+        "cost": total_cost,
+    }
+
+def broadcast_claim(sent: dict, raw_tx: bytes, signed_hash: str, key: str):
+    """
+    Catat ke journal (write-ahead), lalu kirim raw tx hasil prepare_claim + signing.
+    Isi sent["hash"] dan daftarkan ke replacer (sent["chain"]) supaya tx macet
+    diganti otomatis dengan fee lebih tinggi.
+    """
+    log(f"   📤 Sending TX untuk {sent['name']} (nonce {sent['nonce']})...")
+    jr = journal.get_journal()
+    jr.signed(sent["address"], sent["nonce"], signed_hash, raw_tx, purpose=f"mint:{sent['contract'].lower()}",
+              job="mint")
+    _send_pacer.wait()
+    t0 = time.perf_counter()
+    try:
+        with metrics.timer("send"):
+            tx_hash = w3.eth.send_raw_transaction(raw_tx)
+    except Exception as e:
+        if journal.rejected(e):
+            jr.finish(sent["address"], sent["nonce"], journal.FAILED)  # nonce dikembalikan ke ledger
+            raise
+        # timeout / respons hilang: tx mungkin sudah di mempool → anggap terkirim, nonce tetap
+        # terpakai; receipt (atau versi replacement) yang menentukan, bukan kirim ulang di nonce baru
+        _send_pacer.failure(retry.classify(e))
+        log(f"   ⚠️  Broadcast {sent['name']} tidak pasti ({str(e)[:80]}), ditunggu lewat receipt")
+        tx_hash = signed_hash
+    else:
+        _send_pacer.success(time.perf_counter() - t0)
+    sent["hash"] = tx_hash
+    sent["chain"] = get_replacer().track(key, sent["tx"], tx_hash, meta={"wallet": sent["address"]})
+    log(f"   🔍 TX Hash: {to_hex(tx_hash)}")
+    return sent
+
+def submit_claim(contract_address, wallet: keystore.Wallet, nft_name, ledger: AccountLedger):
+    """
+    prepare + sign + kirim satu claim (tanpa menunggu receipt).
+    Return dict info tx, atau None kalau saldo lokal tidak cukup.
+    Exception dari RPC diteruskan ke pemanggil (nonce sudah dikembalikan ke ledger).
+    """
+    sent = prepare_claim(contract_address, wallet.address, nft_name, ledger)
+    if sent is None:
+        return None
+    try:
+        raw_tx, signed_hash = signer.get_signer().sign_many(wallet.key, [sent["tx"]])[0]
+        return broadcast_claim(sent, raw_tx, signed_hash, wallet.key)
+    except Exception:
+        if sent["hash"] is not None:
+            return sent  # sudah di network: nonce terpakai, receipt yang menentukan
+        ledger.release(sent["nonce"], sent["cost"])
+        raise
+
+def submit_claims(claims, wallet: keystore.Wallet, ledger: AccountLedger):
+    """
+    Versi batch untuk satu wallet: semua claim di-prepare dulu, di-sign sekaligus
+    di process pool (signer.py), lalu di-broadcast berurutan nonce begitu raw tx siap.
+    `claims` = list nft_info. Return (terkirim [(nft_info, sent)], gagal [(nft_info, exc|None)]);
+    exc None = saldo lokal tidak cukup.
+    """
+    prepared, failed = [], []
+    for i, nft_info in enumerate(claims, 1):
+        log(f"\n   📍 Minting {nft_info['name']} ({i}/{len(claims)})")
+        try:
+            sent = prepare_claim(nft_info["address"], wallet.address, nft_info["name"], ledger)
+        except Exception as e:
+            failed.append((nft_info, e))
+            continue
+        if sent is None:
+            failed.append((nft_info, None))
+        else:
+            prepared.append((nft_info, sent))
+
+    done, cur = [], None
+    try:
+        stream = signer.get_signer().sign_stream(wallet.key, [s["tx"] for _, s in prepared])
+        for cur, sent in prepared:
+            raw_tx, signed_hash = next(stream)
+            try:
+                broadcast_claim(sent, raw_tx, signed_hash, wallet.key)
+            finally:
+                if sent["hash"] is not None:
+                    # sudah di network (error setelah broadcast, mis. saat track) → tetap terkirim
+                    done.append((cur, sent))
+    except Exception as e:
+        # hanya tx yang BELUM di-broadcast yang nonce-nya dikembalikan (tx sesudah yang
+        # gagal juga tidak boleh dikirim: nonce bolong), dari nonce terbesar supaya
+        # ledger bisa rollback tanpa gap
+        rest = prepared[len(done):]
+        if cur is not None and all(n is not cur for n, _ in rest):
+            log(f"   ⚠️  {cur['name']} sudah terkirim, error sesudahnya: {str(e)[:120]}")
+        for nft_info, sent in reversed(rest):
+            ledger.release(sent["nonce"], sent["cost"])
+        failed.extend((nft_info, e if nft_info is cur else RuntimeError("dibatalkan: tx sebelumnya gagal"))
+                      for nft_info, _ in rest)
+    return done, failed
+
+def confirm_claim(sent: dict, ledger: AccountLedger) -> bool:
+    """Tunggu receipt tx hasil submit_claim, update ledger & statistik."""
+    nft_name = sent["name"]
+    chain = sent.get("chain")
+    with metrics.timer("receipt_wait"):
+        # receipt dari versi mana pun di rantai replacement (nonce yang sama)
+        receipt = get_replacer().wait(chain) if chain else get_tracker().wait(sent["hash"])
+    if chain and chain.mined_hash and len(chain.hashes) > 1:
+        log(f"   ♻️  {nft_name} masuk lewat replacement ({len(chain.hashes) - 1}× fee bump)")
+        sent["hash"] = chain.mined_hash
+    gas_used = receipt.gasUsed
+    # type-2: yang dibayar = effectiveGasPrice (base fee + tip), bukan maxFeePerGas
+    gas_fee = gas_used * (receipt.get("effectiveGasPrice") or sent["gas_price"])
+
+    sent["status"] = "ok" if receipt.status == 1 else "reverted"
+    journal.get_journal().finish(sent["address"], sent["nonce"],
+                                 journal.CONFIRMED if receipt.status == 1 else journal.REVERTED, sent["hash"])
+    if receipt.status == 1:
+        gas.get_oracle(w3).observe(sent["contract"], gas_used)
+        state.get_store().set_nft(sent["address"], sent["contract"], True)
+        ledger.settle(sent["cost"], sent["value"] + gas_fee)
+        gas_cost = w3.from_wei(gas_fee, 'ether')
+        log(f"   ✅ {nft_name} minted!")
+        log(f"   ⛽ Gas used: {gas_used} ({gas_cost:.4f} ETH)")
+        stat_inc("total_minted")
+        stat_inc("total_gas_used", gas_used)
+        metrics.inc("tx_total", stage="mint", status="ok")
+        emit("tx", address=sent["address"], nft=nft_name, hash=to_hex(sent["hash"]), nonce=sent["nonce"],
+             status="ok", gas_used=gas_used)
+        return True
+
+    # revert → value dikembalikan, hanya gas yang terpakai
+    ledger.settle(sent["cost"], gas_fee)
+    log(f"   ❌ {nft_name} tx failed!")
+    stat_inc("total_failed")
+    stat_error(f"{nft_name}_failed")
+    metrics.inc("tx_total", stage="mint", status="reverted")
+    emit("tx", address=sent["address"], nft=nft_name, hash=to_hex(sent["hash"]), nonce=sent["nonce"],
+         status="reverted", gas_used=gas_used)
+    return False
+
+def _record_exception(nft_name: str, error) -> str:
+    """Catat error ke stats/metrics, kembalikan kelas error (lihat retry.classify)."""
+    msg = str(error)
+    kind = retry.classify(error)
+    if kind == retry.REVERT:
+        msg = f"revert: {preflight.revert_reason(error)}"
+    log(f"   ❌ {nft_name} error ({kind}): {msg[:100]}...")
+    stat_error(kind)
+    metrics.error("mint", kind)
+    stat_inc("total_failed")
+    _send_pacer.failure(kind)
+    kinds = getattr(_ctx, "error_kinds", None)
+    if kinds is not None:
+        kinds.append(kind)  # dikumpulkan per wallet (lihat process_wallet)
+    return kind
+
+def _recover(kind: str, ledger: AccountLedger):
+    """Perbaiki state lokal sebelum retry sesuai kelas error."""
+    try:
+        if kind == retry.NONCE:
+            ledger.resync()  # nonce lokal tidak sinkron → baca ulang dari chain
+        elif kind == retry.UNDERPRICED:
+            gas.get_oracle(w3).invalidate()  # ambil gas price baru
+    except Exception:
+        pass
+
+# Pacing kirim tx bersama semua thread wallet (AIMD, pengganti sleep tetap).
+# Naik saat RPC cepat, turun saat 429 / timeout / underpriced.
+_send_pacer = pacing.Pacer("mint_send", rate=2.0, min_rate=0.2, max_rate=50.0)
+
+# Maks 3 percobaan per claim; budget retry dibuat baru di tiap run (main)
+_mint_policy = retry.RetryPolicy(max_attempts=3, base=1.0, cap=20.0, budget=retry.RetryBudget())
+
+def mint_nft(contract_address, wallet: keystore.Wallet, nft_name, retry_count=0, ledger=None):
+    """Mint satu NFT secara blocking; retry hanya untuk error yang bisa sembuh."""
+    if ledger is None:
+        ledger = AccountLedger(w3, wallet.address)
+    attempt = retry_count
+    if attempt and not _mint_policy.budget.try_spend():
+        # percobaan ulang dari retry pass process_wallet: satu unit budget per retry, dipotong di sini saja
+        log(f"   ⛔ Retry budget run ini habis")
+        return False
+    while True:
+        try:
+            sent = submit_claim(contract_address, wallet, nft_name, ledger)
+            if sent is None:
+                stat_inc("total_failed")
+                return False
+            log(f"   ⏳ Menunggu konfirmasi...")
+            # revert on-chain tidak di-retry: claim yang sama akan revert lagi
+            return confirm_claim(sent, ledger)
+        except Exception as e:
+            kind = _record_exception(nft_name, e)
+            if isinstance(e, ReceiptTimeout):
+                return False  # nonce masih terpakai tx macet; retry di nonce baru hanya menumpuk
+            _recover(kind, ledger)
+            attempt += 1
+            if not _mint_policy.should_retry(kind, attempt):
+                return False
+            log(f"   🔄 Retry {nft_name} ({attempt + 1}/{_mint_policy.max_attempts})...")
+            _mint_policy.sleep(attempt)
+
+def process_wallet(wallet_index: int, wallet: keystore.Wallet, snapshot: dict = None) -> dict:
+    """
+    Proses satu wallet (cek saldo, cek NFT, mint yang belum ada).
+    Transaksi dalam satu wallet tetap berurutan. `snapshot` (opsional) adalah
+    hasil scan.scan_wallets untuk wallet ini, supaya tidak perlu query ulang.
+    Kembalikan ringkasan: {'index', 'address', 'minted', 'failed', 'status', 'errors'}
+    (errors = kelas error retry.classify yang terjadi di wallet ini).
+    """
+    wallet_address = wallet.address
+    result = {"index": wallet_index, "address": wallet_address, "minted": 0, "failed": 0, "status": "-",
+              "errors": []}
+    _ctx.error_kinds = result["errors"]
+
+    log(f"🎯 Wallet {wallet_index}: {wallet_address}")
+    snapshot = snapshot or {}
+    eth_balance = snapshot.get("balance")
+    if eth_balance is None:
+        eth_balance = w3.eth.get_balance(wallet_address)
+    eth_amount = w3.from_wei(eth_balance, 'ether')
+    log(f"   💰 Balance: {eth_amount:.4f} ETH")
+
+    if eth_balance < w3.to_wei(0.1, 'ether'):
+        log(f"   ❌ Balance kurang (min 0.1 ETH)")
+        result["status"] = "low_balance"
+        return result
+
+    owned_nfts, missing_nfts = [], []
+    log(f"   🔍 Cek NFT yang sudah dimiliki...")
+    known = snapshot.get("nft") or {}
+    doomed = snapshot.get("preflight") or {}
+    for nft_info in nft_contracts:
+        owned_bal = known.get(nft_info["address"].lower())
+        if owned_bal is not None:
+            if owned_bal > 0:
+                owned_nfts.append(nft_info["name"])
+            else:
+                missing_nfts.append(nft_info)
+            continue
+        try:
+            contract = get_builder().contract(nft_info["address"])
+            owned_bal = check_nft_balance(contract, wallet_address)
+            if owned_bal > 0:
+                owned_nfts.append(nft_info["name"])
+            else:
+                missing_nfts.append(nft_info)
+        except Exception as e:
+            log(f"   ⚠️  Error cek {nft_info['name']}: {str(e)[:50]}...")
+            missing_nfts.append(nft_info)
+
+    if owned_nfts:
+        log(f"   ✅ Sudah punya: {', '.join(owned_nfts)}")
+
+    if not missing_nfts:
+        log(f"   🎉 Semua NFT sudah dimiliki!")
+        result["status"] = "complete"
+        return result
+
+    # claim yang menurut simulasi pre-flight pasti revert tidak dikirim
+    minted, failed = 0, 0
+    sendable = []
+    for nft_info in missing_nfts:
+        if (wallet_address.lower(), nft_info["address"].lower()) in _in_flight:
+            log(f"   ⏸️  {nft_info['name']} dilewati: claim run sebelumnya masih pending (journal)")
+            emit("tx", address=wallet_address, nft=nft_info["name"], contract=nft_info["address"], status="pending")
+            continue
+        verdict = doomed.get(nft_info["address"].lower())
+        if verdict is None:
+            sendable.append(nft_info)
+            continue
+        kind, reason = verdict
+        log(f"   ⛔ {nft_info['name']} dilewati, simulasi gagal ({kind}): {reason}")
+        stat_inc("total_failed")
+        stat_error(f"preflight_{kind}")
+        emit("preflight", address=wallet_address, nft=nft_info["name"], contract=nft_info["address"],
+             status=kind, reason=reason)
+        failed += 1
+    missing_nfts = sendable
+    if not missing_nfts:
+        log(f"\n   📊 Ringkasan wallet: 0 minted, {failed} gagal")
+        result.update(failed=failed, status="done")
+        return result
+
+    log(f"   🔄 Perlu mint: {len(missing_nfts)} NFT")
+    ledger = AccountLedger(w3, wallet_address, balance=eth_balance)
+
+    # 1) Kirim semua claim back-to-back (nonce dialokasikan lokal oleh ledger,
+    #    signing paralel di process pool)
+    in_flight, retry_later = [], []
+    sent_ok, not_sent = submit_claims(missing_nfts, wallet, ledger)
+    in_flight.extend(sent_ok)  # sudah diawasi tracker + replacer sejak broadcast
+    for nft_info, e in not_sent:
+        if e is None:
+            stat_inc("total_failed")
+            failed += 1
+            continue
+        kind = _record_exception(nft_info["name"], e)
+        _recover(kind, ledger)
+        if retry.is_retryable(kind):
+            retry_later.append(nft_info)
+        else:
+            failed += 1
+
+    # 2) Tunggu konfirmasi semuanya
+    if in_flight:
+        log(f"\n   ⏳ Menunggu konfirmasi {len(in_flight)} tx...")
+    for nft_info, sent in in_flight:
+        try:
+            ok = confirm_claim(sent, ledger)
+        except Exception as e:
+            _record_exception(nft_info["name"], e)
+            ok = False
+            if isinstance(e, ReceiptTimeout):
+                sent["status"] = "stuck"
+        if ok:
+            minted += 1
+        elif sent.get("status") in ("reverted", "stuck"):
+            # revert → pasti gagal lagi; stuck → semua replacement habis, nonce masih terpakai
+            failed += 1
+        else:
+            retry_later.append(nft_info)
+
+    # 3) Yang gagal diulang satu per satu (mode blocking + retry)
+    if retry_later:
+        try:
+            ledger.resync()
+        except Exception:
+            pass
+    for n, nft_info in enumerate(retry_later, 1):
+        log(f"\n   🔄 Retry {nft_info['name']}...")
+        if not _mint_policy.budget.remaining:
+            log(f"   ⛔ Retry budget run ini habis")
+            failed += len(retry_later) - n + 1
+            break
+        if mint_nft(nft_info["address"], wallet, nft_info["name"], retry_count=1, ledger=ledger):
+            minted += 1
+        else:
+            failed += 1
+    log(f"\n   📊 Ringkasan wallet: {minted} minted, {failed} gagal")
+    result.update(minted=minted, failed=failed, status="done")
+    return result
+
+def print_final_stats():
+    print("\n" + "="*50)
+    print("📊 FINAL STATISTICS")
+    print("="*50)
+    print(f"✅ Total NFTs minted: {stats['total_minted']}")
+    print(f"❌ Total failed: {stats['total_failed']}")
+    if stats['total_gas_used'] > 0 and stats['total_minted'] > 0:
+        avg_gas = stats['total_gas_used'] / stats['total_minted']
+        print(f"⛽ Average gas per mint: {avg_gas:,.0f}")
+    if stats['errors']:
+        print("\n🚨 Error Summary:")
+        for k, v in stats['errors'].items():
+            print(f"   - {k}: {v}")
+    print(f"\n⏱️  Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*50)
+
+def prescan(wallets) -> dict:
+    """Scan saldo + kepemilikan NFT semua wallet sekaligus (JSON-RPC batch)."""
+    addresses = [w.address for w in wallets]
+    t0 = time.time()
+    try:
+        snap = scan.scan_wallets(rpc.get_client(), addresses, [c["address"] for c in nft_contracts])
+    except Exception as e:
+        print(f"⚠️  Pre-scan gagal ({str(e)[:80]}), cek per wallet.")
+        return {}
+    print(f"🔎 Pre-scan {len(addresses)} wallet × {len(nft_contracts)} NFT selesai dalam {time.time() - t0:.1f}s\n")
+    state.get_store().set_nft_many(
+        (addr, c, n > 0)
+        for addr, info in snap.items()
+        for c, n in (info.get("nft") or {}).items()
+        if n is not None
+    )
+    return {addr: snap.get(addr) for addr in addresses}
+
+def resume_journal() -> bool:
+    """
+    Rekonsiliasi tx dari run sebelumnya yang terhenti (crash / Ctrl+C / restart):
+    yang sudah masuk block dicatat, yang belum dikirim ulang & ditunggu dulu
+    supaya claim yang sama tidak dikirim dua kali di nonce baru. Claim yang
+    masih pending sesudahnya masuk `_in_flight` (dilewati run ini).
+    Return False kalau rekonsiliasi gagal → mint tidak boleh jalan.
+    """
+    jr = journal.get_journal()
+    _in_flight.clear()
+    if not jr.pending():
+        return True
+
+    def on_final(entry: dict, status: str):
+        purpose = entry.get("purpose") or ""
+        if status == journal.CONFIRMED and purpose.startswith("mint:"):
+            state.get_store().set_nft(entry["wallet"], purpose[5:], True)
+
+    print(f"📒 Journal: {len(jr.pending())} tx dari run sebelumnya belum final, rekonsiliasi...")
+    try:
+        counts = jr.reconcile(rpc.get_client(), get_tracker(), on_final=on_final)
+    except Exception as e:
+        print(f"❌ Rekonsiliasi journal gagal ({str(e)[:80]}), mint dihentikan supaya tidak kirim dobel.\n")
+        return False
+    _in_flight.update((e["wallet"], e["purpose"][5:]) for e in jr.pending()
+                      if (e.get("purpose") or "").startswith("mint:"))
+    print(f"📒 Journal: {counts[journal.CONFIRMED]} sukses, {counts[journal.REVERTED]} revert, "
+          f"{counts[journal.DROPPED]} dropped, {counts[journal.PENDING]} masih pending\n")
+    return True
+
+def run_preflight(wallets, snapshots: dict):
+    """
+    Simulasikan (eth_call, batch) semua claim yang akan dikirim: wallet dengan saldo
+    cukup × NFT yang belum dimiliki. Claim yang revert ditempel ke snapshot wallet
+    (`snapshot["preflight"]`) supaya process_wallet tidak mengirimnya.
+    """
+    min_balance = w3.to_wei(0.1, 'ether')
+    jobs = []
+    for w in wallets:
+        snap = snapshots.get(w.address)
+        if not snap or snap.get("balance") is None or snap["balance"] < min_balance:
+            continue
+        owned = snap.get("nft") or {}
+        jobs.extend((w.address, c["address"]) for c in nft_contracts if not owned.get(c["address"].lower()))
+    if not jobs:
+        return
+    t0 = time.time()
+    try:
+        with metrics.timer("preflight"):
+            verdicts = preflight.simulate_claims(get_builder(), jobs, rpc.get_client())
+    except Exception as e:
+        print(f"⚠️  Pre-flight gagal ({str(e)[:80]}), claim dikirim tanpa simulasi.")
+        return
+    doomed = 0
+    for (addr, contract), (kind, reason) in verdicts.items():
+        metrics.inc("preflight_total", status=kind)
+        if kind in (preflight.OK, preflight.UNKNOWN):
+            continue
+        snapshots[addr].setdefault("preflight", {})[contract] = (kind, reason)
+        doomed += 1
+    print(f"🧪 Pre-flight {len(jobs)} claim dalam {time.time() - t0:.1f}s: {doomed} pasti gagal, dilewati\n")
+
+def _wallet_pacer(delay_between_wallets_sec: float):
+    """
+    Jeda antar-wallet adaptif: mulai dari delay yang diminta, makin cepat selama
+    wallet sukses tanpa error, melambat lagi (sampai 4× delay) kalau ada masalah.
+    """
+    if delay_between_wallets_sec <= 0:
+        return None
+    rate = 1.0 / delay_between_wallets_sec
+    return pacing.Pacer("mint_wallet", rate=rate, min_rate=rate / 4, max_rate=max(rate * 10, 2.0),
+                        increase=rate / 2)
+
+def _run_sequential(wallets, delay_between_wallets_sec: int, snapshots: dict):
+    pacer = _wallet_pacer(delay_between_wallets_sec)
+    started = None
+    for i, wallet in enumerate(wallets, 1):
+        if pacer is not None:
+            if started is not None:
+                # jeda dihitung dari awal wallet sebelumnya, bukan ditambah di belakangnya
+                left = max(0.0, 1.0 / pacer.rate - (time.time() - started))
+                print(f"\n⏳ Next wallet dalam ~{left:.1f}s (pacing {1.0 / pacer.rate:.1f}s per wallet)...")
+                print("-"*50 + "\n")
+            pacer.wait()  # burst 1 → wallet pertama langsung jalan
+        started = time.time()
+        r = process_wallet(i, wallet, snapshots.get(wallet.address))
+        emit("wallet", **r)
+        if pacer is None:
+            continue
+        # hanya error beban (429 / timeout / underpriced) yang memperlambat; revert dll tidak
+        backoff = [k for k in r["errors"] if k in pacing.BACKOFF_KINDS]
+        if backoff:
+            pacer.failure(backoff[0])
+        elif not r["failed"]:
+            pacer.success()
+    if pacer is not None:
+        print("")
+
+def _wallet_worker(wallet_index: int, wallet: keystore.Wallet, snapshot: dict = None) -> dict:
+    _ctx.prefix = f"[W{wallet_index}] "
+    try:
+        r = process_wallet(wallet_index, wallet, snapshot)
+        emit("wallet", **r)
+        return r
+    finally:
+        _ctx.prefix = ""
+
+def _run_concurrent(wallets, concurrency: int, snapshots: dict):
+    """
+    Jalankan banyak wallet sekaligus (maks `concurrency` worker).
+    Tiap wallet tetap diproses oleh satu worker → urutan tx per wallet terjaga.
+    """
+    total = len(wallets)
+    done = 0
+    snapshots = snapshots or {}
+
+    def run(item):
+        i, w = item
+        try:
+            return i, _wallet_worker(i, w, snapshots.get(w.address)), None
+        except Exception as e:
+            return i, None, e
+
+    # stream_map: jumlah task aktif dibatasi `concurrency` (memori datar untuk wallet set besar)
+    for i, r, err in results.stream_map(run, enumerate(wallets, 1), concurrency):
+        done += 1
+        if err is None:
+            log(f"📦 [{done}/{total}] Wallet {i} selesai: {r['minted']} minted, {r['failed']} gagal ({r['status']})")
+        else:
+            log(f"📦 [{done}/{total}] Wallet {i} error: {str(err)[:100]}")
+    print("")
+
+def main(delay_between_wallets_sec: int = 5, concurrency: int = 1, incremental: bool = False, force_full: bool = False,
+         metrics_out: str = None, results_out: str = None, fee_mode: str = gas.LEGACY, speed: str = "normal"):
+    """
+    incremental=True → lewati wallet yang menurut state.db sudah punya semua NFT.
+    force_full=True  → abaikan state.db, verifikasi ulang semua wallet ke chain.
+    metrics_out      → file export metrik di akhir run (.json atau .prom).
+    results_out      → file JSONL; satu record per wallet / tx ditulis begitu selesai.
+    fee_mode / speed → "legacy" | "eip1559" | "auto" dan target inklusi "slow" | "normal" | "fast".
+    """
+    global _results
+    fee_config.update(mode=fee_mode, speed=speed)
+    reset_stats()  # daemon memanggil main() berulang kali dalam satu proses
+    print(f"🔗 Chain ID: {rpc.get_chain_id()}")
+    if fee_mode != gas.LEGACY:
+        print(f"⛽ Fee mode: {fee_mode} (target {speed})")
+    print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    print("🚀 Starting NFT minting process...\n")
+
+    wallets = load_wallets()
+    if not wallets:
+        return
+
+    if not resume_journal():
+        return
+    if incremental and not force_full:
+        store = state.get_store()
+        contracts = [c["address"] for c in nft_contracts]
+        todo = [w for w in wallets if not store.is_complete(w.address, contracts)]
+        print(f"♻️  Mode incremental: {len(wallets) - len(todo)} wallet sudah lengkap dilewati, {len(todo)} dicek\n")
+        wallets = todo
+        if not wallets:
+            print("🎉 Semua wallet sudah lengkap (pakai force_full untuk verifikasi ulang).")
+            return
+
+    _mint_policy.budget = retry.RetryBudget()
+    if results_out:
+        _results = results.ResultWriter(results_out)
+    try:
+        snapshots = prescan(wallets)
+        run_preflight(wallets, snapshots)
+        if concurrency > 1:
+            print(f"⚡ Mode paralel: {concurrency} wallet sekaligus\n")
+            _run_concurrent(wallets, concurrency, snapshots)
+        else:
+            _run_sequential(wallets, delay_between_wallets_sec, snapshots)
+        print("🎉 All wallets processed!")
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Dihentikan oleh user!")
+    except Exception as e:
+        print(f"\n\n❌ Unexpected error: {str(e)}")
+    finally:
+        print_final_stats()
+        if metrics_out:
+            metrics.export(metrics_out)
+            print(f"📈 Metrics disimpan ke {metrics_out}")
+        if _results is not None:
+            _results.close()
+            print(f"🧾 Hasil per wallet/tx: {results_out}")
+            _results = None
+
+if __name__ == "__main__":
+    main()
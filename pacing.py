@@ -0,0 +1,72 @@
+# pacing.py — Pacing adaptif AIMD (pengganti sleep konstan)
+#
+# Additive Increase / Multiplicative Decrease:
+# - tiap respons sukses & cepat → rate naik sedikit (+increase req/detik)
+# - 429 / timeout / error jaringan / "underpriced" → rate dikali `decrease`
+# Rate dipakai sebagai token bucket (ratelimit.TokenBucket), jadi banyak thread
+# bisa berbagi satu pacer. Rate selalu dijaga di [min_rate, max_rate].
+
+import threading
+from typing import Optional
+
+import metrics
+import retry
+from ratelimit import TokenBucket
+
+# kelas error yang berarti "kamu terlalu cepat / jaringan sedang berat"
+BACKOFF_KINDS = {retry.RATE_LIMIT, retry.TRANSIENT, retry.UNDERPRICED}
+
+
+class Pacer:
+    def __init__(self, name: str, rate: float, min_rate: float, max_rate: float,
+                 increase: Optional[float] = None, decrease: float = 0.5, slow_sec: float = 2.0):
+        self.name = name
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase if increase is not None else max(0.05, rate * 0.1)
+        self.decrease = decrease
+        self.slow_sec = slow_sec
+        self._lock = threading.Lock()
+        self._rate = min(max_rate, max(min_rate, rate))
+        # burst 1 → jarak antar request rata (tidak menumpuk di awal)
+        self._bucket = TokenBucket(self._rate, burst=1)
+
+    @property
+    def rate(self) -> float:
+        with self._lock:
+            return self._rate
+
+    def _set(self, rate: float):
+        rate = min(self.max_rate, max(self.min_rate, rate))
+        self._rate = rate
+        self._bucket.set_rate(rate, burst=1)
+
+    def set_limits(self, min_rate: Optional[float] = None, max_rate: Optional[float] = None):
+        with self._lock:
+            if min_rate is not None:
+                self.min_rate = min_rate
+            if max_rate is not None:
+                self.max_rate = max_rate
+            self._set(self._rate)
+
+    def reset(self, rate: float):
+        """Mulai ulang dari `rate` (mis. awal run baru)."""
+        with self._lock:
+            self._set(rate)
+
+    def wait(self):
+        """Blok sampai giliran berikutnya sesuai rate saat ini."""
+        self._bucket.acquire()
+
+    def success(self, latency: Optional[float] = None):
+        with self._lock:
+            if latency is not None and latency > self.slow_sec:
+                return  # sukses tapi lambat → tahan, jangan naik
+            self._set(self._rate + self.increase)
+
+    def failure(self, kind: str):
+        if kind not in BACKOFF_KINDS:
+            return  # revert / 4xx dll bukan sinyal beban
+        with self._lock:
+            self._set(self._rate * self.decrease)
+        metrics.inc("pacer_backoff_total", pacer=self.name, error=kind)
@@ -0,0 +1,109 @@
+# preflight.py — Simulasi claim (eth_call) sebelum gas dikeluarkan
+#
+# Semua claim yang akan dikirim (wallet × kontrak) disimulasikan dulu lewat
+# eth_call dalam JSON-RPC batch. Claim yang revert (sudah pernah claim, harga
+# salah, condition ditutup, ...) dibuang sebelum di-sign/broadcast, dan alasan
+# revert-nya di-decode supaya bisa dicatat.
+#
+# Simulasi yang gagal karena RPC (timeout, endpoint down) TIDAK memblok claim:
+# hasilnya "unknown" dan claim tetap dikirim seperti biasa.
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import retry
+from rpc import DEFAULT_CHUNK, as_client
+
+ERROR_STRING_SELECTOR = "0x08c379a0"  # Error(string)
+PANIC_SELECTOR = "0x4e487b71"         # Panic(uint256)
+
+OK = "ok"
+UNKNOWN = "unknown"  # simulasi tidak bisa dijalankan (masalah RPC)
+
+
+def _revert_hex(data) -> Optional[str]:
+    """Ambil hex data revert dari field `error.data` (format beda-beda per node)."""
+    if isinstance(data, dict):
+        data = data.get("data") or data.get("result")
+    if isinstance(data, str) and data.startswith("0x"):
+        return data
+    return None
+
+
+def decode_revert(data: Optional[str]) -> Optional[str]:
+    """Decode data revert → teks alasan (Error(string), Panic(uint256), atau selector custom error)."""
+    if not data or data == "0x":
+        return None
+    body = data[10:]
+    try:
+        if data[:10] == ERROR_STRING_SELECTOR:
+            offset = int(body[:64], 16) * 2
+            length = int(body[offset:offset + 64], 16)
+            raw = bytes.fromhex(body[offset + 64:offset + 64 + length * 2])
+            return raw.decode("utf-8", errors="replace")
+        if data[:10] == PANIC_SELECTOR:
+            return f"Panic(0x{int(body[:64], 16):02x})"
+    except ValueError:
+        pass
+    return f"custom error {data[:10]}"
+
+
+def revert_reason(error) -> Optional[str]:
+    """Alasan revert dari RPCError / exception web3; None kalau error-nya bukan revert."""
+    # RPCError & ContractLogicError (web3) sama-sama menyimpan payload di `.data`
+    reason = decode_revert(_revert_hex(getattr(error, "data", None)))
+    if reason:
+        return reason
+    msg = str(error)
+    if retry.classify(msg) != retry.REVERT:
+        return None
+    # "execution reverted: <alasan>" → ambil teks setelah ':'
+    low = msg.lower()
+    i = low.find("execution reverted")
+    if i >= 0:
+        rest = msg[i + len("execution reverted"):].lstrip(": ").split("'")[0].split('"')[0].strip()
+        return rest or "execution reverted"
+    return "execution reverted"
+
+
+def _call_obj(params: dict) -> dict:
+    """call_params (int) → object JSON-RPC (hex)."""
+    obj = {k: v for k, v in params.items() if v is not None}
+    if isinstance(obj.get("value"), int):
+        obj["value"] = hex(obj["value"])
+    return obj
+
+
+def simulate(rpc, calls: Iterable[dict], chunk_size: int = DEFAULT_CHUNK) -> List[Tuple[str, Optional[str]]]:
+    """
+    eth_call massal. `calls` = list dict call (from/to/data/value).
+    Return list (kelas, alasan) sejajar dengan input; kelas = "ok", "unknown",
+    atau kelas retry (revert / insufficient_funds / ...).
+    """
+    calls = [_call_obj(c) for c in calls]
+    res = as_client(rpc).batch([("eth_call", [c, "latest"]) for c in calls], chunk_size)
+    out = []
+    for r in res:
+        if not isinstance(r, Exception):
+            out.append((OK, None))
+            continue
+        reason = revert_reason(r)
+        if reason is not None:
+            out.append((retry.REVERT, reason))
+            continue
+        kind = retry.classify(r)
+        if kind == retry.INSUFFICIENT_FUNDS:
+            out.append((kind, str(r)[:120]))
+        else:
+            out.append((UNKNOWN, str(r)[:120]))
+    return out
+
+
+def simulate_claims(builder, jobs: Iterable[Tuple[str, str]], rpc=None,
+                    chunk_size: int = DEFAULT_CHUNK) -> Dict[Tuple[str, str], Tuple[str, Optional[str]]]:
+    """
+    jobs: [(wallet_address, contract_address), ...] → {(wallet, contract_lower): (kelas, alasan)}.
+    `builder` = txbuilder.ClaimBuilder (calldata & value claim).
+    """
+    jobs = [(w, c.lower()) for w, c in jobs]
+    results = simulate(rpc, [builder.call_params(c, w) for w, c in jobs], chunk_size)
+    return dict(zip(jobs, results))
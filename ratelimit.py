@@ -0,0 +1,41 @@
+# ratelimit.py — Token bucket sederhana (thread-safe)
+#
+# rate  = token per detik (rata-rata request/detik yang diizinkan)
+# burst = kapasitas bucket (berapa request boleh langsung lewat sekaligus),
+#         minimal 1: bucket < 1 token tidak akan pernah bisa melayani acquire()
+
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst if burst is not None else rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float, burst: float = None):
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+            if burst is not None:
+                self.capacity = max(1.0, float(burst))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Blok sampai `tokens` tersedia."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate if self.rate > 0 else 0.1
+            time.sleep(wait)
@@ -0,0 +1,97 @@
+# rebalance.py — Planner rebalancing saldo (tanpa I/O, dipakai send.rebalance)
+#
+# Dari saldo semua wallet dihitung transfer minimal supaya setiap wallet punya
+# minimal `target` (mis. 0.1 yang disyaratkan mintnft.process_wallet):
+#   - wallet yang sudah >= target tidak menerima apa pun,
+#   - tiap wallet yang kurang menerima TEPAT SATU transfer,
+#   - donor = wallet dengan surplus (saldo - target); penerima dibagi ke donor
+#     supaya pohon tiap donor sama kecil (donor jalan paralel, nonce terpisah).
+# Di dalam satu donor transfer disusun sebagai pohon binomial: tiap round
+# semua pemegang dana mengoper separuh grupnya ke satu penerima, yang ikut
+# jadi pengirim di round berikutnya. Jadi N wallet selesai dalam
+# ceil(log2(N + 1)) round, bukan N tx berurutan dari satu antrian nonce.
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class Transfer:
+    sender: str
+    to: str
+    amount: int  # wei: kekurangan `to` + dana yang akan dia teruskan (termasuk gas)
+    round: int
+    parent: Optional[str] = None  # transfer yang mendanai `sender` (None = donor asli)
+
+
+@dataclass
+class Plan:
+    rounds: List[List[Transfer]]
+    unfunded: List[str]  # kekurangannya tidak tertutup surplus donor mana pun
+
+    @property
+    def transfers(self) -> List[Transfer]:
+        return [t for r in self.rounds for t in r]
+
+    def total(self) -> int:
+        """Total yang keluar dari donor asli (tanpa gas donor)."""
+        return sum(t.amount for t in self.transfers if t.parent is None)
+
+
+def _assign(deficits: List[Tuple[str, int]], surplus: Dict[str, int],
+            gas_cost: int) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Bagi penerima ke donor: grup terkecil dulu, selama surplus donor cukup (kekurangan + gas)."""
+    groups: Dict[str, List[str]] = {d: [] for d in surplus}
+    left = dict(surplus)
+    unfunded = []
+    for addr, need in deficits:  # kekurangan terbesar dulu
+        cost = need + gas_cost
+        donors = [d for d in left if left[d] >= cost]
+        if not donors:
+            unfunded.append(addr)
+            continue
+        d = min(donors, key=lambda d: (len(groups[d]), -left[d]))
+        groups[d].append(addr)
+        left[d] -= cost
+    return groups, unfunded
+
+
+def _tree(root: str, group: List[str], need: Dict[str, int], gas_cost: int) -> List[Transfer]:
+    """Pohon binomial: pemegang dana mengoper separuh belakang grupnya tiap round."""
+    out: List[Transfer] = []
+    holders = [(root, list(group), None)]  # (pengirim, grup yang masih harus didanai, parent)
+    rnd = 0
+    while holders:
+        nxt = []
+        for sender, grp, parent in holders:
+            if not grp:
+                continue
+            mid = len(grp) // 2
+            head, rest = grp[mid], grp[mid + 1:]
+            # head menanggung subtree `rest`: kekurangan semuanya + gas tiap tx di dalamnya
+            amount = need[head] + sum(need[a] for a in rest) + gas_cost * len(rest)
+            out.append(Transfer(sender, head, amount, rnd, parent))
+            nxt.append((sender, grp[:mid], parent))
+            nxt.append((head, rest, head))
+        holders = [h for h in nxt if h[1]]
+        rnd += 1
+    return out
+
+
+def plan(balances: Dict[str, Optional[int]], target: int, gas_cost: int, min_transfer: int = 0) -> Plan:
+    """
+    balances: {address: saldo wei} (None = gagal dibaca, dilewati).
+    gas_cost: biaya maksimal satu transfer (21000 × maxFee / gasPrice).
+    min_transfer: kekurangan di bawah ini dianggap sudah cukup (hemat gas untuk debu).
+    """
+    known = {a: b for a, b in balances.items() if b is not None}
+    deficits = sorted(((a, target - b) for a, b in known.items() if target - b > max(min_transfer, 0)),
+                      key=lambda x: -x[1])
+    surplus = {a: b - target for a, b in known.items() if b - target > gas_cost}
+    groups, unfunded = _assign(deficits, surplus, gas_cost)
+    need = dict(deficits)
+    by_round: Dict[int, List[Transfer]] = {}
+    for donor, grp in groups.items():
+        for t in _tree(donor, grp, need, gas_cost):
+            by_round.setdefault(t.round, []).append(t)
+    return Plan([by_round[r] for r in sorted(by_round)], unfunded)
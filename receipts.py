@@ -0,0 +1,121 @@
+# receipts.py — Receipt tracker bersama (poll sekali per block baru)
+#
+# Alih-alih wait_for_transaction_receipt per tx, semua hash pending dikumpulkan
+# di satu tracker. Thread background cek block number; tiap ada block baru,
+# semua receipt pending diambil sekaligus (JSON-RPC batch) dan Future tiap tx
+# di-resolve. Submit & konfirmasi jadi terpisah.
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+from web3.datastructures import AttributeDict
+
+from rpc import as_client
+
+
+class ReceiptTimeout(Exception):
+    pass
+
+
+def to_hex(tx_hash) -> str:
+    """Hash / raw tx (bytes, HexBytes atau str) → string "0x..."."""
+    h = tx_hash.hex() if hasattr(tx_hash, "hex") else str(tx_hash)
+    return h if h.startswith("0x") else "0x" + h
+
+
+def _parse_receipt(raw: dict) -> AttributeDict:
+    # bentuk mirip hasil web3 (receipt.status, receipt.gasUsed, ...)
+    d = dict(raw)
+    for k in ("status", "gasUsed", "blockNumber", "effectiveGasPrice", "cumulativeGasUsed", "type"):
+        v = d.get(k)
+        if isinstance(v, str) and v.startswith("0x"):
+            d[k] = int(v, 16)
+    return AttributeDict(d)
+
+
+class ReceiptTracker:
+    def __init__(self, rpc=None, poll_interval: float = 1.0, timeout: float = 180):
+        # rpc: RPCClient / URL / None (client bersama dari rpc.py)
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}  # hash → (future, deadline)
+        self._last_block: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    # ──( API )─────────────────────────────────────────────────────────────────
+    def watch(self, tx_hash, callback: Callable[[Future], None] = None, timeout: float = None) -> Future:
+        """Daftarkan hash; return Future yang berisi receipt (atau exception timeout)."""
+        h = to_hex(tx_hash)
+        deadline = time.time() + (timeout or self.timeout)
+        with self._lock:
+            if h in self._pending:
+                fut = self._pending[h][0]
+            else:
+                fut = Future()
+                self._pending[h] = (fut, deadline)
+        if callback:
+            fut.add_done_callback(callback)
+        self._ensure_running()
+        self._wake.set()
+        return fut
+
+    def wait(self, tx_hash, timeout: float = None):
+        """Versi blocking (pengganti wait_for_transaction_receipt)."""
+        return self.watch(tx_hash, timeout=timeout).result()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    # ──( Loop background )─────────────────────────────────────────────────────
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+            try:
+                block = int(as_client(self.rpc).call("eth_blockNumber", []), 16)
+            except Exception:
+                block = None
+            if block is None or block != self._last_block or self._wake.is_set():
+                self._wake.clear()
+                self._last_block = block
+                self._sweep()
+            self._expire()
+            self._wake.wait(self.poll_interval)
+
+    def _sweep(self):
+        with self._lock:
+            hashes = list(self._pending)
+        if not hashes:
+            return
+        res = as_client(self.rpc).batch([("eth_getTransactionReceipt", [h]) for h in hashes])
+        for h, r in zip(hashes, res):
+            if isinstance(r, dict):
+                with self._lock:
+                    entry = self._pending.pop(h, None)
+                if entry:
+                    entry[0].set_result(_parse_receipt(r))
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            expired = [(h, e) for h, e in self._pending.items() if e[1] < now]
+            for h, _ in expired:
+                self._pending.pop(h, None)
+        for h, (fut, _) in expired:
+            fut.set_exception(ReceiptTimeout(f"Receipt {h} belum ada setelah timeout"))
@@ -0,0 +1,171 @@
+# replacer.py — Deteksi tx macet + replacement (nonce sama, fee dinaikkan)
+#
+# Tx yang belum masuk block setelah `stuck_after` detik dikirim ulang dengan
+# NONCE YANG SAMA dan fee naik (min +12.5%, node umumnya minta >= +10%), tidak
+# lebih rendah dari fee pasar saat itu. Semua hash untuk satu nonce disimpan
+# sebagai satu rantai (TxChain); receipt dari hash mana pun menyelesaikan
+# rantai itu. Jadi antrian nonce wallet tidak pernah tertahan bermenit-menit
+# dan retry tidak menumpuk tx kedua di nonce baru.
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, List, Optional
+
+import metrics
+import signer
+from receipts import ReceiptTimeout, ReceiptTracker, to_hex
+from rpc import as_client
+
+
+# Batas tunggu satu rantai di sisi pemanggil: semua bump + timeout receipt
+# versi terakhir, dengan cadangan. Lewat dari ini → dianggap macet (ReceiptTimeout).
+WAIT_TIMEOUT = 900
+
+
+class TxChain:
+    """Semua versi tx untuk satu (sender, nonce)."""
+
+    def __init__(self, key: str, tx: dict, tx_hash: str, meta: dict = None):
+        self.key = key
+        self.meta = meta or {}  # info bebas dari pemanggil (mis. wallet, purpose)
+        self.tx = dict(tx)
+        self.nonce = tx["nonce"]
+        self.hashes: List[str] = [to_hex(tx_hash)]
+        self.last_sent = time.time()
+        self.bumps = 0
+        self.mined_hash: Optional[str] = None
+        self.settling = False  # node bilang nonce sudah terpakai → tinggal tunggu receipt
+        self.future: Future = Future()
+        self._failed = 0
+
+    @property
+    def hash(self) -> str:
+        return self.mined_hash or self.hashes[-1]
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+def _bump(tx: dict, factor: float, fresh: dict) -> dict:
+    """Fee tx dinaikkan `factor`, minimal setara fee pasar `fresh`."""
+    out = dict(tx)
+    if "maxFeePerGas" in tx:
+        tip = max(int(tx["maxPriorityFeePerGas"] * factor) + 1, fresh.get("maxPriorityFeePerGas", 0))
+        cap = max(int(tx["maxFeePerGas"] * factor) + 1, fresh.get("maxFeePerGas", 0), tip)
+        out.update(maxFeePerGas=cap, maxPriorityFeePerGas=tip)
+    else:
+        out["gasPrice"] = max(int(tx["gasPrice"] * factor) + 1, fresh.get("gasPrice", 0))
+    return out
+
+
+class Replacer:
+    def __init__(self, tracker: ReceiptTracker, fee_fn: Callable[[], dict] = None, rpc=None,
+                 stuck_after: float = 30.0, bump: float = 1.125, max_bumps: int = 4,
+                 check_interval: float = 2.0, on_replace: Callable[[TxChain, str, bytes], None] = None):
+        self.tracker = tracker
+        self.fee_fn = fee_fn  # fee pasar terkini (gas.GasOracle.fees), opsional
+        self.rpc = rpc
+        self.stuck_after = stuck_after
+        self.bump = bump
+        self.max_bumps = max_bumps
+        self.check_interval = check_interval
+        self.on_replace = on_replace  # dipanggil SEBELUM versi baru di-broadcast (write-ahead)
+        self._lock = threading.Lock()
+        self._chains: List[TxChain] = []
+        self._thread: Optional[threading.Thread] = None
+
+    # ──( API )─────────────────────────────────────────────────────────────────
+    def track(self, key: str, tx: dict, tx_hash, meta: dict = None) -> TxChain:
+        """Awasi tx yang baru di-broadcast; chain.future → receipt dari versi yang masuk block."""
+        chain = TxChain(key, tx, tx_hash, meta)
+        self._watch(chain, chain.hashes[0])
+        with self._lock:
+            self._chains.append(chain)
+        self._ensure_running()
+        return chain
+
+    def wait(self, chain: TxChain, timeout: float = WAIT_TIMEOUT):
+        """Receipt dari versi mana pun; ReceiptTimeout kalau rantai tidak selesai dalam `timeout`."""
+        try:
+            return chain.future.result(timeout)
+        except FutureTimeout:
+            raise ReceiptTimeout(f"nonce {chain.nonce}: tidak ada receipt setelah {timeout:.0f} detik")
+
+    # ──( Receipt per hash )────────────────────────────────────────────────────
+    def _watch(self, chain: TxChain, h: str):
+        def on_done(fut: Future, h=h):
+            if chain.done():
+                return
+            if fut.exception() is None:
+                chain.mined_hash = h
+                if len(chain.hashes) > 1:
+                    metrics.inc("tx_replaced_mined_total", version=str(chain.hashes.index(h)))
+                chain.future.set_result(fut.result())
+                return
+            with self._lock:
+                chain._failed += 1
+            self._check_exhausted(chain)
+
+        self.tracker.watch(h, callback=on_done)
+
+    def _check_exhausted(self, chain: TxChain):
+        """Semua versi gagal & tidak akan ada bump lagi → rantai selesai dengan ReceiptTimeout."""
+        with self._lock:
+            exhausted = (not chain.done() and chain._failed >= len(chain.hashes)
+                         and (chain.bumps >= self.max_bumps or chain.settling))
+        if exhausted:
+            try:
+                chain.future.set_exception(ReceiptTimeout(
+                    f"nonce {chain.nonce}: {len(chain.hashes)} versi tx tidak ada yang masuk block"))
+            except Exception:
+                pass  # sudah di-resolve thread lain
+
+    # ──( Loop background )─────────────────────────────────────────────────────
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tx-replacer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._chains = [c for c in self._chains if not c.done()]
+                if not self._chains:
+                    self._thread = None
+                    return
+                now = time.time()
+                stuck = [c for c in self._chains
+                         if not c.settling and c.bumps < self.max_bumps and now - c.last_sent >= self.stuck_after]
+            for chain in stuck:
+                self._replace(chain)
+            time.sleep(self.check_interval)
+
+    def _replace(self, chain: TxChain):
+        try:
+            fresh = self.fee_fn() if self.fee_fn else {}
+        except Exception:
+            fresh = {}
+        tx = _bump(chain.tx, self.bump, fresh)
+        chain.bumps += 1
+        chain.last_sent = time.time()
+        chain.tx = tx  # ditolak pun, percobaan berikutnya naik dari sini
+        try:
+            raw, h = signer.get_signer().sign_many(chain.key, [tx])[0]
+            if self.on_replace:
+                self.on_replace(chain, h, raw)
+            h = as_client(self.rpc).call("eth_sendRawTransaction", ["0x" + raw.hex()])
+        except Exception as e:
+            msg = str(e).lower()
+            if "nonce too low" in msg:
+                chain.settling = True  # salah satu versi sudah masuk block → tinggal tunggu receipt
+            metrics.inc("tx_replace_errors_total")
+            # tidak ada hash baru yang diawasi → on_done tidak akan jalan lagi untuk bump ini
+            self._check_exhausted(chain)
+            return
+        h = to_hex(h)
+        with self._lock:
+            chain.hashes.append(h)
+        metrics.inc("tx_replaced_total")
+        self._watch(chain, h)
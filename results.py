@@ -0,0 +1,60 @@
+# results.py — Output hasil streaming (JSON Lines)
+#
+# Satu record JSON per baris ditulis begitu satu wallet / tx selesai, lalu
+# di-flush → memori tetap datar untuk 100k wallet dan progress bisa di-tail
+# (`tail -f results.jsonl | jq .`).
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator
+
+
+class ResultWriter:
+    def __init__(self, path: str, mode: str = "a"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._f = open(path, mode, encoding="utf-8", buffering=1)
+        self.count = 0
+
+    def write(self, kind: str, **record):
+        rec = {"ts": round(time.time(), 3), "kind": kind, **record}
+        line = json.dumps(rec, default=str, ensure_ascii=False)
+        with self._lock:
+            self._f.write(line + "\n")
+            self._f.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_map(fn: Callable, items: Iterable, concurrency: int) -> Iterator:
+    """
+    Seperti pool.map tapi hasil di-yield sesuai urutan selesai dan jumlah task
+    yang sedang berjalan dibatasi `concurrency` → tidak ada list Future sebesar N.
+    """
+    it = iter(items)
+    end = object()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        pending = set()
+        for item in it:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                nxt = next(it, end)
+                if nxt is not end:
+                    pending.add(pool.submit(fn, nxt))
+                yield fut.result()
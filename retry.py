@@ -0,0 +1,170 @@
+# retry.py — Kebijakan retry bersama (klasifikasi error + backoff + budget + breaker)
+#
+# - classify(): kelompokkan error jadi kelas (transient, rate_limit, nonce,
+#   underpriced, revert, insufficient_funds, client_error, unknown)
+# - hanya kelas yang memang bisa sembuh yang di-retry
+# - backoff eksponensial dengan full jitter
+# - RetryBudget: batas total retry per run (supaya endpoint yang sakit tidak
+#   dibanjiri retry dari ratusan wallet sekaligus); tiap run membuat budget
+#   sendiri, jadi job yang jalan bersamaan (daemon) tidak saling mengisi ulang
+# - CircuitBreaker: per endpoint; setelah N gagal beruntun → open selama
+#   `cooldown` detik, lalu half-open (satu percobaan) sebelum close lagi
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+TRANSIENT = "transient"
+RATE_LIMIT = "rate_limit"
+NONCE = "nonce"
+UNDERPRICED = "underpriced"
+REVERT = "revert"
+INSUFFICIENT_FUNDS = "insufficient_funds"
+CLIENT_ERROR = "client_error"
+UNKNOWN = "unknown"
+
+RETRYABLE = {TRANSIENT, RATE_LIMIT, NONCE, UNDERPRICED, UNKNOWN}
+
+_TRANSIENT_HINTS = ("timeout", "timed out", "connection", "temporarily", "unavailable", "reset by peer",
+                    "bad gateway", "502", "503", "504", "all rpc endpoint", "semua rpc endpoint")
+
+
+def classify(error=None, status: Optional[int] = None) -> str:
+    """Kelas error dari exception / pesan dan/atau HTTP status."""
+    if status is not None:
+        if status == 429:
+            return RATE_LIMIT
+        if status >= 500:
+            return TRANSIENT
+        if 400 <= status < 500:
+            return CLIENT_ERROR
+    if error is None:
+        return UNKNOWN
+    msg = str(error).lower()
+    name = type(error).__name__.lower() if not isinstance(error, str) else ""
+    if "insufficient funds" in msg:
+        return INSUFFICIENT_FUNDS
+    if "nonce too low" in msg or "nonce too high" in msg or "invalid nonce" in msg:
+        return NONCE
+    if "underpriced" in msg or "fee too low" in msg or "max fee per gas less than" in msg:
+        return UNDERPRICED
+    if "revert" in msg or "execution reverted" in msg or "contractlogicerror" in name:
+        return REVERT
+    if "429" in msg or "rate limit" in msg or "too many requests" in msg:
+        return RATE_LIMIT
+    if "timeout" in name or "connection" in name or any(h in msg for h in _TRANSIENT_HINTS):
+        return TRANSIENT
+    return UNKNOWN
+
+
+def is_retryable(kind: str) -> bool:
+    return kind in RETRYABLE
+
+
+DEFAULT_BUDGET = 200
+
+
+class RetryBudget:
+    """Jumlah retry maksimum untuk satu run (thread-safe)."""
+
+    def __init__(self, total: int = DEFAULT_BUDGET):
+        self.total = total
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.used >= self.total:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self.total - self.used)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._fails: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._probing: Dict[str, bool] = {}
+
+    def allow(self, key: str) -> bool:
+        """False kalau breaker untuk `key` sedang open."""
+        now = time.time()
+        with self._lock:
+            until = self._open_until.get(key)
+            if until is None:
+                return True
+            if now < until:
+                return False
+            # half-open: izinkan satu percobaan
+            if self._probing.get(key):
+                return False
+            self._probing[key] = True
+            return True
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            until = self._open_until.get(key)
+            return until is not None and time.time() < until
+
+    def wait(self, key: str, max_wait: float) -> bool:
+        """Tunggu sampai breaker `key` mengizinkan request (maks `max_wait` detik)."""
+        deadline = time.time() + max_wait
+        while not self.allow(key):
+            if time.time() >= deadline:
+                return False
+            time.sleep(min(0.5, max(0.05, deadline - time.time())))
+        return True
+
+    def open_until(self, key: str) -> float:
+        with self._lock:
+            return self._open_until.get(key, 0.0)
+
+    def record_success(self, key: str):
+        with self._lock:
+            self._fails.pop(key, None)
+            self._open_until.pop(key, None)
+            self._probing.pop(key, None)
+
+    def record_failure(self, key: str):
+        with self._lock:
+            n = self._fails.get(key, 0) + 1
+            self._fails[key] = n
+            if n >= self.threshold or self._probing.get(key):
+                self._open_until[key] = time.time() + self.cooldown
+                self._probing[key] = False
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base: float = 0.5, cap: float = 20.0,
+                 budget: Optional[RetryBudget] = None):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.budget = budget
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: acak di [0, min(cap, base * 2^attempt)]."""
+        return random.uniform(0, min(self.cap, self.base * (2 ** attempt)))
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        """attempt = jumlah percobaan yang sudah gagal (mulai 1)."""
+        if attempt >= self.max_attempts or not is_retryable(kind):
+            return False
+        return self.budget.try_spend() if self.budget is not None else True
+
+    def sleep(self, attempt: int):
+        time.sleep(self.backoff(attempt))
+
+
+# ──( Instance bersama per proses )──────────────────────────────────────────────
+# Breaker dibagi semua job (status endpoint memang global); budget retry tidak.
+BREAKER = CircuitBreaker(threshold=3, cooldown=30.0)
@@ -0,0 +1,289 @@
+# rpc.py — Client JSON-RPC multi-endpoint (pilih yang tercepat + failover)
+#
+# - Daftar endpoint dari rpc.txt (satu URL per baris), env PHAROS_RPC_URLS
+#   (dipisah koma), atau DEFAULT_RPC_URL.
+# - Tiap endpoint dicatat latency (EWMA) & error rate-nya. Call dikirim ke
+#   endpoint sehat dengan skor terbaik; kalau gagal di level transport
+#   (timeout, 5xx, 429, respons bukan JSON) → call otomatis pindah ke endpoint
+#   berikutnya, dan circuit breaker endpoint itu (retry.BREAKER) mencatatnya.
+# - Semua modul berbagi satu requests.Session (koneksi keep-alive di-pool).
+# - MultiEndpointProvider membungkus client ini jadi provider web3.
+
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+import metrics
+import retry
+
+DEFAULT_RPC_URL = "https://testnet.dplabs-internal.com"  # Pharos Testnet
+RPC_FILE = "rpc.txt"
+DEFAULT_CHUNK = 200
+
+
+class RPCError(Exception):
+    """Error JSON-RPC dari node (bukan masalah koneksi). `data` = payload revert kalau ada."""
+
+    def __init__(self, message: str, code: Optional[int] = None, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    @classmethod
+    def from_response(cls, error) -> "RPCError":
+        if isinstance(error, dict):
+            return cls(str(error), code=error.get("code"), data=error.get("data"))
+        return cls(str(error))
+
+
+class AllEndpointsFailed(Exception):
+    pass
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None  # EWMA detik
+        self.calls = 0
+        self.errors = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+    def score(self) -> float:
+        # endpoint baru (belum ada data) dicoba dulu
+        lat = self.latency if self.latency is not None else 0.0
+        return lat * (1.0 + 4.0 * self.error_rate)
+
+    def healthy(self) -> bool:
+        # breaker per endpoint (retry.BREAKER): open setelah beberapa gagal beruntun
+        return not retry.BREAKER.is_open(self.url)
+
+
+class RPCClient:
+    def __init__(self, urls: List[str], timeout: float = 30,
+                 pool_size: int = 64, alpha: float = 0.3):
+        if not urls:
+            raise ValueError("minimal satu RPC endpoint")
+        self.endpoints = [Endpoint(u) for u in urls]
+        self.timeout = timeout
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(urls), pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"content-type": "application/json"})
+
+    @property
+    def primary_url(self) -> str:
+        return self._ranked()[0].url
+
+    # ──( Seleksi endpoint )────────────────────────────────────────────────────
+    def _ranked(self) -> List[Endpoint]:
+        with self._lock:
+            healthy = sorted((e for e in self.endpoints if e.healthy()), key=Endpoint.score)
+            down = sorted((e for e in self.endpoints if not e.healthy()),
+                          key=lambda e: retry.BREAKER.open_until(e.url))
+        # endpoint yang breaker-nya open tetap dicoba paling akhir (lebih baik daripada gagal total)
+        return healthy + down
+
+    def _ok(self, ep: Endpoint, elapsed: float):
+        with self._lock:
+            ep.calls += 1
+            ep.latency = elapsed if ep.latency is None else (1 - self.alpha) * ep.latency + self.alpha * elapsed
+        retry.BREAKER.record_success(ep.url)
+
+    def _fail(self, ep: Endpoint):
+        with self._lock:
+            ep.calls += 1
+            ep.errors += 1
+        retry.BREAKER.record_failure(ep.url)
+
+    # ──( Transport )───────────────────────────────────────────────────────────
+    def request(self, payload):
+        """POST payload (dict atau list batch) ke endpoint terbaik; failover kalau gagal."""
+        last_err = None
+        for item in (payload if isinstance(payload, list) else [payload]):
+            metrics.inc("rpc_calls_total", method=item.get("method"))
+        for ep in self._ranked():
+            t0 = time.time()
+            try:
+                r = self.session.post(ep.url, json=payload, timeout=self.timeout)
+                if r.status_code == 429 or r.status_code >= 500:
+                    raise requests.HTTPError(f"HTTP {r.status_code}")
+                data = r.json()
+            except Exception as e:
+                self._fail(ep)
+                metrics.inc("rpc_requests_total", endpoint=ep.url, outcome="error")
+                last_err = e
+                continue
+            elapsed = time.time() - t0
+            self._ok(ep, elapsed)
+            metrics.inc("rpc_requests_total", endpoint=ep.url, outcome="ok")
+            metrics.observe("rpc_seconds", elapsed, endpoint=ep.url)
+            return data
+        raise AllEndpointsFailed(f"Semua RPC endpoint gagal: {last_err}")
+
+    def call(self, method: str, params: list):
+        data = self.request({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params})
+        if "error" in data:
+            raise RPCError.from_response(data["error"])
+        return data.get("result")
+
+    def batch(self, calls: List[tuple], chunk_size: int = DEFAULT_CHUNK) -> list:
+        """
+        Kirim banyak (method, params) sebagai JSON-RPC batch.
+        Return list hasil sejajar dengan `calls`; item yang error berisi RPCError.
+        """
+        results: list = [None] * len(calls)
+        for start in range(0, len(calls), chunk_size):
+            chunk = calls[start:start + chunk_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": start + i, "method": m, "params": p}
+                for i, (m, p) in enumerate(chunk)
+            ]
+            try:
+                data = self.request(payload)
+            except AllEndpointsFailed as e:
+                # transport gagal di semua endpoint → jangan ulangi per item (N × endpoint × timeout)
+                err = RPCError(str(e))
+                for i in range(len(chunk)):
+                    results[start + i] = err
+                continue
+            if not isinstance(data, list):
+                # server tidak mendukung batch (body bukan array) → fallback satu per satu
+                for i, (m, p) in enumerate(chunk):
+                    try:
+                        results[start + i] = self.call(m, p)
+                    except Exception as e:
+                        results[start + i] = e if isinstance(e, RPCError) else RPCError(str(e))
+                continue
+            by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+            for i in range(len(chunk)):
+                item = by_id.get(start + i)
+                if item is None:
+                    results[start + i] = RPCError("missing response")
+                elif "error" in item:
+                    results[start + i] = RPCError.from_response(item["error"])
+                else:
+                    results[start + i] = item.get("result")
+        return results
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [
+                {"url": e.url, "latency_ms": round(e.latency * 1000, 1) if e.latency is not None else None,
+                 "calls": e.calls, "errors": e.errors, "down": not e.healthy()}
+                for e in self.endpoints
+            ]
+
+
+class MultiEndpointProvider(JSONBaseProvider):
+    """Provider web3 yang meneruskan semua request ke RPCClient."""
+
+    def __init__(self, client: RPCClient):
+        super().__init__()
+        self.client = client
+
+    def make_request(self, method, params):
+        return self.client.request({"jsonrpc": "2.0", "id": next(self.client._ids), "method": method, "params": params})
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            self.client.call("web3_clientVersion", [])
+            return True
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+
+
+# ──( Instance bersama )─────────────────────────────────────────────────────────
+def load_rpc_urls(path: str = RPC_FILE) -> List[str]:
+    env = os.environ.get("PHAROS_RPC_URLS", "").strip()
+    if env:
+        return [u.strip() for u in env.split(",") if u.strip()]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            urls = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith("#")]
+        if urls:
+            return urls
+    except FileNotFoundError:
+        pass
+    return [DEFAULT_RPC_URL]
+
+
+# Semua inisialisasi lazy: tidak ada I/O jaringan sampai benar-benar dipakai.
+# `timings` mencatat berapa lama tiap langkah init (untuk startup_report()).
+_client: Optional[RPCClient] = None
+_w3 = None
+_chain_id: Optional[int] = None
+_init_lock = threading.Lock()
+timings: Dict[str, float] = {}
+
+
+def get_client() -> RPCClient:
+    global _client
+    if _client is None:
+        with _init_lock:
+            if _client is None:
+                t0 = time.perf_counter()
+                _client = RPCClient(load_rpc_urls())
+                timings["client_init"] = time.perf_counter() - t0
+    return _client
+
+
+def get_w3() -> Web3:
+    """Satu objek Web3 untuk semua modul (di atas client multi-endpoint). Tanpa I/O."""
+    global _w3
+    if _w3 is None:
+        client = get_client()
+        with _init_lock:
+            if _w3 is None:
+                _w3 = Web3(MultiEndpointProvider(client))
+    return _w3
+
+
+def get_chain_id() -> int:
+    """eth_chainId — diambil sekali saat pertama dipakai, lalu di-cache."""
+    global _chain_id
+    if _chain_id is None:
+        client = get_client()
+        with _init_lock:
+            if _chain_id is None:
+                t0 = time.perf_counter()
+                _chain_id = int(client.call("eth_chainId", []), 16)
+                timings["chain_id"] = time.perf_counter() - t0
+    return _chain_id
+
+
+def startup_report() -> str:
+    """Ringkasan waktu init jaringan (kosong = belum ada I/O chain sama sekali)."""
+    if not timings:
+        return "RPC belum diinisialisasi (tanpa I/O chain)"
+    return ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in timings.items())
+
+
+_by_url = {}
+
+
+def as_client(rpc=None) -> RPCClient:
+    """Terima RPCClient, URL string (client satu endpoint, di-cache), atau None (client bersama)."""
+    if isinstance(rpc, RPCClient):
+        return rpc
+    if rpc is None:
+        return get_client()
+    with _init_lock:
+        if rpc not in _by_url:
+            _by_url[rpc] = RPCClient([rpc])
+        return _by_url[rpc]
@@ -0,0 +1,59 @@
+# scan.py — Baca massal saldo native & kepemilikan NFT lewat JSON-RPC batch
+#
+# Satu request HTTP berisi array JSON-RPC (ratusan call sekaligus), jadi scan
+# 1.000 wallet × 9 kontrak cukup puluhan request, bukan puluhan ribu.
+# Transport (batch, fallback satu per satu, failover endpoint) ada di rpc.py.
+
+from typing import Dict, Iterable, Optional
+
+from rpc import DEFAULT_CHUNK, as_client
+
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+
+
+def rpc_batch(rpc, calls, chunk_size: int = DEFAULT_CHUNK) -> list:
+    """`rpc` = RPCClient, URL, atau None (client bersama)."""
+    return as_client(rpc).batch(calls, chunk_size)
+
+
+def _hex_to_int(v) -> Optional[int]:
+    if isinstance(v, str) and v.startswith("0x"):
+        return int(v, 16) if len(v) > 2 else 0
+    return None
+
+
+def encode_balance_of(owner: str) -> str:
+    return BALANCE_OF_SELECTOR + owner.lower().replace("0x", "").rjust(64, "0")
+
+
+# ──( API publik )───────────────────────────────────────────────────────────────
+def scan_balances(rpc, addresses: Iterable[str], chunk_size: int = DEFAULT_CHUNK) -> Dict[str, Optional[int]]:
+    """{address: saldo wei} — None kalau call untuk address itu gagal."""
+    addresses = list(addresses)
+    calls = [("eth_getBalance", [a, "latest"]) for a in addresses]
+    res = rpc_batch(rpc, calls, chunk_size)
+    return {a: _hex_to_int(r) for a, r in zip(addresses, res)}
+
+
+def scan_ownership(rpc, addresses: Iterable[str], contracts: Iterable[str],
+                   chunk_size: int = DEFAULT_CHUNK) -> Dict[str, Dict[str, Optional[int]]]:
+    """{address: {contract_lower: balanceOf}} — None kalau call gagal."""
+    addresses, contracts = list(addresses), [c.lower() for c in contracts]
+    pairs = [(a, c) for a in addresses for c in contracts]
+    calls = [("eth_call", [{"to": c, "data": encode_balance_of(a)}, "latest"]) for a, c in pairs]
+    res = rpc_batch(rpc, calls, chunk_size)
+    out: Dict[str, Dict[str, Optional[int]]] = {a: {} for a in addresses}
+    for (a, c), r in zip(pairs, res):
+        out[a][c] = _hex_to_int(r)
+    return out
+
+
+def scan_wallets(rpc, addresses: Iterable[str], contracts: Iterable[str],
+                 chunk_size: int = DEFAULT_CHUNK) -> Dict[str, dict]:
+    """
+    Snapshot lengkap: {address: {"balance": wei|None, "nft": {contract_lower: n|None}}}
+    """
+    addresses = list(addresses)
+    balances = scan_balances(rpc, addresses, chunk_size)
+    owned = scan_ownership(rpc, addresses, contracts, chunk_size)
+    return {a: {"balance": balances.get(a), "nft": owned.get(a, {})} for a in addresses}
@@ -0,0 +1,115 @@
+# scheduler.py — Penjadwal job untuk mode daemon (tanpa menu / input())
+#
+# - Job masuk ke antrian prioritas (heap) berdasarkan waktu jalan berikutnya
+# - Job yang jatuh tempo dijalankan di thread pool → mint & faucet bisa jalan
+#   bersamaan, tidak saling menunggu satu siklus berurutan
+# - Job periodik dijadwalkan ulang setelah selesai (interval dihitung dari waktu
+#   mulai), jadi satu job tidak pernah tumpang tindih dengan dirinya sendiri
+# - stop() (mis. dari SIGTERM di container) → berhenti ambil job baru, tunggu
+#   job yang sedang jalan selesai
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+
+import metrics
+
+
+class Job:
+    def __init__(self, name: str, fn: Callable, interval_sec: Optional[float] = None, **kwargs):
+        self.name = name
+        self.fn = fn
+        self.kwargs = kwargs
+        self.interval_sec = interval_sec  # None = sekali jalan
+        self.runs = 0
+        self.last_error: Optional[str] = None
+
+    def __repr__(self):
+        every = f" tiap {self.interval_sec:.0f}s" if self.interval_sec else ""
+        return f"<Job {self.name}{every}>"
+
+
+def _ts(t: float) -> str:
+    return datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Scheduler:
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self._queue = []  # (run_at, seq, job)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = 0
+        self._stopped = False
+
+    def add(self, job: Job, delay: float = 0.0):
+        """Masukkan job ke antrian; jalan `delay` detik dari sekarang."""
+        with self._cond:
+            heapq.heappush(self._queue, (time.time() + delay, next(self._seq), job))
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def _next_due(self) -> Optional[Job]:
+        """Blok sampai ada job jatuh tempo & worker kosong (None kalau stop / antrian habis)."""
+        with self._cond:
+            while not self._stopped:
+                if not self._queue and not self._running:
+                    return None  # tidak ada lagi yang perlu dijalankan
+                if self._queue and self._running < self.workers:
+                    run_at = self._queue[0][0]
+                    now = time.time()
+                    if run_at <= now:
+                        _, _, job = heapq.heappop(self._queue)
+                        self._running += 1
+                        return job
+                    self._cond.wait(run_at - now)
+                else:
+                    self._cond.wait()
+            return None
+
+    def _run(self, job: Job):
+        started = time.time()
+        print(f"🗓️  [{_ts(started)}] Mulai job {job.name} (run #{job.runs + 1})")
+        try:
+            with metrics.timer(f"job_{job.name}"):
+                job.fn(**job.kwargs)
+            job.last_error = None
+            metrics.inc("jobs_total", job=job.name, status="ok")
+        except BaseException as e:  # SystemExit dari modul lama pun tidak boleh mematikan daemon
+            job.last_error = f"{type(e).__name__}: {str(e)[:200]}"
+            metrics.inc("jobs_total", job=job.name, status="error")
+            print(f"❌ Job {job.name} error: {job.last_error}")
+        finally:
+            job.runs += 1
+            elapsed = time.time() - started
+            with self._cond:
+                self._running -= 1
+                if job.interval_sec and not self._stopped:
+                    run_at = max(started + job.interval_sec, time.time())
+                    heapq.heappush(self._queue, (run_at, next(self._seq), job))
+                    print(f"🗓️  Job {job.name} selesai ({elapsed:.1f}s), berikutnya {_ts(run_at)}")
+                else:
+                    print(f"🗓️  Job {job.name} selesai ({elapsed:.1f}s)")
+                self._cond.notify_all()
+
+    def run_forever(self):
+        """Loop utama daemon; kembali setelah stop() atau semua job sekali-jalan selesai."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job") as pool:
+            while True:
+                job = self._next_due()
+                if job is None:
+                    break
+                pool.submit(self._run, job)
+        # keluar dari `with` = menunggu job yang masih berjalan
@@ -1,202 +1,548 @@
-#!/usr/bin/env python3
-# send.py — Auto Send PHRS (Pharos Testnet)
-# Fitur:
-# - Pilih privatekey pengirim (dari privatekey.txt)
-# - Masukkan amount (PHRS) → dikirim ke SEMUA address lain
-# - Cek saldo & gas, kirim berurutan dengan nonce yang benar
-# - Log hasil ringkas di akhir
-
-import sys
-import time
-import re
-from decimal import Decimal, InvalidOperation
-from typing import List, Tuple
-from web3 import Web3
-from eth_account import Account
-
-# ===== Konfigurasi jaringan =====
-RPC_URL = "https://testnet.dplabs-internal.com"  # Pharos Testnet
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
-if not w3.is_connected():
-    print("❌ Gagal konek RPC. Cek internet/RPC_URL.")
-    sys.exit(1)
-
-CHAIN_ID = w3.eth.chain_id
-NATIVE_SYMBOL = "PHRS"
-
-# ===== Util =====
-def validate_private_key(key: str) -> str | None:
-    key = key.strip()
-    if key.startswith("0x"):
-        key = key[2:]
-    key = "".join(key.split())
-    if len(key) != 64 or not re.match(r"^[0-9a-fA-F]+$", key):
-        return None
-    return "0x" + key
-
-def load_private_keys(path: str = "privatekey.txt") -> List[str]:
-    keys: List[str] = []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                cleaned = validate_private_key(line)
-                if cleaned:
-                    keys.append(cleaned)
-                else:
-                    print(f"⚠️  Lewati baris invalid di privatekey.txt: {line.strip()[:10]}...")
-    except FileNotFoundError:
-        print("❌ privatekey.txt tidak ditemukan.")
-        return []
-    return keys
-
-def to_checksum(addr: str) -> str:
-    return Web3.to_checksum_address(addr)
-
-def fmt_addr(addr: str) -> str:
-    return f"{addr[:8]}…{addr[-6:]}"
-
-def ask_int(prompt: str, min_val: int, max_val: int) -> int:
-    while True:
-        s = input(prompt).strip()
-        if s.isdigit():
-            val = int(s)
-            if min_val <= val <= max_val:
-                return val
-        print(f"Masukkan angka {min_val}-{max_val} yang valid.")
-
-def ask_amount(prompt: str) -> Decimal:
-    while True:
-        s = input(prompt).strip()
-        try:
-            val = Decimal(s)
-            if val > 0:
-                return val
-        except InvalidOperation:
-            pass
-        print("Masukkan amount numerik > 0 (contoh: 0.001).")
-
-def get_gas_price() -> int:
-    try:
-        gp = w3.eth.gas_price
-        # buffer 10%
-        return int(gp * 1.1)
-    except Exception:
-        # fallback 1 gwei
-        return w3.to_wei(1, "gwei")
-
-def ensure_balance_enough(sender_addr: str, recipients: int, amount_wei: int, gas_price: int, gas_limit: int = 21000) -> Tuple[bool, str]:
-    bal = w3.eth.get_balance(sender_addr)
-    total_value = amount_wei * recipients
-    total_gas = gas_price * gas_limit * recipients
-    need = total_value + total_gas
-    if bal < need:
-        short = need - bal
-        return (False, f"Saldo tidak cukup. Perlu ~{w3.from_wei(need, 'ether')} {NATIVE_SYMBOL}, saldo {w3.from_wei(bal, 'ether')} {NATIVE_SYMBOL}. Kurang {w3.from_wei(short, 'ether')} {NATIVE_SYMBOL}.")
-    return (True, "")
-
-def main():
-    print(f"🔗 Chain ID: {CHAIN_ID}  |  RPC: {RPC_URL}")
-    print("🚀 Auto Send PHRS — pilih pengirim & kirim ke semua wallet lain\n")
-
-    # 1) Load & tampilkan daftar wallet
-    pks = load_private_keys()
-    if len(pks) < 2:
-        print("❌ Minimal butuh 2 private key di privatekey.txt (pengirim + penerima).")
-        sys.exit(1)
-
-    accounts = []
-    for pk in pks:
-        try:
-            acct = Account.from_key(pk)
-            accounts.append((pk, acct.address))
-        except Exception:
-            print("⚠️  PK invalid, lewati.")
-    if len(accounts) < 2:
-        print("❌ Tidak ada cukup PK valid.")
-        sys.exit(1)
-
-    print("📜 Daftar wallet:")
-    for i, (_, addr) in enumerate(accounts, 1):
-        bal = w3.from_wei(w3.eth.get_balance(addr), "ether")
-        print(f"  {i:>2}. {fmt_addr(addr)}  |  {bal:.6f} {NATIVE_SYMBOL}")
-
-    # 2) Pilih pengirim
-    idx = ask_int(f"\nPilih nomor wallet sebagai PENGIRIM (1-{len(accounts)}): ", 1, len(accounts))
-    sender_pk, sender_addr = accounts[idx - 1]
-    recipients = [addr for i, (_, addr) in enumerate(accounts, 1) if i != idx]
-
-    print(f"\n👤 Pengirim : {sender_addr}  ({fmt_addr(sender_addr)})")
-    print(f"🎯 Penerima : {len(recipients)} wallet")
-
-    # 3) Masukkan amount PHRS per penerima
-    amount_phrs = ask_amount(f"Masukkan amount per penerima ({NATIVE_SYMBOL}, contoh 0.001): ")
-    amount_wei = int(w3.to_wei(amount_phrs, "ether"))
-
-    # 4) Cek saldo & gas
-    gas_price = get_gas_price()
-    ok, msg = ensure_balance_enough(sender_addr, len(recipients), amount_wei, gas_price, 21000)
-    if not ok:
-        print(f"❌ {msg}")
-        sys.exit(1)
-
-    # 5) Konfirmasi
-    total_value_phrs = amount_phrs * Decimal(len(recipients))
-    est_gas_phrs = Decimal(w3.from_wei(gas_price * 21000 * len(recipients), "ether"))
-    print("\n🧮 Ringkasan:")
-    print(f"  Kirim      : {total_value_phrs} {NATIVE_SYMBOL} (={amount_phrs} x {len(recipients)} wallet)")
-    print(f"  Est. Gas   : ~{est_gas_phrs} {NATIVE_SYMBOL}  (gasPrice {w3.from_wei(gas_price, 'gwei'):.2f} gwei)")
-    go = input("Lanjut kirim? (y/N): ").strip().lower()
-    if go != "y":
-        print("⏹  Dibatalkan.")
-        sys.exit(0)
-
-    # 6) Kirim berurutan (nonce manual)
-    sender_acct = Account.from_key(sender_pk)
-    current_nonce = w3.eth.get_transaction_count(sender_addr)
-    success, failed = 0, 0
-    tx_hashes = []
-
-    print("\n📤 Mengirim transaksi:")
-    for i, to_addr in enumerate(recipients, 1):
-        try:
-            tx = {
-                "to": to_checksum(to_addr),
-                "value": amount_wei,
-                "gas": 21000,
-                "gasPrice": gas_price,
-                "nonce": current_nonce,
-                "chainId": CHAIN_ID,
-            }
-            signed = w3.eth.account.sign_transaction(tx, private_key=sender_pk)
-            tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
-            txh = tx_hash.hex()
-            tx_hashes.append(txh)
-            print(f"  [{i}/{len(recipients)}] → {fmt_addr(to_addr)} | TX: {txh}")
-            current_nonce += 1
-
-            # (Opsional) tunggu sebentar agar RPC nyaman; hindari rate limit
-            time.sleep(0.3)
-            success += 1
-        except Exception as e:
-            print(f"  [{i}/{len(recipients)}] → {fmt_addr(to_addr)} | ❌ Gagal: {str(e)[:120]}...")
-            failed += 1
-            # Jika error nonce/gas price, coba lanjut ke berikutnya
-
-    # 7) Rekap
-    print("\n" + "=" * 70)
-    print("📊 RINGKASAN PENGIRIMAN")
-    print("=" * 70)
-    print(f"Pengirim        : {sender_addr}")
-    print(f"Total penerima  : {len(recipients)}")
-    print(f"Berhasil        : {success}")
-    print(f"Gagal           : {failed}")
-    if tx_hashes:
-        print("\n🔗 TX Hash:")
-        for h in tx_hashes:
-            print(f"  - {h}")
-    print("\nSelesai ✅")
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+# send.py — Auto Send PHRS (Pharos Testnet)
+# Fitur:
+# - Pilih privatekey pengirim (dari privatekey.txt)
+# - Masukkan amount (PHRS) → dikirim ke SEMUA address lain
+# - Cek saldo & gas, kirim berurutan dengan nonce yang benar
+# - Mode batch (--batch): semua tx di-sign dulu, broadcast per chunk JSON-RPC batch
+# - Rebalance: isi semua wallet sampai saldo target dari banyak donor (lihat rebalance.py)
+# - Log hasil ringkas di akhir
+
+import hashlib
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from typing import List, Tuple
+from web3 import Web3
+
+import scan
+import rpc
+import keystore
+import gas
+import metrics
+import results
+import pacing
+import retry
+import signer
+from receipts import ReceiptTimeout, ReceiptTracker
+from replacer import Replacer
+import journal
+import rebalance
+
+# ===== Konfigurasi jaringan =====
+# Endpoint RPC diatur di rpc.py (rpc.txt / env PHAROS_RPC_URLS, failover otomatis)
+# Tidak ada I/O saat import: cek koneksi & chain id baru dilakukan di main()
+w3 = rpc.get_w3()
+NATIVE_SYMBOL = "PHRS"
+
+# Pacing kirim tx (AIMD): makin cepat selama RPC sehat, melambat saat 429 / timeout / underpriced
+_pacer = pacing.Pacer("send", rate=3.0, min_rate=0.3, max_rate=50.0)
+
+# Mode batch: raw tx per JSON-RPC batch (satu round-trip per chunk)
+BATCH_CHUNK = 50
+
+# ===== Util =====
+def load_private_keys(path: str = "privatekey.txt") -> List[keystore.Wallet]:
+    try:
+        ks = keystore.get_keystore(path)
+    except FileNotFoundError:
+        print("❌ privatekey.txt tidak ditemukan.")
+        return []
+    for line_no, _ in ks.invalid:
+        print(f"⚠️  Lewati baris invalid di privatekey.txt (baris {line_no})")
+    return ks.wallets
+
+def to_checksum(addr: str) -> str:
+    return Web3.to_checksum_address(addr)
+
+def fmt_addr(addr: str) -> str:
+    return f"{addr[:8]}…{addr[-6:]}"
+
+def ask_int(prompt: str, min_val: int, max_val: int) -> int:
+    while True:
+        s = input(prompt).strip()
+        if s.isdigit():
+            val = int(s)
+            if min_val <= val <= max_val:
+                return val
+        print(f"Masukkan angka {min_val}-{max_val} yang valid.")
+
+def ask_amount(prompt: str) -> Decimal:
+    while True:
+        s = input(prompt).strip()
+        try:
+            val = Decimal(s)
+            if val > 0:
+                return val
+        except InvalidOperation:
+            pass
+        print("Masukkan amount numerik > 0 (contoh: 0.001).")
+
+def get_gas_price() -> int:
+    # cache bersama (buffer 10%, fallback 1 gwei) — lihat gas.py
+    return gas.get_oracle(w3).gas_price()
+
+def get_fees(fee_mode: str = gas.LEGACY, speed: str = "normal") -> dict:
+    # legacy {"gasPrice"} atau EIP-1559 {"maxFeePerGas", "maxPriorityFeePerGas"} — lihat gas.py
+    return gas.get_oracle(w3).fees(fee_mode, speed)
+
+def ensure_balance_enough(sender_addr: str, recipients: int, amount_wei: int, gas_price: int, gas_limit: int = 21000) -> Tuple[bool, str]:
+    bal = w3.eth.get_balance(sender_addr)
+    total_value = amount_wei * recipients
+    total_gas = gas_price * gas_limit * recipients
+    need = total_value + total_gas
+    if bal < need:
+        short = need - bal
+        return (False, f"Saldo tidak cukup. Perlu ~{w3.from_wei(need, 'ether')} {NATIVE_SYMBOL}, saldo {w3.from_wei(bal, 'ether')} {NATIVE_SYMBOL}. Kurang {w3.from_wei(short, 'ether')} {NATIVE_SYMBOL}.")
+    return (True, "")
+
+def send_job_base(sender_addr: str, amount_wei: int, recipients: List[str]) -> str:
+    """Identitas job send (pengirim + amount + daftar penerima) untuk resume dari journal."""
+    h = hashlib.sha1("|".join([sender_addr.lower(), str(amount_wei), *sorted(a.lower() for a in recipients)]).encode())
+    return "send:" + h.hexdigest()[:12]
+
+def _accepted(err) -> bool:
+    # node sudah punya tx yang identik (mis. kiriman sebelumnya sampai walau respons hilang)
+    return "already known" in str(err).lower() or "known transaction" in str(err).lower()
+
+def broadcast_batch(raws: List[bytes], chunk_size: int = BATCH_CHUNK) -> List[Exception]:
+    """
+    Broadcast raw tx (sudah di-sign, nonce berurutan) lewat JSON-RPC batch per chunk.
+    Return list error sejajar input (None = diterima node). Error sementara
+    (timeout / 429 / respons hilang) dicoba sekali lagi satu per satu; raw tx
+    yang sama = hash sama, jadi kirim ulang tidak bisa dobel.
+    """
+    client = rpc.get_client()
+    errors: List[Exception] = []
+    for start in range(0, len(raws), chunk_size):
+        chunk = raws[start:start + chunk_size]
+        _pacer.wait()
+        t0 = time.perf_counter()
+        with metrics.timer("send_batch"):
+            res = client.batch([("eth_sendRawTransaction", ["0x" + raw.hex()]) for raw in chunk], chunk_size)
+        errs = [r if isinstance(r, Exception) and not _accepted(r) else None for r in res]
+        bad = next((e for e in errs if e is not None), None)
+        if bad is None:
+            _pacer.success(time.perf_counter() - t0)
+        else:
+            _pacer.failure(retry.classify(bad))
+        errors.extend(errs)
+
+    for k, err in enumerate(errors):
+        if err is None or retry.classify(err) not in (retry.TRANSIENT, retry.RATE_LIMIT, retry.UNKNOWN):
+            continue
+        _pacer.wait()
+        try:
+            client.call("eth_sendRawTransaction", ["0x" + raws[k].hex()])
+            errors[k] = None
+        except rpc.AllEndpointsFailed as e:
+            errors[k] = e
+            break  # semua endpoint mati → sisanya tidak dicoba satu per satu
+        except Exception as e:
+            errors[k] = None if _accepted(e) else e
+    return errors
+
+def main(results_out: str = None, sender: int = None, amount: str = None, assume_yes: bool = False,
+         fee_mode: str = gas.LEGACY, speed: str = "normal", batch: bool = False, batch_chunk: int = BATCH_CHUNK):
+    # results_out → tiap tx langsung ditulis ke file JSONL (tx hash tidak ditampung di memori)
+    # sender / amount / assume_yes → mode non-interaktif (CLI bot.py send); None = tanya via input()
+    # fee_mode / speed → "legacy" | "eip1559" | "auto", target inklusi "slow" | "normal" | "fast"
+    # batch → semua tx di-sign dulu lalu di-broadcast per chunk JSON-RPC batch (batch_chunk tx / request)
+    if not w3.is_connected():
+        print("❌ Gagal konek RPC. Cek internet/rpc.txt.")
+        sys.exit(1)
+    chain_id = rpc.get_chain_id()
+    print(f"🔗 Chain ID: {chain_id}  |  RPC: {rpc.get_client().primary_url}")
+    print("🚀 Auto Send PHRS — pilih pengirim & kirim ke semua wallet lain\n")
+
+    # 1) Load & tampilkan daftar wallet
+    wallets = load_private_keys()
+    if len(wallets) < 2:
+        print("❌ Minimal butuh 2 private key di privatekey.txt (pengirim + penerima).")
+        sys.exit(1)
+
+    accounts = [(w, w.address) for w in wallets]
+
+    print("📜 Daftar wallet:")
+    balances = scan.scan_balances(rpc.get_client(), [addr for _, addr in accounts])
+    for i, (_, addr) in enumerate(accounts, 1):
+        wei = balances.get(addr)
+        bal = w3.from_wei(wei if wei is not None else w3.eth.get_balance(addr), "ether")
+        print(f"  {i:>2}. {fmt_addr(addr)}  |  {bal:.6f} {NATIVE_SYMBOL}")
+
+    # 2) Pilih pengirim
+    if sender is None:
+        idx = ask_int(f"\nPilih nomor wallet sebagai PENGIRIM (1-{len(accounts)}): ", 1, len(accounts))
+    elif 1 <= sender <= len(accounts):
+        idx = sender
+    else:
+        print(f"❌ Nomor pengirim harus 1-{len(accounts)}.")
+        sys.exit(1)
+    sender_wallet, sender_addr = accounts[idx - 1]
+    recipients = [addr for i, (_, addr) in enumerate(accounts, 1) if i != idx]
+
+    print(f"\n👤 Pengirim : {sender_addr}  ({fmt_addr(sender_addr)})")
+    print(f"🎯 Penerima : {len(recipients)} wallet")
+
+    # 3) Masukkan amount PHRS per penerima
+    if amount is None:
+        amount_phrs = ask_amount(f"Masukkan amount per penerima ({NATIVE_SYMBOL}, contoh 0.001): ")
+    else:
+        try:
+            amount_phrs = Decimal(str(amount))
+        except InvalidOperation:
+            amount_phrs = Decimal(0)
+        if amount_phrs <= 0:
+            print("❌ Amount harus numerik > 0 (contoh: 0.001).")
+            sys.exit(1)
+    amount_wei = int(w3.to_wei(amount_phrs, "ether"))
+
+    # 3b) Resume: tx dari run sebelumnya yang terhenti direkonsiliasi dulu, lalu
+    #     penerima yang sudah terkirim di job yang sama dilewati (tidak bayar dobel)
+    jr = journal.get_journal()
+    tracker = ReceiptTracker(poll_interval=1.0, timeout=180)
+    if jr.pending():
+        print(f"\n📒 Journal: {len(jr.pending())} tx dari run sebelumnya belum final, rekonsiliasi...")
+        counts = jr.reconcile(rpc.get_client(), tracker)
+        print(f"📒 Journal: {counts[journal.CONFIRMED]} sukses, {counts[journal.DROPPED]} dropped, "
+              f"{counts[journal.PENDING]} masih pending")
+    job = jr.open_job(send_job_base(sender_addr, amount_wei, recipients))
+    done = jr.purposes(job)
+    if done:
+        before = len(recipients)
+        recipients = [a for a in recipients if f"send:{a.lower()}" not in done]
+        print(f"♻️  Melanjutkan run sebelumnya: {before - len(recipients)} penerima sudah terkirim, dilewati")
+        if not recipients:
+            jr.job_done(job)
+            print("✅ Semua penerima sudah terkirim.")
+            return
+
+    # 4) Cek saldo & gas
+    fees = get_fees(fee_mode, speed)
+    gas_price = gas.fee_cap(fees)  # batas atas per gas (type-2: maxFeePerGas)
+    ok, msg = ensure_balance_enough(sender_addr, len(recipients), amount_wei, gas_price, 21000)
+    if not ok:
+        print(f"❌ {msg}")
+        sys.exit(1)
+
+    # 5) Konfirmasi
+    total_value_phrs = amount_phrs * Decimal(len(recipients))
+    est_gas_phrs = Decimal(w3.from_wei(gas_price * 21000 * len(recipients), "ether"))
+    print("\n🧮 Ringkasan:")
+    print(f"  Kirim      : {total_value_phrs} {NATIVE_SYMBOL} (={amount_phrs} x {len(recipients)} wallet)")
+    if "maxFeePerGas" in fees:
+        tip = w3.from_wei(fees["maxPriorityFeePerGas"], "gwei")
+        print(f"  Est. Gas   : maks ~{est_gas_phrs} {NATIVE_SYMBOL}  (maxFee {w3.from_wei(gas_price, 'gwei'):.2f} gwei, tip {tip:.2f} gwei, {speed})")
+    else:
+        print(f"  Est. Gas   : ~{est_gas_phrs} {NATIVE_SYMBOL}  (gasPrice {w3.from_wei(gas_price, 'gwei'):.2f} gwei)")
+    go = "y" if assume_yes else input("Lanjut kirim? (y/N): ").strip().lower()
+    if go != "y":
+        print("⏹  Dibatalkan.")
+        sys.exit(0)
+
+    # 6) Kirim berurutan (nonce manual). Semua tx di-build dulu lalu di-sign di
+    #    process pool (signer.py); raw tx mengalir balik sesuai urutan nonce.
+    #    Kalau satu tx gagal terkirim, sisanya di-build & di-sign ulang mulai
+    #    nonce yang sama (penerima yang gagal dilewati, nonce tidak bolong).
+    #    Mode batch: seluruh fan-out di-sign sekaligus lalu dikirim per chunk
+    #    JSON-RPC batch; error per item dipetakan balik ke penerimanya.
+    # "pending": tx yang masih di mempool (belum final di journal / broadcast tidak pasti)
+    # tidak boleh ditimpa tx baru di nonce yang sama
+    current_nonce = max(w3.eth.get_transaction_count(sender_addr, "pending"), jr.next_nonce(sender_addr) or 0)
+    success, failed = 0, 0
+    tx_hashes = []
+    out = results.ResultWriter(results_out) if results_out else None
+
+    def build(to_addr: str, nonce: int) -> dict:
+        return {
+            "to": to_checksum(to_addr),
+            "value": amount_wei,
+            "gas": 21000,
+            **fees,
+            "nonce": nonce,
+            "chainId": chain_id,
+        }
+
+    # tx macet > 30 detik diganti otomatis (nonce sama, fee naik) — lihat replacer.py
+    replacer = Replacer(tracker, fee_fn=lambda: get_fees(fee_mode, speed), stuck_after=30.0,
+                        on_replace=lambda chain, h, raw: jr.replaced(sender_addr, chain.nonce, h, raw))
+    chains = []
+
+    def record_sent(i: int, to_addr: str, tx: dict, tx_hash):
+        nonlocal success
+        chain = replacer.track(sender_wallet.key, tx, tx_hash)
+        chains.append((to_addr, chain))
+        txh = chain.hashes[0]
+        if out:
+            out.write("send", sender=sender_addr, to=to_addr, nonce=tx["nonce"], value=amount_wei,
+                      hash=txh, status="sent")
+        else:
+            tx_hashes.append(txh)
+        print(f"  [{i}/{len(recipients)}] → {fmt_addr(to_addr)} | TX: {txh}")
+        success += 1
+
+    def record_failed(i: int, to_addr: str, e: Exception):
+        nonlocal failed
+        print(f"  [{i}/{len(recipients)}] → {fmt_addr(to_addr)} | ❌ Gagal: {str(e)[:120]}...")
+        failed += 1
+        if out:
+            out.write("send", sender=sender_addr, to=to_addr, value=amount_wei, status="error",
+                      error=str(e)[:200])
+
+    def fill_gap(nonce: int):
+        # nonce ditolak tapi nonce sesudahnya sudah diterima node → tx itu tertahan;
+        # isi nonce bolong dengan self-transfer 0 supaya antrian jalan lagi
+        tx = {"to": sender_addr, "value": 0, "gas": 21000, **get_fees(fee_mode, speed),
+              "nonce": nonce, "chainId": chain_id}
+        raw_tx, signed_hash = signer.get_signer().sign_many(sender_wallet.key, [tx])[0]
+        jr.signed(sender_addr, nonce, signed_hash, raw_tx, purpose="filler", job=job)
+        try:
+            tx_hash = w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            if journal.rejected(e):
+                jr.finish(sender_addr, nonce, journal.FAILED)
+                print(f"  ⚠️  Nonce {nonce} bolong & gagal diisi ({str(e)[:80]}), tx sesudahnya bisa tertahan")
+                return
+            tx_hash = signed_hash  # mungkin sudah diterima node → tunggu receipt
+        chains.append((None, replacer.track(sender_wallet.key, tx, tx_hash)))
+        print(f"  🩹 Nonce {nonce} diisi self-transfer 0 {NATIVE_SYMBOL}")
+
+    print("\n📤 Mengirim transaksi:")
+    if batch:
+        txs = [build(to_addr, current_nonce + k) for k, to_addr in enumerate(recipients)]
+        signed_txs = signer.get_signer().sign_many(sender_wallet.key, txs)
+        # write-ahead: seluruh fan-out tercatat di journal (satu fsync) sebelum broadcast
+        jr.signed_many([(sender_addr, tx["nonce"], h, raw, f"send:{to_addr.lower()}")
+                        for to_addr, tx, (raw, h) in zip(recipients, txs, signed_txs)], job=job)
+        errors = broadcast_batch([raw for raw, _ in signed_txs], batch_chunk)
+        # error tidak pasti (timeout / respons hilang) = mungkin sudah diterima node:
+        # entry tetap pending & ikut ditunggu receipt-nya, nonce-nya tidak diisi ulang
+        last_ok = max((k for k, e in enumerate(errors) if e is None or not journal.rejected(e)), default=-1)
+        for k, (to_addr, tx, (_, signed_hash), e) in enumerate(zip(recipients, txs, signed_txs, errors)):
+            if e is None or not journal.rejected(e):
+                if e is not None:
+                    print(f"  [{k + 1}/{len(recipients)}] ⚠️  broadcast tidak pasti ({str(e)[:80]}), ditunggu lewat receipt")
+                record_sent(k + 1, to_addr, tx, signed_hash)
+                continue
+            jr.finish(sender_addr, tx["nonce"], journal.FAILED)
+            record_failed(k + 1, to_addr, e)
+            if k < last_ok:
+                fill_gap(tx["nonce"])
+    pending = [] if batch else list(enumerate(recipients, 1))
+    while pending:
+        txs = [build(to_addr, current_nonce + k) for k, (_, to_addr) in enumerate(pending)]
+        stream = signer.get_signer().sign_stream(sender_wallet.key, txs)
+        for k, ((i, to_addr), tx) in enumerate(zip(pending, txs)):
+            try:
+                raw_tx, signed_hash = next(stream)
+                # write-ahead: tercatat di journal sebelum broadcast
+                jr.signed(sender_addr, tx["nonce"], signed_hash, raw_tx, purpose=f"send:{to_addr.lower()}", job=job)
+                _pacer.wait()
+                t0 = time.perf_counter()
+                try:
+                    with metrics.timer("send"):
+                        tx_hash = w3.eth.send_raw_transaction(raw_tx)
+                except Exception as e:
+                    if journal.rejected(e):
+                        jr.finish(sender_addr, tx["nonce"], journal.FAILED)
+                        raise
+                    # timeout / respons hilang: tx mungkin sudah di mempool → nonce ini tetap
+                    # terpakai (journal pending), receipt / replacement yang menentukan
+                    _pacer.failure(retry.classify(e))
+                    print(f"  [{i}/{len(recipients)}] ⚠️  broadcast tidak pasti ({str(e)[:80]}), ditunggu lewat receipt")
+                    tx_hash = signed_hash
+                else:
+                    _pacer.success(time.perf_counter() - t0)
+                current_nonce += 1
+                record_sent(i, to_addr, tx, tx_hash)
+            except Exception as e:
+                _pacer.failure(retry.classify(e))
+                record_failed(i, to_addr, e)
+                # lanjut ke penerima berikutnya dengan nonce yang sama
+                pending = pending[k + 1:]
+                break
+        else:
+            pending = []
+
+    # 7) Tunggu konfirmasi (replacement berjalan di background selama menunggu).
+    #    Semua hash dicek bareng per sweep ReceiptTracker (satu JSON-RPC batch).
+    confirmed, stuck, replaced = 0, 0, 0
+    if chains:
+        print(f"\n⏳ Menunggu konfirmasi {len(chains)} tx...")
+    for to_addr, chain in chains:
+        label = fmt_addr(to_addr) if to_addr else f"filler nonce {chain.nonce}"
+        try:
+            receipt = replacer.wait(chain)
+        except ReceiptTimeout:
+            stuck += 1
+            print(f"  → {label} | ⚠️  belum masuk block setelah {chain.bumps}× fee bump")
+            continue
+        jr.finish(sender_addr, chain.nonce, journal.CONFIRMED if receipt.status == 1 else journal.REVERTED,
+                  chain.hash)
+        if to_addr is None:
+            continue
+        if len(chain.hashes) > 1:
+            replaced += 1
+            if out:
+                out.write("send", sender=sender_addr, to=to_addr, nonce=chain.nonce, hash=chain.hash,
+                          status="replaced", versions=len(chain.hashes))
+        if receipt.status == 1:
+            confirmed += 1
+
+    if not failed and not stuck:
+        jr.job_done(job)  # run berikutnya dengan parameter sama = job baru
+
+    # 8) Rekap
+    print("\n" + "=" * 70)
+    print("📊 RINGKASAN PENGIRIMAN")
+    print("=" * 70)
+    print(f"Pengirim        : {sender_addr}")
+    print(f"Total penerima  : {len(recipients)}")
+    print(f"Berhasil        : {success}")
+    print(f"Gagal           : {failed}")
+    print(f"Terkonfirmasi   : {confirmed}" + (f"  (♻️  {replaced} lewat replacement)" if replaced else ""))
+    if stuck:
+        print(f"Macet           : {stuck}")
+    if out:
+        out.close()
+        print(f"\n🧾 TX hash per penerima: {results_out}")
+    elif tx_hashes:
+        print("\n🔗 TX Hash:")
+        for h in tx_hashes:
+            print(f"  - {h}")
+    print("\nSelesai ✅")
+
+def rebalance_main(target: str = "0.1", min_transfer: str = "0", assume_yes: bool = False, dry_run: bool = False,
+                   results_out: str = None, fee_mode: str = gas.LEGACY, speed: str = "normal"):
+    # Semua wallet di-top-up sampai `target` PHRS dengan transfer minimal; donor
+    # jalan paralel & penerima ikut meneruskan dana (pohon) → round ~log2(N).
+    # Satu round = satu JSON-RPC batch broadcast + satu sweep receipt.
+    if not w3.is_connected():
+        print("❌ Gagal konek RPC. Cek internet/rpc.txt.")
+        sys.exit(1)
+    chain_id = rpc.get_chain_id()
+    client = rpc.get_client()
+    print(f"🔗 Chain ID: {chain_id}  |  RPC: {client.primary_url}")
+    print(f"⚖️  Rebalance PHRS — semua wallet minimal {target} {NATIVE_SYMBOL}\n")
+
+    wallets = load_private_keys()
+    if len(wallets) < 2:
+        print("❌ Minimal butuh 2 private key di privatekey.txt.")
+        sys.exit(1)
+    keys = {w.address.lower(): w for w in wallets}
+    try:
+        target_wei = int(w3.to_wei(Decimal(str(target)), "ether"))
+        min_wei = int(w3.to_wei(Decimal(str(min_transfer)), "ether"))
+    except InvalidOperation:
+        print("❌ Target / min transfer harus numerik (contoh: 0.1).")
+        sys.exit(1)
+
+    # tx dari run sebelumnya diselesaikan dulu supaya saldo yang dibaca sudah final
+    jr = journal.get_journal()
+    tracker = ReceiptTracker(poll_interval=1.0, timeout=180)
+    if jr.pending():
+        print(f"📒 Journal: {len(jr.pending())} tx dari run sebelumnya belum final, rekonsiliasi...")
+        jr.reconcile(client, tracker)
+
+    balances = scan.scan_balances(client, [w.address for w in wallets])
+    fees = get_fees(fee_mode, speed)
+    gas_cost = gas.fee_cap(fees) * 21000
+    plan = rebalance.plan(balances, target_wei, gas_cost, min_wei)
+
+    unreadable = [a for a, b in balances.items() if b is None]
+    if unreadable:
+        print(f"⚠️  {len(unreadable)} saldo gagal dibaca, wallet tsb dilewati")
+    if not plan.rounds:
+        print("✅ Semua wallet sudah memenuhi target." if not plan.unfunded else
+              f"❌ {len(plan.unfunded)} wallet kurang saldo tapi tidak ada donor dengan surplus cukup.")
+        return
+    print("🧮 Rencana:")
+    for r, transfers in enumerate(plan.rounds, 1):
+        print(f"  Round {r}: {len(transfers)} transfer dari {len({t.sender for t in transfers})} pengirim")
+    print(f"  Total      : {len(plan.transfers)} transfer, {w3.from_wei(plan.total(), 'ether')} {NATIVE_SYMBOL} "
+          f"keluar dari donor (+ gas maks {w3.from_wei(gas_cost * len(plan.transfers), 'ether')})")
+    if plan.unfunded:
+        print(f"  ⚠️  {len(plan.unfunded)} wallet tidak bisa didanai (surplus donor kurang)")
+    if dry_run:
+        for r, transfers in enumerate(plan.rounds, 1):
+            for t in transfers:
+                print(f"  [{r}] {fmt_addr(t.sender)} → {fmt_addr(t.to)} | {w3.from_wei(t.amount, 'ether')} {NATIVE_SYMBOL}")
+        return
+    go = "y" if assume_yes else input("Lanjut rebalance? (y/N): ").strip().lower()
+    if go != "y":
+        print("⏹  Dibatalkan.")
+        sys.exit(0)
+
+    out = results.ResultWriter(results_out) if results_out else None
+    replacer = Replacer(tracker, fee_fn=lambda: get_fees(fee_mode, speed), stuck_after=30.0,
+                        on_replace=lambda chain, h, raw: jr.replaced(chain.meta["sender"], chain.nonce, h, raw))
+    funded, failed = 0, set()  # failed: penerima yang tidak terdanai → subtree-nya ikut dilewati
+
+    for r, transfers in enumerate(plan.rounds, 1):
+        todo = [t for t in transfers if t.parent not in failed]
+        failed.update(t.to for t in transfers if t.parent in failed)
+        if not todo:
+            continue
+        print(f"\n📤 Round {r}/{len(plan.rounds)}: {len(todo)} transfer")
+        res = client.batch([("eth_getTransactionCount", [t.sender, "pending"]) for t in todo])
+        items = []  # (transfer, tx, raw, hash)
+        for t, n in zip(todo, res):
+            if isinstance(n, Exception):
+                print(f"  {fmt_addr(t.sender)} → {fmt_addr(t.to)} | ❌ Gagal baca nonce: {str(n)[:80]}")
+                failed.add(t.to)
+                continue
+            tx = {"to": to_checksum(t.to), "value": t.amount, "gas": 21000, **fees,
+                  "nonce": max(int(n, 16), jr.next_nonce(t.sender) or 0), "chainId": chain_id}
+            raw_tx, signed_hash = signer.get_signer().sign_many(keys[t.sender.lower()].key, [tx])[0]
+            items.append((t, tx, raw_tx, signed_hash))
+        jr.signed_many([(t.sender, tx["nonce"], h, raw, f"rebalance:{t.to.lower()}") for t, tx, raw, h in items])
+        errors = broadcast_batch([raw for _, _, raw, _ in items])
+
+        chains = []
+        for (t, tx, _, h), e in zip(items, errors):
+            if e is not None and journal.rejected(e):
+                jr.finish(t.sender, tx["nonce"], journal.FAILED)
+                print(f"  {fmt_addr(t.sender)} → {fmt_addr(t.to)} | ❌ Gagal: {str(e)[:120]}")
+                failed.add(t.to)
+                if out:
+                    out.write("rebalance", sender=t.sender, to=t.to, value=t.amount, round=r, status="error",
+                              error=str(e)[:200])
+                continue
+            chain = replacer.track(keys[t.sender.lower()].key, tx, h, meta={"sender": t.sender})
+            chains.append((t, chain))
+            print(f"  {fmt_addr(t.sender)} → {fmt_addr(t.to)} | {w3.from_wei(t.amount, 'ether')} {NATIVE_SYMBOL} | TX: {chain.hash}")
+
+        # round berikutnya butuh dana yang baru masuk → tunggu semua receipt round ini
+        for t, chain in chains:
+            try:
+                receipt = replacer.wait(chain)
+            except ReceiptTimeout:
+                receipt = None
+            ok = receipt is not None and receipt.status == 1
+            if receipt is not None:
+                jr.finish(t.sender, chain.nonce, journal.CONFIRMED if ok else journal.REVERTED, chain.hash)
+            if ok:
+                funded += 1
+            else:
+                failed.add(t.to)
+                print(f"  {fmt_addr(t.to)} | ⚠️  {'revert' if receipt is not None else 'belum masuk block'}")
+            if out:
+                out.write("rebalance", sender=t.sender, to=t.to, value=t.amount, round=r, hash=chain.hash,
+                          status="confirmed" if ok else ("reverted" if receipt is not None else "stuck"))
+
+    print("\n" + "=" * 70)
+    print("📊 RINGKASAN REBALANCE")
+    print("=" * 70)
+    print(f"Round           : {len(plan.rounds)}")
+    print(f"Terdanai        : {funded}/{len(plan.transfers)}")
+    if failed:
+        print(f"Gagal/dilewati  : {len(failed)}")
+    if plan.unfunded:
+        print(f"Tanpa donor     : {len(plan.unfunded)}")
+    if out:
+        out.close()
+        print(f"\n🧾 Hasil per transfer: {results_out}")
+    print("\nSelesai ✅")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# signer.py — Signing tx paralel di process pool
+#
+# Signing secp256k1 di eth_account adalah kerja CPU murni yang terkunci GIL,
+# jadi thread tambahan tidak membantu. Di sini tx yang sudah di-build (nonce
+# terisi) di-sign di ProcessPoolExecutor (semua core), lalu raw bytes
+# di-stream balik SESUAI URUTAN INPUT (= urutan nonce) ke broadcaster: tx
+# pertama bisa langsung dikirim selagi sisanya masih di-sign.
+#
+# Batch kecil (< INLINE_MAX tx) di-sign langsung di proses ini: biaya kirim
+# tx ke worker lebih mahal daripada signing-nya.
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+
+INLINE_MAX = 2
+DEFAULT_CHUNKSIZE = 16
+
+
+def _sign(job: Tuple[str, dict]) -> Tuple[bytes, str]:
+    """Dijalankan di worker: (private_key, tx) → (raw_tx, tx_hash hex)."""
+    from eth_account import Account
+    from receipts import to_hex
+
+    key, tx = job
+    signed = Account.sign_transaction(tx, key)
+    raw = getattr(signed, "rawTransaction", None) or getattr(signed, "raw_transaction", None)
+    return bytes(raw), to_hex(signed.hash)
+
+
+class SignerPool:
+    def __init__(self, processes: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn: aman walau proses induk punya banyak thread aktif (fork + lock = deadlock)
+                    self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=get_context("spawn"))
+        return self._pool
+
+    def sign_stream(self, key: str, txs: Iterable[dict]) -> Iterator[Tuple[bytes, str]]:
+        """
+        Sign semua `txs` dengan `key`; yield (raw_tx, tx_hash) berurutan sesuai input.
+        Metrik stage "sign" = waktu broadcaster menunggu tiap tx siap.
+        """
+        txs = list(txs)
+        if len(txs) < INLINE_MAX or self.processes <= 1:
+            results = (_sign((key, tx)) for tx in txs)
+        else:
+            chunk = max(1, min(self.chunksize, len(txs) // self.processes or 1))
+            results = self._get_pool().map(_sign, [(key, tx) for tx in txs], chunksize=chunk)
+        it = iter(results)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            except Exception:
+                metrics.inc("errors_total", stage="sign", error="sign_failed")
+                raise
+            metrics.observe("stage_seconds", time.perf_counter() - t0, stage="sign")
+            yield item
+
+    def sign_many(self, key: str, txs: Iterable[dict]) -> List[Tuple[bytes, str]]:
+        return list(self.sign_stream(key, txs))
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+_signer: Optional[SignerPool] = None
+_signer_lock = threading.Lock()
+
+
+def get_signer() -> SignerPool:
+    global _signer
+    if _signer is None:
+        with _signer_lock:
+            if _signer is None:
+                _signer = SignerPool()
+    return _signer
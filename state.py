@@ -0,0 +1,102 @@
+# state.py — State store lokal (SQLite) untuk mode incremental
+#
+# Menyimpan per wallet:
+# - kepemilikan NFT per kontrak (hasil scan / mint sukses)
+# - waktu klaim faucet & sign-in terakhir
+# Dipakai untuk melewati wallet yang sudah pasti selesai.
+
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Set, Tuple
+
+DEFAULT_PATH = "state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nft_ownership (
+    address    TEXT NOT NULL,
+    contract   TEXT NOT NULL,
+    owned      INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (address, contract)
+);
+CREATE TABLE IF NOT EXISTS faucet (
+    address        TEXT PRIMARY KEY,
+    last_claim_at  REAL,
+    last_signin_at REAL
+);
+"""
+
+
+class StateStore:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ──( NFT )─────────────────────────────────────────────────────────────────
+    def set_nft(self, address: str, contract: str, owned: bool):
+        self.set_nft_many([(address, contract, owned)])
+
+    def set_nft_many(self, rows: Iterable[Tuple[str, str, bool]]):
+        now = time.time()
+        data = [(a.lower(), c.lower(), 1 if o else 0, now) for a, c, o in rows]
+        if not data:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO nft_ownership (address, contract, owned, updated_at) VALUES (?, ?, ?, ?)",
+                data,
+            )
+            self._conn.commit()
+
+    def owned_contracts(self, address: str) -> Set[str]:
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT contract FROM nft_ownership WHERE address = ? AND owned = 1", (address.lower(),)
+            )
+            return {r[0] for r in cur.fetchall()}
+
+    def is_complete(self, address: str, contracts: Iterable[str]) -> bool:
+        owned = self.owned_contracts(address)
+        return all(c.lower() in owned for c in contracts)
+
+    # ──( Faucet )──────────────────────────────────────────────────────────────
+    def record_faucet(self, address: str, claimed: bool = False, signed_in: bool = False):
+        if not (claimed or signed_in):
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO faucet (address) VALUES (?)", (address.lower(),))
+            if claimed:
+                self._conn.execute("UPDATE faucet SET last_claim_at = ? WHERE address = ?", (now, address.lower()))
+            if signed_in:
+                self._conn.execute("UPDATE faucet SET last_signin_at = ? WHERE address = ?", (now, address.lower()))
+            self._conn.commit()
+
+    def last_faucet(self, address: str) -> Tuple[Optional[float], Optional[float]]:
+        """(last_claim_at, last_signin_at) — unix time atau None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_claim_at, last_signin_at FROM faucet WHERE address = ?", (address.lower(),)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store(path: str = DEFAULT_PATH) -> StateStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StateStore(path)
+    return _store
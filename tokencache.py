@@ -0,0 +1,98 @@
+# tokencache.py — Cache JWT login faucet di disk (per address)
+#
+# Expiry diambil dari claim `exp` di payload JWT. Token dianggap tidak valid
+# `margin_sec` detik sebelum kedaluwarsa supaya tidak mati di tengah jalan.
+# Tulis ke disk di-debounce (maks sekali per `flush_interval` detik + flush()
+# di akhir run / saat exit), file dibuat 0600 karena isinya bearer token.
+
+import atexit
+import base64
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_PATH = "jwt_cache.json"
+
+
+def jwt_expiry(token: str) -> Optional[int]:
+    """Ambil `exp` (unix time) dari JWT tanpa verifikasi signature."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        data = json.loads(base64.urlsafe_b64decode(payload))
+        exp = data.get("exp")
+        return int(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+class TokenCache:
+    def __init__(self, path: str = DEFAULT_PATH, margin_sec: int = 120, flush_interval: float = 5.0):
+        self.path = path
+        self.margin_sec = margin_sec
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._data: Dict[str, dict] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except (FileNotFoundError, ValueError):
+            self._data = {}
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._data, f)
+        try:
+            os.chmod(tmp, 0o600)  # tmp sisa run lama bisa punya mode lain
+        except OSError:
+            pass
+        os.replace(tmp, self.path)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _changed(self):
+        # dipanggil dengan lock dipegang; tulis ke disk paling sering tiap flush_interval
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._save()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def get(self, address: str) -> Optional[str]:
+        """JWT yang masih valid untuk address, atau None."""
+        with self._lock:
+            entry = self._data.get(address.lower())
+        if not entry:
+            return None
+        exp = entry.get("exp")
+        if exp is None or exp - self.margin_sec <= time.time():
+            return None
+        return entry.get("jwt")
+
+    def put(self, address: str, jwt: str):
+        exp = jwt_expiry(jwt)
+        if exp is None:
+            return  # tanpa exp tidak bisa tahu kapan kedaluwarsa → jangan di-cache
+        with self._lock:
+            self._data[address.lower()] = {"jwt": jwt, "exp": exp}
+            self._changed()
+
+    def drop(self, address: str):
+        with self._lock:
+            if self._data.pop(address.lower(), None) is not None:
+                self._changed()
@@ -0,0 +1,77 @@
+# txbuilder.py — Builder tx claim cepat (calldata pre-encoded per kontrak)
+#
+# Argumen claim(...) sama untuk semua wallet kecuali `_receiver` (argumen
+# pertama, slot statis 32 byte tepat setelah selector). Jadi calldata cukup
+# di-encode SEKALI per kontrak saat load, lalu per wallet tinggal tempel
+# alamat receiver ke template → tanpa ABI encoding / contract object per call.
+
+from typing import Dict, Iterable
+
+from web3 import Web3
+
+_PLACEHOLDER = "0x" + "11" * 20
+# "0x" + selector (8 hex) + padding address (24 hex)
+_RECEIVER_START = 2 + 8 + 24
+_RECEIVER_END = _RECEIVER_START + 40
+
+
+def fee_fields(fees) -> dict:
+    """int → legacy gasPrice; dict (gas.GasOracle.fees) dipakai apa adanya."""
+    return {"gasPrice": fees} if isinstance(fees, int) else dict(fees)
+
+
+class ClaimTemplate:
+    __slots__ = ("address", "contract", "_prefix", "_suffix")
+
+    def __init__(self, w3, address: str, abi: list, claim_args: tuple):
+        self.address = Web3.to_checksum_address(address)
+        self.contract = w3.eth.contract(address=self.address, abi=abi)
+        data = self.contract.encodeABI(fn_name="claim", args=[_PLACEHOLDER, *claim_args])
+        if data[_RECEIVER_START:_RECEIVER_END].lower() != _PLACEHOLDER[2:]:
+            raise ValueError("layout calldata claim tidak sesuai (receiver bukan argumen pertama)")
+        self._prefix = data[:_RECEIVER_START]
+        self._suffix = data[_RECEIVER_END:]
+
+    def calldata(self, receiver: str) -> str:
+        return self._prefix + receiver[2:].lower() + self._suffix
+
+
+class ClaimBuilder:
+    """
+    Resolve checksum address, contract handle & template calldata sekali saja.
+    `claim_args` = argumen claim setelah `_receiver`:
+        (quantity, currency, price_per_token, allowlist_proof, data)
+    """
+
+    def __init__(self, w3, contract_addresses: Iterable[str], abi: list, claim_args: tuple, value: int, chain_id: int):
+        self.value = value
+        self.chain_id = chain_id
+        self._templates: Dict[str, ClaimTemplate] = {}
+        for addr in contract_addresses:
+            t = ClaimTemplate(w3, addr, abi, claim_args)
+            self._templates[addr.lower()] = t
+
+    def template(self, contract_address: str) -> ClaimTemplate:
+        return self._templates[contract_address.lower()]
+
+    def contract(self, contract_address: str):
+        return self._templates[contract_address.lower()].contract
+
+    def call_params(self, contract_address: str, sender: str) -> dict:
+        """Dict untuk eth_call / eth_estimateGas (tanpa nonce & gas)."""
+        t = self._templates[contract_address.lower()]
+        return {"from": sender, "to": t.address, "data": t.calldata(sender), "value": self.value}
+
+    def build_tx(self, contract_address: str, sender: str, nonce: int, gas: int, fees) -> dict:
+        """`fees` = gas price (int, legacy) atau dict dari gas.GasOracle.fees (type-2)."""
+        t = self._templates[contract_address.lower()]
+        return {
+            "from": sender,
+            "to": t.address,
+            "data": t.calldata(sender),
+            "value": self.value,
+            "nonce": nonce,
+            "gas": gas,
+            **fee_fields(fees),
+            "chainId": self.chain_id,
+        }